@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import argparse
+
+# Añadir el directorio raíz al path de Python para resolver las importaciones
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from src.clustering.abstract_extractor import AbstractExtractor
+from src.clustering.preprocessor import TextPreprocessor
+from src.clustering.online_clustering import OnlineClusterAssigner
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+output_dir = os.path.join(base_dir, 'data', 'clustering_results')
+default_model_path = os.path.join(output_dir, 'online_model.joblib')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Asigna abstracts nuevos a los clusters existentes sin reajustar")
+    parser.add_argument('bibtex', help="Archivo BibTeX con las entradas nuevas")
+    parser.add_argument('--model', default=default_model_path,
+                        help="Asignador guardado por clustering_analysis.py")
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--no-update', action='store_true',
+                        help="Solo asignar, sin actualizar centroides ni guardar el modelo")
+    parser.add_argument('--recluster', action='store_true',
+                        help="Ejecutar clustering_analysis.py si la calidad se degrada")
+    parser.add_argument('--output', default=os.path.join(output_dir, 'new_assignments.json'))
+    args = parser.parse_args()
+
+    print("=== Asignación en línea de abstracts nuevos ===")
+    assigner = OnlineClusterAssigner.load(args.model)
+
+    abstracts, _ = AbstractExtractor().extract_from_bibtex(args.bibtex)
+    doc_ids = list(abstracts.keys())
+    if not doc_ids:
+        print("No se encontraron abstracts nuevos")
+        return
+    print(f"Preprocesando {len(doc_ids)} abstracts...")
+    preprocessor = TextPreprocessor()
+    processed_docs = [preprocessor.preprocess(abstracts[doc_id]) for doc_id in doc_ids]
+
+    assignments = []
+    for start in range(0, len(doc_ids), args.batch_size):
+        batch = processed_docs[start:start + args.batch_size]
+        X = assigner.transform_texts(batch)
+        if args.no_update:
+            # Sin actualizar centroides, pero la deriva se evalúa igual
+            labels, sims = assigner.predict(X)
+            assigner.observe(sims)
+        else:
+            labels, sims = assigner.partial_fit(X)
+        for doc_id, label, sim in zip(doc_ids[start:start + args.batch_size], labels, sims):
+            assignments.append({"doc_id": doc_id, "cluster": int(label), "similarity": float(sim)})
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(assignments, f, indent=4, ensure_ascii=False)
+    print(f"- {len(assignments)} asignaciones guardadas en: {args.output}")
+
+    report = assigner.drift_report()
+    if report['recent_cohesion'] is not None:
+        print(f"- Cohesión reciente: {report['recent_cohesion']:.4f} "
+              f"(referencia {assigner.baseline['cohesion']:.4f}, "
+              f"caída {100 * report['cohesion_drop']:.1f}%)")
+        print(f"- Asignaciones de baja confianza: {100 * report['low_confidence']:.1f}%")
+
+    if not args.no_update:
+        assigner.save(args.model)
+        print(f"- Asignador actualizado en: {args.model}")
+
+    if report['needs_recluster']:
+        print("La calidad se degradó más allá del umbral: se recomienda reagrupar el corpus")
+        if args.recluster:
+            # Mismo corpus, muestra y reducción que el clustering original, más
+            # los abstracts recién asignados
+            from src.clustering_analysis import main as run_clustering_analysis
+            clustering_argv = assigner.clustering_argv
+            if clustering_argv is None:
+                print("El modelo no registra las opciones del clustering: se usan las por defecto")
+                clustering_argv = []
+            run_clustering_analysis(clustering_argv + ['--extra-bibtex', os.path.abspath(args.bibtex)])
+    else:
+        print("La calidad se mantiene: no es necesario reagrupar")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
+import joblib
 import numpy as np
-from scipy.spatial.distance import pdist, squareform
 import matplotlib.pyplot as plt
-from scipy.cluster.hierarchy import dendrogram, linkage, fcluster
+from scipy.cluster.hierarchy import dendrogram, linkage
+
+from src.clustering.similarity import normalize_rows, SimilarityEngine
+from src.clustering.scalable_linkage import scalable_linkage
+from src.clustering.tree_export import linkage_to_nodes, export_tree_json, write_html_viewer
 
 class AgglomerativeClustering:
     """
@@ -9,26 +13,49 @@ class AgglomerativeClustering:
     Esta implementación usa arrays de NumPy como estructura de datos principal.
     """
     
-    def __init__(self, linkage='single', n_clusters=None):
+    def __init__(self, linkage='single', n_clusters=None, mode='auto',
+                 n_summaries=1000, exact_max_samples=2000, random_state=42,
+                 memory_budget_mb=256, max_cut_clusters=200):
         """
         Inicializa el algoritmo de clustering.
         
         Args:
-            linkage: Método de enlace ('single', 'complete', 'average')
+            linkage: Método de enlace ('single', 'complete', 'average', 'ward')
             n_clusters: Número de clusters a formar (None para determinar automáticamente)
+            mode: 'exact' (matriz de distancias completa), 'scalable' (resúmenes CF
+                + NN-chain) o 'auto' (escalable cuando n > exact_max_samples)
+            n_summaries: Número de micro-clusters usados en modo escalable
+            exact_max_samples: Umbral de documentos para el modo 'auto'
+            random_state: Semilla para la etapa de resumen del modo escalable
+            memory_budget_mb: Memoria máxima por bloque al calcular distancias exactas
+            max_cut_clusters: Número máximo de clusters cuyos cortes se precalculan
         """
         self.linkage_method = linkage
         self.n_clusters = n_clusters if n_clusters is not None else 10  # Default a 10 clusters
+        self.mode = mode
+        self.n_summaries = n_summaries
+        self.exact_max_samples = exact_max_samples
+        self.random_state = random_state
+        self.memory_budget_mb = memory_budget_mb
+        self.max_cut_clusters = max_cut_clusters
         self.labels_ = None
         self.n_samples = 0
         self.linkage_matrix = None
+        self.vectorizer = None
+        self._merge_order = None
+        self._merge_heights = None
+        self._cut_base = None
+        self._cut_maps = None
     
-    def fit(self, X):
+    def fit(self, X, distances=None):
         """
         Ejecuta el algoritmo de clustering sobre los datos.
         
         Args:
-            X: Matriz de vectores de características o matriz de distancias
+            X: Matriz de vectores de características (densa o dispersa CSR)
+            distances: Distancias coseno condensadas precalculadas (opcional,
+                como las de SimilarityEngine.condensed_distances); evitan
+                recalcularlas cuando se prueban varias configuraciones
             
         Returns:
             self
@@ -36,9 +63,34 @@ class AgglomerativeClustering:
         # X es una matriz de características donde cada fila representa un documento
         self.n_samples = X.shape[0]
         
-        # Calcular directamente la matriz de enlace usando scipy
-        print(f"Calculando matriz de enlace usando método '{self.linkage_method}'...")
-        self.linkage_matrix = linkage(X, method=self.linkage_method, metric='cosine')
+        use_scalable = distances is None and (self.mode == 'scalable' or (
+            self.mode == 'auto' and self.n_samples > self.exact_max_samples))
+        
+        if use_scalable and self.n_samples > self.n_summaries:
+            # Memoria O(n_summaries² + nnz) en lugar de O(n²)
+            print(f"Calculando matriz de enlace '{self.linkage_method}' en modo escalable "
+                  f"({self.n_summaries} resúmenes para {self.n_samples} documentos)...")
+            self.linkage_matrix = scalable_linkage(
+                normalize_rows(X), method=self.linkage_method,
+                n_summaries=self.n_summaries, random_state=self.random_state)
+        else:
+            if distances is None:
+                # Solo el vector condensado n(n-1)/2, escrito por bloques
+                engine = SimilarityEngine(X, memory_budget_mb=self.memory_budget_mb)
+                distances = engine.condensed_distances()
+            elif len(distances) != self.n_samples * (self.n_samples - 1) // 2:
+                raise ValueError("Las distancias precalculadas no corresponden al número de documentos")
+            if self.linkage_method in ('ward', 'centroid', 'median'):
+                # Estos métodos requieren distancia euclídea; sobre vectores
+                # unitarios equivale a sqrt(2 · distancia coseno)
+                distances = np.sqrt(2.0 * distances)
+            
+            # Calcular la matriz de enlace usando scipy sobre las distancias condensadas
+            print(f"Calculando matriz de enlace usando método '{self.linkage_method}'...")
+            self.linkage_matrix = linkage(distances, method=self.linkage_method)
+        
+        # Precalcular en una pasada los cortes para 1..max_cut_clusters clusters
+        self._prepare_cuts()
         
         # Determinar número de clusters si no se especificó
         if self.n_clusters is None:
@@ -46,13 +98,14 @@ class AgglomerativeClustering:
             # Un umbral del 70% de la distancia máxima suele dar buenos resultados
             max_dist = self.linkage_matrix[-1, 2]
             threshold = 0.7 * max_dist
-            self.n_clusters = len(np.unique(fcluster(self.linkage_matrix, threshold, criterion='distance')))
+            self.n_clusters = len(np.unique(self.labels_for(distance_threshold=threshold)))
             print(f"Número de clusters determinado automáticamente: {self.n_clusters}")
         else:
             print(f"Usando número de clusters predefinido: {self.n_clusters}")
         
-        # Extraer etiquetas de cluster
-        self.labels_ = fcluster(self.linkage_matrix, self.n_clusters, criterion='maxclust') - 1
+        # Extraer etiquetas de cluster a partir de la jerarquía de cortes
+        # precalculada (los reajustes siguientes no recorren de nuevo el enlace)
+        self.labels_ = self.labels_for(n_clusters=self.n_clusters)
         
         # Verificar si hay clusters con una sola muestra y ajustar
         unique_labels, counts = np.unique(self.labels_, return_counts=True)
@@ -65,12 +118,12 @@ class AgglomerativeClustering:
             if len(unique_labels) - len(singleton_clusters) > 2:
                 adjusted_n = self.n_clusters - len(singleton_clusters)
                 print(f"Reajustando a {adjusted_n} clusters...")
-                self.labels_ = fcluster(self.linkage_matrix, adjusted_n, criterion='maxclust') - 1
+                self.labels_ = self.labels_for(n_clusters=adjusted_n)
             # Si no hay suficientes clusters no singleton, fusionar los singletons con su vecino más cercano
             else:
                 print("Manteniendo el número de clusters pero fusionando singletons...")
-                # Implementación simplificada usando una nueva llamada a fcluster
-                self.labels_ = fcluster(self.linkage_matrix, self.n_clusters - len(singleton_clusters) + 1, criterion='maxclust') - 1
+                # Implementación simplificada usando un corte con menos clusters
+                self.labels_ = self.labels_for(n_clusters=self.n_clusters - len(singleton_clusters) + 1)
         
         # Verificar que tenemos más de un cluster
         unique_clusters = np.unique(self.labels_)
@@ -78,16 +131,181 @@ class AgglomerativeClustering:
         
         return self
     
-    def plot_dendrogram(self, labels=None):
+    def _prepare_cuts(self):
+        """
+        Precalcula en una sola pasada los cortes del enlace para 1..max_cut_clusters.
+        
+        Las fusiones se recorren por altura monótona (máximo de la propia altura
+        y la de sus hijos, como hace fcluster). Con union-find se aplican las
+        n - max_cut_clusters primeras para obtener componentes base; las
+        restantes, pocas, se guardan como mapas componente → cluster, de modo
+        que cualquier corte posterior cuesta O(n).
+        """
+        Z = self.linkage_matrix
+        n = self.n_samples
+        n_merges = len(Z)
+        children = Z[:, :2].astype(np.int64)
+        
+        # Alturas monótonas: los hijos siempre aparecen antes que el padre
+        heights = np.empty(2 * n - 1)
+        heights[:n] = -np.inf
+        for i in range(n_merges):
+            heights[n + i] = max(Z[i, 2], heights[children[i, 0]], heights[children[i, 1]])
+        self._merge_order = np.argsort(heights[n:], kind='stable')
+        self._merge_heights = heights[n:][self._merge_order]
+        
+        # Componentes base tras las primeras n - max_cut_clusters fusiones
+        n_base_merges = max(n_merges - (self.max_cut_clusters - 1), 0)
+        parent = np.arange(2 * n - 1)
+        applied = self._merge_order[:n_base_merges]
+        parent[children[applied, 0]] = n + applied
+        parent[children[applied, 1]] = n + applied
+        base_roots = self._roots(parent)[:n]
+        components, self._cut_base = np.unique(base_roots, return_inverse=True)
+        
+        # Fusiones restantes sobre las componentes base (como mucho max_cut_clusters - 1)
+        node_to_comp = {int(node): c for c, node in enumerate(components)}
+        current = np.arange(len(components))
+        maps = [current.copy()]
+        for i in self._merge_order[n_base_merges:]:
+            a = node_to_comp[int(children[i, 0])]
+            b = node_to_comp[int(children[i, 1])]
+            label_a, label_b = current[a], current[b]
+            current[current == label_b] = label_a
+            node_to_comp[n + int(i)] = a
+            maps.append(current.copy())
+        self._cut_base_merges = n_base_merges
+        self._cut_maps = np.array(maps)
+    
+    def _labels_after(self, n_applied):
+        """Etiquetas 0..k-1 tras aplicar las primeras n_applied fusiones."""
+        n = self.n_samples
+        if n_applied >= self._cut_base_merges:
+            comp_labels = self._cut_maps[n_applied - self._cut_base_merges]
+            _, compact = np.unique(comp_labels, return_inverse=True)
+            return compact[self._cut_base]
+        
+        # Corte con más clusters de los precalculados: raíces por salto de
+        # punteros, O(n log profundidad)
+        Z = self.linkage_matrix
+        applied = self._merge_order[:n_applied]
+        parent = np.arange(2 * n - 1)
+        parent[Z[applied, 0].astype(np.int64)] = n + applied
+        parent[Z[applied, 1].astype(np.int64)] = n + applied
+        return np.unique(self._roots(parent)[:n], return_inverse=True)[1]
+    
+    @staticmethod
+    def _roots(parent):
         """
-        Genera un dendrograma completo en forma de árbol.
+        Raíz de cada nodo de un bosque dado por sus punteros al padre.
+        
+        Usa salto de punteros (parent = parent[parent]): cada pasada duplica
+        la distancia recorrida, así que un enlace encadenado de profundidad n
+        (single linkage) cuesta O(n log n) y no O(n²).
+        """
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent = grandparent
+    
+    def labels_for(self, n_clusters=None, distance_threshold=None):
+        """
+        Obtiene etiquetas para cualquier número de clusters o umbral de distancia
+        a partir del enlace almacenado, sin volver a ajustar el modelo.
+        
+        Sigue la semántica de fcluster: con n_clusters se usa el menor umbral
+        que deja como mucho n_clusters grupos (criterion='maxclust'); con
+        distance_threshold se unen las fusiones de altura <= umbral.
+        
+        Args:
+            n_clusters: Número máximo de clusters
+            distance_threshold: Umbral de distancia de corte
+            
+        Returns:
+            ndarray: Etiquetas 0..k-1 por documento
+        """
+        if self.linkage_matrix is None:
+            raise ValueError("El modelo debe ser ajustado primero usando fit()")
+        if (n_clusters is None) == (distance_threshold is None):
+            raise ValueError("Indique exactamente uno de n_clusters o distance_threshold")
+        if self._cut_maps is None:
+            self._prepare_cuts()
+        
+        n = self.n_samples
+        if n_clusters is not None:
+            if n_clusters >= n:
+                n_applied = 0
+            else:
+                threshold = self._merge_heights[n - max(n_clusters, 1) - 1]
+                n_applied = int(np.searchsorted(self._merge_heights, threshold, side='right'))
+        else:
+            n_applied = int(np.searchsorted(self._merge_heights, distance_threshold, side='right'))
+        return self._labels_after(n_applied)
+    
+    def save(self, path, vectorizer=None):
+        """
+        Guarda la matriz de enlace junto con el vectorizador ajustado.
+        
+        Args:
+            path: Ruta del archivo de salida
+            vectorizer: Vectorizador TF-IDF usado para obtener las características
+        """
+        if self.linkage_matrix is None:
+            raise ValueError("El modelo debe ser ajustado primero usando fit()")
+        joblib.dump({
+            'linkage': self.linkage_method,
+            'n_clusters': self.n_clusters,
+            'max_cut_clusters': self.max_cut_clusters,
+            'n_samples': self.n_samples,
+            'linkage_matrix': self.linkage_matrix,
+            'labels': self.labels_,
+            'vectorizer': vectorizer if vectorizer is not None else self.vectorizer
+        }, path, compress=3)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un modelo guardado con save(); los cortes se recalculan en una pasada.
+        
+        Args:
+            path: Ruta del archivo
+            
+        Returns:
+            AgglomerativeClustering: Modelo listo para labels_for()
+        """
+        state = joblib.load(path)
+        model = cls(linkage=state['linkage'], n_clusters=state['n_clusters'],
+                    max_cut_clusters=state['max_cut_clusters'])
+        model.n_samples = state['n_samples']
+        model.linkage_matrix = state['linkage_matrix']
+        model.labels_ = state['labels']
+        model.vectorizer = state['vectorizer']
+        model._prepare_cuts()
+        return model
+    
+    def plot_dendrogram(self, labels=None, truncate_mode='auto', p=50, max_full_leaves=200):
+        """
+        Genera un dendrograma en forma de árbol, completo o truncado.
+        
+        Con truncamiento solo se dibujan las últimas p fusiones ('lastp') o los
+        p niveles superiores ('level'); cada hoja truncada muestra entre
+        paréntesis cuántos documentos agrupa, así el tiempo de dibujo no crece
+        con el corpus.
         
         Args:
             labels: Etiquetas para los nodos hoja
+            truncate_mode: None (árbol completo), 'lastp', 'level' o 'auto'
+                (completo hasta max_full_leaves hojas y 'lastp' por encima)
+            p: Número de hojas ('lastp') o de niveles ('level') a mostrar
+            max_full_leaves: Número máximo de hojas para dibujar el árbol completo
         """
         if self.linkage_matrix is None:
             raise ValueError("El modelo debe ser ajustado primero usando fit()")
         
+        if truncate_mode == 'auto':
+            truncate_mode = None if self.n_samples <= max_full_leaves else 'lastp'
+        
         # Crear una figura grande para mostrar todo el árbol
         plt.figure(figsize=(20, 12))
         
@@ -99,7 +317,7 @@ class AgglomerativeClustering:
         set_link_color_palette(['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', 
                              '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'])
         
-        # Usar truncate_mode=None para mostrar el árbol completo
+        # Con truncate_mode=None se muestra el árbol completo
         dendro = dendrogram(
             self.linkage_matrix,
             labels=labels,
@@ -110,14 +328,19 @@ class AgglomerativeClustering:
             leaf_font_size=9,  # Tamaño de fuente adecuado
             show_leaf_counts=True,  # Mostrar número de hojas en cada rama
             no_plot=False,  # Asegurar que se dibuje
-            truncate_mode=None,  # No truncar ninguna parte del árbol
+            truncate_mode=truncate_mode,
+            p=p,
             count_sort=False,  # No reordenar por conteo
             distance_sort=False  # No reordenar por distancia
         )
         
         # Configuración detallada del gráfico
-        plt.title('Dendrograma Jerárquico Aglomerativo Completo', fontsize=18, fontweight='bold')
-        plt.xlabel('Muestras', fontsize=14)
+        if truncate_mode is None:
+            plt.title('Dendrograma Jerárquico Aglomerativo Completo', fontsize=18, fontweight='bold')
+            plt.xlabel('Muestras', fontsize=14)
+        else:
+            plt.title('Dendrograma Jerárquico Aglomerativo (truncado)', fontsize=18, fontweight='bold')
+            plt.xlabel('Muestras (entre paréntesis: documentos agrupados)', fontsize=14)
         plt.ylabel('Distancia entre clusters', fontsize=14)
         
         # Añadir espacio para las etiquetas
@@ -139,4 +362,22 @@ class AgglomerativeClustering:
         
         plt.tight_layout(rect=[0, 0.05, 1, 0.95])
         
-        return plt.gcf()
\ No newline at end of file
+        return plt.gcf()
+    
+    def export_tree(self, json_path, labels=None, html_path=None):
+        """
+        Exporta el árbol completo a JSON (formato plano) y, opcionalmente, a un
+        visor HTML interactivo.
+        
+        Args:
+            json_path: Ruta del archivo JSON
+            labels: Etiquetas de los documentos (opcional)
+            html_path: Ruta del visor HTML (None para no generarlo)
+        """
+        if self.linkage_matrix is None:
+            raise ValueError("El modelo debe ser ajustado primero usando fit()")
+        nodes, root = linkage_to_nodes(self.linkage_matrix, labels)
+        document = export_tree_json(nodes, root, json_path,
+                                    f"Dendrograma aglomerativo ({self.linkage_method})")
+        if html_path is not None:
+            write_html_viewer(document, html_path)
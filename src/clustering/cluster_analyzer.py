@@ -1,28 +1,97 @@
 import numpy as np
+import scipy.sparse as sp
 from sklearn.metrics import silhouette_score, adjusted_rand_score, normalized_mutual_info_score
 import matplotlib.pyplot as plt
 import os
 
+from src.clustering.silhouette import (SILHOUETTE_ESTIMATORS, silhouette_rows,
+                                       silhouette_sampled, silhouette_simplified)
+
 class ClusterAnalyzer:
     """Análisis y evaluación de algoritmos de clustering."""
     
     @staticmethod
-    def evaluate_clustering(X, labels_true, labels_pred):
+    def cluster_centroids(X, labels):
+        """
+        Calcula tamaños y centroides de todos los clusters de una vez.
+        
+        Los centroides se obtienen con un único producto Pᵀ · X, donde P es la
+        matriz indicadora dispersa (n × k) de pertenencia a cada cluster.
+        
+        Args:
+            X: Datos vectorizados (densos o dispersos CSR)
+            labels: Etiqueta de cluster por muestra
+            
+        Returns:
+            tuple: (clusters ordenados, índice compacto por muestra,
+                tamaños, matriz densa k × d de centroides)
+        """
+        clusters, inverse = np.unique(labels, return_inverse=True)
+        sizes = np.bincount(inverse, minlength=len(clusters))
+        indicator = sp.csr_matrix(
+            (np.ones(len(inverse)), (inverse, np.arange(len(inverse)))),
+            shape=(len(clusters), len(inverse))
+        )
+        sums = indicator @ X
+        sums = sums.toarray() if sp.issparse(sums) else np.asarray(sums)
+        centroids = sums / sizes[:, None]
+        return clusters, inverse, sizes, centroids
+    
+    @staticmethod
+    def nearest_centroid(X, centroids, block_size=4096):
+        """
+        Asigna cada fila al centroide más cercano (distancia euclídea), por bloques.
+        
+        Usa ||x - c||² = ||x||² - 2·x·c + ||c||²; el término ||x||² no cambia
+        el argmin, por lo que basta un producto matricial por bloque.
+        
+        Args:
+            X: Filas a asignar (densas o dispersas CSR)
+            centroids: Matriz densa k × d de centroides
+            block_size: Número de filas por bloque
+            
+        Returns:
+            ndarray: Índice del centroide más cercano para cada fila
+        """
+        sq_norms = np.einsum('ij,ij->i', centroids, centroids)
+        result = np.empty(X.shape[0], dtype=np.int64)
+        for start in range(0, X.shape[0], block_size):
+            products = np.asarray(X[start:start + block_size] @ centroids.T)
+            result[start:start + block_size] = np.argmin(sq_norms[None, :] - 2.0 * products, axis=1)
+        return result
+    
+    @staticmethod
+    def evaluate_clustering(X, labels_true, labels_pred, silhouette='auto', sample_size=2000,
+                            exact_max_samples=5000, random_state=42, memory_budget_mb=256):
         """
         Evalúa los resultados del clustering usando métricas estándar.
         
         Args:
-            X: Datos vectorizados
+            X: Datos vectorizados (densos o dispersos CSR)
             labels_true: Etiquetas verdaderas (categorías)
             labels_pred: Etiquetas predichas por el clustering
+            silhouette: Estimador del silhouette: 'exact' (sklearn), 'blockwise'
+                (exacto por bloques de distancias), 'sampled' (muestreo
+                estratificado con intervalo de confianza), 'simplified'
+                (basado en centroides, O(n·k)) o 'auto'
+            sample_size: Número de muestras del estimador 'sampled'
+            exact_max_samples: En modo 'auto', tamaño máximo para el cálculo exacto
+            random_state: Semilla del muestreo
+            memory_budget_mb: Memoria máxima por bloque de distancias
             
         Returns:
-            dict: Diccionario con métricas de evaluación
+            dict: Diccionario con métricas de evaluación (incluye el estimador
+                de silhouette usado en 'silhouette_estimator')
         """
+        if silhouette not in SILHOUETTE_ESTIMATORS:
+            raise ValueError(f"Estimador de silhouette no soportado: '{silhouette}'. "
+                             f"Opciones: {', '.join(SILHOUETTE_ESTIMATORS)}")
         metrics = {}
+        labels_pred = np.asarray(labels_pred)
         
-        # Verificar si las etiquetas son válidas para evaluación
-        unique_clusters = np.unique(labels_pred)
+        # Tamaños de todos los clusters en O(n)
+        unique_clusters, inverse = np.unique(labels_pred, return_inverse=True)
+        cluster_sizes = np.bincount(inverse)
         n_clusters = len(unique_clusters)
         
         print(f"Información de diagnóstico:")
@@ -31,54 +100,36 @@ class ClusterAnalyzer:
         
         # Mejorar las etiquetas eliminando clusters con una sola muestra
         improved_labels = labels_pred.copy()
-        has_singleton = False
-        
-        # Detectar clusters con una sola muestra y contarlos
-        singleton_count = 0
-        for cluster in unique_clusters:
-            cluster_size = np.sum(labels_pred == cluster)
-            if cluster_size == 1:
-                singleton_count += 1
-                has_singleton = True
+        singleton_points = np.flatnonzero(cluster_sizes[inverse] == 1)
+        singleton_count = len(singleton_points)
         
-        if has_singleton:
+        if singleton_count:
             print(f"- Detectados {singleton_count} clusters con una sola muestra")
             print("- Corrigiendo etiquetas para el cálculo de silhouette...")
             
-            # Asignar los puntos de clusters singleton al cluster más cercano
-            # Para cada cluster singleton, encontrar el centroide más cercano
-            centroids = {}
-            for cluster in unique_clusters:
-                if np.sum(labels_pred == cluster) > 1:  # Solo calcular para clusters no-singleton
-                    cluster_points = X[labels_pred == cluster]
-                    centroids[cluster] = np.mean(cluster_points, axis=0)
-            
-            # Reasignar cada punto singleton
-            for i, label in enumerate(labels_pred):
-                if np.sum(labels_pred == label) == 1:  # Es un singleton
-                    # Encontrar el cluster más cercano
-                    min_dist = float('inf')
-                    closest_cluster = None
-                    for cluster, centroid in centroids.items():
-                        dist = np.linalg.norm(X[i] - centroid)
-                        if dist < min_dist:
-                            min_dist = dist
-                            closest_cluster = cluster
-                    
-                    if closest_cluster is not None:
-                        improved_labels[i] = closest_cluster
+            # Asignar los puntos de clusters singleton al centroide más cercano
+            # (solo entre clusters no-singleton), todos en un solo lote
+            keep = cluster_sizes[inverse] > 1
+            if keep.any():
+                clusters, _, _, centroids = ClusterAnalyzer.cluster_centroids(X[keep], labels_pred[keep])
+                closest = ClusterAnalyzer.nearest_centroid(X[singleton_points], centroids)
+                improved_labels[singleton_points] = clusters[closest]
         
         # Usar etiquetas mejoradas para el silhouette score
+        if silhouette == 'auto':
+            silhouette = 'exact' if len(labels_pred) <= exact_max_samples else 'sampled'
+        metrics['silhouette_estimator'] = silhouette
         try:
-            from sklearn.metrics import silhouette_score
             if len(np.unique(improved_labels)) > 1:
-                metrics['silhouette'] = silhouette_score(X, improved_labels)
+                metrics.update(ClusterAnalyzer.compute_silhouette(
+                    X, improved_labels, silhouette, sample_size, random_state, memory_budget_mb))
             else:
                 print("- Error: No se puede calcular silhouette score con un solo cluster")
                 metrics['silhouette'] = 0.0
         except Exception as e:
             print(f"- Error calculando silhouette: {e}")
             metrics['silhouette'] = 0.0
+        print(f"- Silhouette calculado con el estimador '{silhouette}'")
         
         # Adjusted Rand Index
         try:
@@ -98,6 +149,40 @@ class ClusterAnalyzer:
         
         return metrics
     
+    @staticmethod
+    def compute_silhouette(X, labels, estimator='exact', sample_size=2000,
+                           random_state=42, memory_budget_mb=256):
+        """
+        Calcula el coeficiente silhouette con el estimador indicado.
+        
+        Args:
+            X: Datos vectorizados (densos o dispersos CSR)
+            labels: Etiquetas de cluster (al menos dos clusters)
+            estimator: 'exact', 'blockwise', 'sampled' o 'simplified'
+            sample_size: Número de muestras del estimador 'sampled'
+            random_state: Semilla del muestreo
+            memory_budget_mb: Memoria máxima por bloque de distancias
+            
+        Returns:
+            dict: 'silhouette' y, para 'sampled', el intervalo de confianza
+                ('silhouette_ci') y el número de muestras evaluadas
+        """
+        if estimator == 'exact':
+            return {'silhouette': silhouette_score(X, labels)}
+        
+        _, inverse, sizes, centroids = ClusterAnalyzer.cluster_centroids(X, labels)
+        if estimator == 'blockwise':
+            return {'silhouette': float(silhouette_rows(X, inverse, sizes, memory_budget_mb=memory_budget_mb).mean())}
+        if estimator == 'simplified':
+            return {'silhouette': silhouette_simplified(X, inverse, sizes, centroids)}
+        
+        result = silhouette_sampled(X, inverse, sizes, sample_size, random_state, memory_budget_mb)
+        return {
+            'silhouette': result['silhouette'],
+            'silhouette_ci': result['ci'],
+            'silhouette_sample_size': result['sample_size']
+        }
+    
     @staticmethod
     def plot_cluster_comparison(metrics_agglomerative, metrics_divisive):
         """
@@ -0,0 +1,213 @@
+import heapq
+import numpy as np
+import networkx as nx
+
+
+class ClusterTree:
+    """
+    Árbol de clusters compacto basado en arreglos.
+
+    Cada nodo guarda solo su padre; las muestras no se duplican por nivel. Al
+    congelar el árbol se construye una única permutación de las muestras en
+    la que el subárbol de cada nodo ocupa un tramo contiguo [start, end), de
+    modo que las muestras de un nodo son una vista ``perm[start:end]``. Los
+    hijos se guardan en formato CSR (child_ptr, child_idx).
+
+    Cada muestra pertenece al nodo más profundo que la contiene (``owner``),
+    por lo que las hojas, las etiquetas y los cortes se obtienen en O(n).
+    """
+
+    ROOT = 0
+
+    def __init__(self, n_samples, root_name="root"):
+        """
+        Inicializa el árbol con la raíz conteniendo todas las muestras.
+
+        Args:
+            n_samples: Número total de muestras
+            root_name: Nombre del nodo raíz
+        """
+        self.n_samples = n_samples
+        self.names = [root_name]
+        self._parents = [-1]
+        self.owner = np.zeros(n_samples, dtype=np.int64)
+        self._frozen = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def add_node(self, name, parent, samples):
+        """
+        Añade un nodo hijo con un subconjunto de las muestras del padre.
+
+        Args:
+            name: Nombre del nodo (por compatibilidad con la vista NetworkX)
+            parent: Índice del nodo padre
+            samples: Índices de las muestras del nodo
+
+        Returns:
+            int: Índice del nuevo nodo
+        """
+        node = len(self.names)
+        self.names.append(name)
+        self._parents.append(parent)
+        self.owner[np.asarray(samples, dtype=np.int64)] = node
+        self._frozen = False
+        return node
+
+    def _freeze(self):
+        """Construye los arreglos de hijos, el orden DFS y la permutación."""
+        if self._frozen:
+            return
+        n_nodes = len(self.names)
+        self.parent = np.asarray(self._parents, dtype=np.int64)
+
+        # Hijos en CSR, en orden de inserción
+        children = np.arange(1, n_nodes)
+        order = np.argsort(self.parent[1:], kind='stable')
+        self.child_idx = children[order]
+        self.child_ptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.add.at(self.child_ptr, self.parent[1:] + 1, 1)
+        np.cumsum(self.child_ptr, out=self.child_ptr)
+
+        # Orden en preorden (DFS) y tamaño de cada subárbol en nodos
+        preorder = np.empty(n_nodes, dtype=np.int64)
+        stack = [self.ROOT]
+        pos = 0
+        while stack:
+            node = stack.pop()
+            preorder[node] = pos
+            pos += 1
+            stack.extend(self.child_idx[self.child_ptr[node]:self.child_ptr[node + 1]][::-1].tolist())
+        subtree = np.ones(n_nodes, dtype=np.int64)
+        for node in np.argsort(preorder)[::-1][:-1]:
+            subtree[self.parent[node]] += subtree[node]
+
+        # Permutación: muestras ordenadas por el preorden de su dueño
+        owner_pre = preorder[self.owner]
+        self.perm = np.argsort(owner_pre, kind='stable')
+        sorted_pre = owner_pre[self.perm]
+        self.start = np.searchsorted(sorted_pre, preorder, side='left')
+        self.end = np.searchsorted(sorted_pre, preorder + subtree, side='left')
+        self._index = None
+        self._frozen = True
+
+    def index(self, name):
+        """Devuelve el índice de un nodo a partir de su nombre."""
+        if self._index is None or len(self._index) != len(self.names):
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index[name]
+
+    def samples(self, node):
+        """Muestras del subárbol de un nodo (vista sobre la permutación)."""
+        self._freeze()
+        return self.perm[self.start[node]:self.end[node]]
+
+    def size(self, node=None):
+        """Número de muestras de un nodo, o de todos si node es None."""
+        self._freeze()
+        sizes = self.end - self.start
+        return sizes if node is None else int(sizes[node])
+
+    def children(self, node):
+        """Hijos de un nodo en orden de inserción."""
+        self._freeze()
+        return self.child_idx[self.child_ptr[node]:self.child_ptr[node + 1]]
+
+    def depths(self):
+        """Profundidad de cada nodo (la raíz tiene profundidad 0)."""
+        self._freeze()
+        depth = np.zeros(len(self.names), dtype=np.int64)
+        # Los padres siempre se crean antes que sus hijos
+        for node in range(1, len(self.names)):
+            depth[node] = depth[self.parent[node]] + 1
+        return depth
+
+    def leaves(self):
+        """Índices de las hojas (sin contar la raíz), en orden de inserción."""
+        self._freeze()
+        is_leaf = np.diff(self.child_ptr) == 0
+        is_leaf[self.ROOT] = False
+        return np.flatnonzero(is_leaf)
+
+    def uncovered(self):
+        """Muestras que no pertenecen a ninguna hoja."""
+        leaves = np.zeros(len(self.names), dtype=bool)
+        leaves[self.leaves()] = True
+        return np.flatnonzero(~leaves[self.owner])
+
+    def labels_from_nodes(self, nodes, max_clusters=None):
+        """
+        Asigna etiquetas a partir de un conjunto de nodos disjuntos.
+
+        Los nodos se ordenan por tamaño (de mayor a menor, estable); si hay más
+        de max_clusters, los más pequeños se combinan en la última etiqueta.
+        Las muestras fuera de esos nodos quedan con etiqueta -1.
+
+        Args:
+            nodes: Índices de nodos disjuntos
+            max_clusters: Número máximo de etiquetas (None sin límite)
+
+        Returns:
+            tuple: (etiquetas por muestra, nodos ordenados por tamaño)
+        """
+        self._freeze()
+        nodes = np.asarray(nodes, dtype=np.int64)
+        sizes = self.end[nodes] - self.start[nodes]
+        ordered = nodes[np.argsort(-sizes, kind='stable')]
+        node_label = np.arange(len(ordered))
+        if max_clusters is not None and len(ordered) > max_clusters:
+            node_label = np.minimum(node_label, max_clusters - 1)
+
+        labels = np.full(self.n_samples, -1)
+        lengths = self.end[ordered] - self.start[ordered]
+        positions = np.concatenate([np.arange(s, e) for s, e in
+                                    zip(self.start[ordered], self.end[ordered])]) \
+            if len(ordered) else np.empty(0, dtype=np.int64)
+        labels[self.perm[positions]] = np.repeat(node_label, lengths)
+        return labels, ordered
+
+    def cut(self, n_clusters):
+        """
+        Corta el árbol en aproximadamente n_clusters grupos.
+
+        Se expande siempre el nodo más grande que tenga hijos hasta alcanzar
+        n_clusters nodos; si la última expansión se pasa, los grupos más
+        pequeños se combinan en uno.
+
+        Args:
+            n_clusters: Número de clusters deseado
+
+        Returns:
+            ndarray: Etiquetas por muestra
+        """
+        self._freeze()
+        sizes = self.end - self.start
+        heap = [(-sizes[self.ROOT], self.ROOT)]
+        frontier = []
+        while heap and len(heap) + len(frontier) < n_clusters:
+            _, node = heapq.heappop(heap)
+            kids = self.children(node)
+            if len(kids) == 0:
+                frontier.append(node)
+                continue
+            for child in kids.tolist():
+                heapq.heappush(heap, (-sizes[child], child))
+        frontier.extend(node for _, node in heap)
+        labels, _ = self.labels_from_nodes(frontier, max_clusters=n_clusters)
+        return labels
+
+    def to_networkx(self):
+        """
+        Construye la vista NetworkX del árbol (nodos con atributo ``samples``).
+
+        Returns:
+            nx.Graph: Árbol con los mismos nombres de nodo que antes
+        """
+        self._freeze()
+        tree = nx.Graph()
+        for node, name in enumerate(self.names):
+            tree.add_node(name, samples=self.samples(node).tolist())
+        tree.add_edges_from((self.names[p], self.names[c])
+                            for c, p in enumerate(self.parent.tolist()) if p >= 0)
+        return tree
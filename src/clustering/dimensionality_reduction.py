@@ -0,0 +1,162 @@
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.random_projection import SparseRandomProjection
+
+from src.clustering.similarity import normalize_rows, SimilarityEngine
+
+
+class DimensionalityReducer:
+    """
+    Etapa opcional de reducción de dimensionalidad entre la vectorización y el clustering.
+
+    - 'lsa': TruncatedSVD sobre la matriz TF-IDF (análisis semántico latente).
+    - 'random_projection': proyección aleatoria dispersa (Johnson-Lindenstrauss).
+
+    La salida se normaliza a norma L2 para que la similitud coseno siga
+    siendo un producto punto. La proyección ajustada se puede guardar y
+    reutilizar, de modo que todas las etapas usen el mismo espacio.
+    """
+
+    METHODS = ('lsa', 'random_projection')
+
+    def __init__(self, method='lsa', n_components=100, random_state=42):
+        """
+        Inicializa la etapa de reducción.
+
+        Args:
+            method: 'lsa' o 'random_projection'
+            n_components: Dimensión de destino
+            random_state: Semilla de la proyección
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Método de reducción no soportado: '{method}'. "
+                             f"Opciones: {', '.join(self.METHODS)}")
+        self.method = method
+        self.n_components = n_components
+        self.random_state = random_state
+        self.projection = None
+
+    def fit(self, X):
+        """
+        Ajusta la proyección sobre la matriz de características.
+
+        Args:
+            X: Matriz de características (densa o dispersa CSR)
+
+        Returns:
+            self
+        """
+        n_samples, n_features = X.shape
+        if self.method == 'lsa':
+            # TruncatedSVD requiere n_components < n_features
+            n_components = max(1, min(self.n_components, n_features - 1, n_samples - 1))
+            self.projection = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        else:
+            self.projection = SparseRandomProjection(n_components=self.n_components,
+                                                     random_state=self.random_state)
+        self.projection.fit(X)
+        return self
+
+    def transform(self, X):
+        """
+        Proyecta la matriz y normaliza cada fila.
+
+        Args:
+            X: Matriz de características en el espacio original
+
+        Returns:
+            ndarray: Matriz densa n × n_components con filas de norma unitaria
+        """
+        if self.projection is None:
+            raise ValueError("La reducción debe ajustarse primero usando fit()")
+        Z = self.projection.transform(X)
+        Z = Z.toarray() if hasattr(Z, 'toarray') else Z
+        return normalize_rows(Z)
+
+    def fit_transform(self, X):
+        """Ajusta la proyección y devuelve la matriz reducida."""
+        return self.fit(X).transform(X)
+
+    @property
+    def explained_variance(self):
+        """Fracción de varianza explicada (solo LSA), o None."""
+        if self.method == 'lsa' and self.projection is not None:
+            return float(self.projection.explained_variance_ratio_.sum())
+        return None
+
+    @staticmethod
+    def neighborhood_preservation(X, Z, k=10, n_queries=500, random_state=0,
+                                  memory_budget_mb=256):
+        """
+        Mide qué tan bien se conservan los vecindarios tras la reducción.
+
+        Para una muestra de documentos compara sus k vecinos más similares
+        (coseno) en el espacio original y en el reducido.
+
+        Args:
+            X: Matriz en el espacio original
+            Z: Matriz en el espacio reducido
+            k: Número de vecinos comparados
+            n_queries: Número de documentos muestreados (None para todos)
+            random_state: Semilla del muestreo
+            memory_budget_mb: Memoria máxima por bloque de similitud
+
+        Returns:
+            dict: Fracción media de vecinos compartidos (recall@k) y k usado
+        """
+        n_samples = X.shape[0]
+        k = max(1, min(k, n_samples - 1))
+        if n_queries is None or n_queries >= n_samples:
+            queries = np.arange(n_samples)
+        else:
+            rng = np.random.default_rng(random_state)
+            queries = np.sort(rng.choice(n_samples, size=n_queries, replace=False))
+
+        overlaps = []
+        for space in (X, Z):
+            engine = SimilarityEngine(space, memory_budget_mb=memory_budget_mb)
+            neighbors = np.empty((len(queries), k), dtype=np.int64)
+            # Las consultas se procesan en bloques de filas para que la matriz
+            # densa de similitudes respete memory_budget_mb
+            for start in range(0, len(queries), engine.block_size):
+                block_queries = queries[start:start + engine.block_size]
+                sims = engine.Xn[block_queries] @ engine.Xn.T
+                sims = sims.toarray() if hasattr(sims, 'toarray') else np.asarray(sims)
+                sims[np.arange(len(block_queries)), block_queries] = -np.inf
+                neighbors[start:start + len(block_queries)] = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            overlaps.append(neighbors)
+
+        shared = [len(np.intersect1d(a, b)) / k for a, b in zip(*overlaps)]
+        return {'k': k, 'neighborhood_recall': float(np.mean(shared))}
+
+    def save(self, path):
+        """
+        Guarda la proyección ajustada.
+
+        Args:
+            path: Ruta del archivo de salida
+        """
+        joblib.dump({
+            'method': self.method,
+            'n_components': self.n_components,
+            'random_state': self.random_state,
+            'projection': self.projection
+        }, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga una proyección guardada con save().
+
+        Args:
+            path: Ruta del archivo
+
+        Returns:
+            DimensionalityReducer: Etapa lista para transform()
+        """
+        state = joblib.load(path)
+        reducer = cls(method=state['method'], n_components=state['n_components'],
+                      random_state=state['random_state'])
+        reducer.projection = state['projection']
+        return reducer
@@ -1,38 +1,63 @@
 import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
-import community as community_louvain
-from scipy.spatial.distance import squareform, pdist
+import scipy.sparse as sp
 import sys
 
+from src.clustering.similarity import SimilarityEngine
+from src.clustering.similarity_graph import build_similarity_graph, edge_arrays
+from src.clustering.graph_engine import CSRGraphEngine
+from src.clustering.cluster_tree import ClusterTree
+from src.clustering.tree_export import cluster_tree_to_nodes, export_tree_json, write_html_viewer
+
 class DivisiveClusteringGraph:
     """
     Implementación de clustering jerárquico divisivo usando grafos.
     Esta implementación usa la librería NetworkX como estructura de datos principal.
     """
     
-    def __init__(self, threshold=0.2, max_clusters=20):
+    def __init__(self, threshold=0.2, max_clusters=20, n_neighbors=None,
+                 memory_budget_mb=256, dtype=np.float64, max_depth=5, random_state=None):
         """
         Inicializa el algoritmo de clustering.
         
         Args:
             threshold: Umbral de similitud para conectar nodos
             max_clusters: Número máximo de clusters a crear
+            n_neighbors: Si se indica, cada nodo conserva solo sus k vecinos más
+                similares por encima del umbral (grafo kNN)
+            memory_budget_mb: Memoria máxima por bloque de similitud, en MB
+            dtype: Precisión del cálculo de similitud (np.float64 o np.float32)
+            max_depth: Número máximo de niveles de subdivisión
+            random_state: Semilla de Louvain (None para un orden aleatorio)
         """
         self.threshold = threshold
         self.max_clusters = max_clusters
-        self.tree = None
+        self.n_neighbors = n_neighbors
+        self.memory_budget_mb = memory_budget_mb
+        self.dtype = dtype
+        self.max_depth = max_depth
+        self.random_state = random_state
+        self.cluster_tree = None
+        self.combined_samples = None
+        self._nx_tree = None
         self.labels_ = None
         self.graph = None
+        self.adjacency = None
         self.all_samples = None
         self.n_samples = 0
     
-    def fit(self, X):
+    def fit(self, X, adjacency=None, engine=None):
         """
         Ejecuta el algoritmo de clustering sobre los datos.
         
         Args:
-            X: Matriz de vectores de características
+            X: Matriz de vectores de características (densa o dispersa CSR)
+            adjacency: Matriz de adyacencia dispersa simétrica precalculada
+                (opcional); si se omite se construye el grafo de similitud coseno
+            engine: Motor de similitud ya construido (SimilarityEngine,
+                PrecomputedSimilarity o MinHashSimilarity) para reutilizar
+                distancias precalculadas o usar otra fuente de aristas
                 
         Returns:
             self
@@ -44,65 +69,32 @@ class DivisiveClusteringGraph:
         self.all_samples = list(range(self.n_samples))
         print(f"Total de documentos a procesar: {self.n_samples}")
         
-        # Calculamos la matriz de similitud basada en distancia coseno
-        print("Calculando matriz de similitud...")
-        similarity_matrix = 1 - squareform(pdist(X, metric='cosine'))
-        
-        # Crear grafo con umbral de similitud adaptativo
-        print(f"Construyendo grafo con umbral inicial: {self.threshold}")
-        self.graph = nx.Graph()
-        
-        # Añadir todos los nodos
-        for i in range(self.n_samples):
-            self.graph.add_node(i)
-        
-        # Primera pasada: añadir aristas con umbral inicial
-        edges_added = 0
-        connected_nodes = set()
-        
-        for i in range(self.n_samples):
-            for j in range(i+1, self.n_samples):
-                if similarity_matrix[i, j] > self.threshold:
-                    self.graph.add_edge(i, j, weight=similarity_matrix[i, j])
-                    edges_added += 1
-                    connected_nodes.add(i)
-                    connected_nodes.add(j)
+        if adjacency is None:
+            # Grafo de similitud coseno construido por bloques, sin la matriz n×n
+            print(f"Construyendo grafo con umbral inicial: {self.threshold}")
+            if engine is None:
+                engine = SimilarityEngine(X, memory_budget_mb=self.memory_budget_mb, dtype=self.dtype)
+            adjacency, used_threshold, tried = build_similarity_graph(
+                engine, self.threshold, n_neighbors=self.n_neighbors)
+            
+            if len(tried) > 1:
+                print("Muchos nodos aislados detectados. Ajustando umbral...")
+                for t, connected in tried:
+                    print(f"Con umbral {t}: {connected}/{self.n_samples} nodos conectados")
+                # Actualizar umbral usado
+                self.threshold = used_threshold
+                print(f"Umbral final utilizado: {self.threshold}")
+        else:
+            print("Usando grafo de similitud precalculado")
+            adjacency = sp.csr_matrix(adjacency)
         
-        print(f"Aristas añadidas: {edges_added}")
-        print(f"Nodos conectados: {len(connected_nodes)}/{self.n_samples}")
+        self.adjacency = adjacency
+        self.engine = CSRGraphEngine(adjacency, random_state=self.random_state)
+        self._build_graph(*edge_arrays(adjacency))
         
-        # Si hay muchos nodos aislados, reducir el umbral adaptivamente
-        if len(connected_nodes) < self.n_samples * 0.8:
-            print("Muchos nodos aislados detectados. Ajustando umbral...")
-            
-            # Reducir umbral hasta conectar al menos el 80% de los nodos
-            adaptive_threshold = self.threshold
-            while len(connected_nodes) < self.n_samples * 0.8 and adaptive_threshold > 0.05:
-                adaptive_threshold -= 0.05
-                print(f"Probando umbral: {adaptive_threshold}")
-                
-                # Limpiar grafo actual
-                self.graph = nx.Graph()
-                for i in range(self.n_samples):
-                    self.graph.add_node(i)
-                
-                # Añadir aristas con nuevo umbral
-                connected_nodes = set()
-                edges_added = 0
-                
-                for i in range(self.n_samples):
-                    for j in range(i+1, self.n_samples):
-                        if similarity_matrix[i, j] > adaptive_threshold:
-                            self.graph.add_edge(i, j, weight=similarity_matrix[i, j])
-                            edges_added += 1
-                            connected_nodes.add(i)
-                            connected_nodes.add(j)
-                
-                print(f"Con umbral {adaptive_threshold}: {len(connected_nodes)}/{self.n_samples} nodos conectados, {edges_added} aristas")
-            
-            # Actualizar umbral usado
-            self.threshold = adaptive_threshold
-            print(f"Umbral final utilizado: {self.threshold}")
+        connected_nodes = np.count_nonzero(np.diff(adjacency.indptr))
+        print(f"Aristas añadidas: {self.graph.number_of_edges()}")
+        print(f"Nodos conectados: {connected_nodes}/{self.n_samples}")
         
         # Verificar componentes conectados
         components = list(nx.connected_components(self.graph))
@@ -110,33 +102,24 @@ class DivisiveClusteringGraph:
         for i, comp in enumerate(components[:5]):  # Mostrar los primeros 5 componentes
             print(f"  Componente {i}: {len(comp)} nodos")
         
-        # Inicializar árbol de clustering
-        self.tree = nx.Graph()
-        self.tree.add_node("root", samples=self.all_samples)
+        # Inicializar árbol de clustering (compacto, basado en arreglos)
+        self.cluster_tree = ClusterTree(self.n_samples, root_name="root")
+        self.combined_samples = None
+        self._nx_tree = None
         
         # Ejecutar clustering divisivo adaptado para garantizar cobertura total
         self._perform_divisive_clustering()
         
         # Después del clustering, verificar si todos los nodos están asignados
-        assigned_samples = set()
-        leaf_nodes = [node for node, degree in self.tree.degree() if degree == 1 and node != "root"]
-        
-        for node in leaf_nodes:
-            if "samples" in self.tree.nodes[node]:
-                assigned_samples.update(self.tree.nodes[node]["samples"])
-        
-        # Verificar cobertura
-        missing_samples = set(self.all_samples) - assigned_samples
+        missing_samples = self.cluster_tree.uncovered()
         print(f"Verificación de cobertura:")
-        print(f"- Muestras asignadas: {len(assigned_samples)}/{self.n_samples}")
+        print(f"- Muestras asignadas: {self.n_samples - len(missing_samples)}/{self.n_samples}")
         
-        if missing_samples:
+        if len(missing_samples):
             print(f"- ADVERTENCIA: {len(missing_samples)} muestras no asignadas")
             # Asignar explícitamente las muestras faltantes
-            for sample in missing_samples:
-                new_node = f"isolated_{sample}"
-                self.tree.add_node(new_node, samples=[sample])
-                self.tree.add_edge("root", new_node)
+            for sample in missing_samples.tolist():
+                self.cluster_tree.add_node(f"isolated_{sample}", ClusterTree.ROOT, [sample])
                 print(f"  Asignado nodo aislado para muestra {sample}")
         
         # Generar etiquetas de cluster
@@ -153,6 +136,50 @@ class DivisiveClusteringGraph:
         
         return self
     
+    @property
+    def tree(self):
+        """
+        Vista NetworkX del árbol de clusters, derivada bajo demanda.
+        
+        Se conserva por compatibilidad (nombres de nodo y atributo samples);
+        los cálculos internos usan cluster_tree.
+        """
+        if self.cluster_tree is None:
+            return None
+        if self._nx_tree is None:
+            self._nx_tree = self.cluster_tree.to_networkx()
+            if self.combined_samples is not None:
+                self._nx_tree.add_node("combined_small_clusters", samples=self.combined_samples.tolist())
+                self._nx_tree.add_edge("root", "combined_small_clusters")
+        return self._nx_tree
+    
+    def cut(self, n_clusters):
+        """
+        Obtiene etiquetas cortando el árbol en n_clusters grupos, en O(n).
+        
+        Args:
+            n_clusters: Número de clusters deseado
+            
+        Returns:
+            ndarray: Etiqueta de cluster por documento
+        """
+        if self.cluster_tree is None:
+            raise ValueError("El modelo debe ser ajustado primero usando fit()")
+        return self.cluster_tree.cut(n_clusters)
+    
+    def _build_graph(self, rows, cols, weights):
+        """
+        Crea el grafo de NetworkX añadiendo nodos y aristas en bloque.
+        
+        Args:
+            rows: Índices de origen de las aristas
+            cols: Índices de destino de las aristas
+            weights: Similitud asociada a cada arista
+        """
+        self.graph = nx.Graph()
+        self.graph.add_nodes_from(range(self.n_samples))
+        self.graph.add_weighted_edges_from(zip(rows.tolist(), cols.tolist(), weights.tolist()))
+    
     def _perform_divisive_clustering(self):
         """Ejecuta el algoritmo divisivo garantizando cobertura total"""
         
@@ -162,24 +189,23 @@ class DivisiveClusteringGraph:
         if len(components) == 0:
             print("No hay componentes conectados. Cada documento será su propio cluster.")
             for i in self.all_samples:
-                node_name = f"singleton_{i}"
-                self.tree.add_node(node_name, samples=[i])
-                self.tree.add_edge("root", node_name)
+                self.cluster_tree.add_node(f"singleton_{i}", ClusterTree.ROOT, [i])
             return
             
         # Si hay múltiples componentes, tratarlos como clusters iniciales
         if len(components) > 1:
             print(f"Procesando {len(components)} componentes como clusters iniciales")
+            pending = []
             for i, component in enumerate(components):
                 comp_samples = list(component)
                 if len(comp_samples) > 0:
                     node_name = f"component_{i}"
-                    self.tree.add_node(node_name, samples=comp_samples)
-                    self.tree.add_edge("root", node_name)
+                    node = self.cluster_tree.add_node(node_name, ClusterTree.ROOT, comp_samples)
                     
-                    # Subdividir componentes grandes recursivamente
+                    # Subdividir componentes grandes (todos a la vez)
                     if len(comp_samples) > 3:
-                        self._subdivide_cluster(node_name, comp_samples)
+                        pending.append((node, node_name, comp_samples))
+            self._subdivide_clusters(pending)
         else:
             # Si hay un solo componente, dividir recursivamente
             print("Procesando el componente único")
@@ -191,13 +217,11 @@ class DivisiveClusteringGraph:
                 print(f"{len(unconnected)} nodos no están en el componente conectado principal")
                 # Añadir nodos no conectados como componentes individuales
                 for i, node in enumerate(unconnected):
-                    node_name = f"isolated_{i}"
-                    self.tree.add_node(node_name, samples=[node])
-                    self.tree.add_edge("root", node_name)
+                    self.cluster_tree.add_node(f"isolated_{i}", ClusterTree.ROOT, [node])
             
             # Subdividir el componente principal
             if component:
-                self._subdivide_cluster("root", component)
+                self._subdivide_clusters([(ClusterTree.ROOT, "root", component)])
         
         # Verificar nodos aislados (que no están en ningún componente)
         all_component_nodes = set()
@@ -208,161 +232,120 @@ class DivisiveClusteringGraph:
         if isolated_nodes:
             print(f"Añadiendo {len(isolated_nodes)} nodos completamente aislados")
             for i, node in enumerate(isolated_nodes):
-                node_name = f"isolated_node_{i}"
-                self.tree.add_node(node_name, samples=[node])
-                self.tree.add_edge("root", node_name)
+                self.cluster_tree.add_node(f"isolated_node_{i}", ClusterTree.ROOT, [node])
     
-    def _subdivide_cluster(self, node_name, samples, level=0):
+    def _subdivide_clusters(self, clusters):
         """
-        Subdivide un cluster recursivamente.
+        Subdivide clusters nivel por nivel con el motor Louvain sobre CSR.
+        
+        En cada nivel todos los clusters pendientes se dividen en una sola
+        ejecución de Louvain (un subproblema por cluster), sin copiar
+        subgrafos. Los hijos se nombran "{padre}_sub{i}" como antes.
         
         Args:
-            node_name: Nombre del nodo en el árbol
-            samples: Lista de índices de muestra en el cluster
-            level: Nivel actual de recursión
+            clusters: Lista de (índice del nodo, nombre del nodo, índices de muestra)
         """
-        if level >= 5:  # Limitar profundidad para evitar explosión
-            return
-            
-        if len(samples) <= 2:  # No dividir clusters muy pequeños
-            return
-            
-        # Extraer subgrafo
-        subgraph = self.graph.subgraph(samples).copy()
-        
-        # Verificar si hay suficientes aristas para dividir
-        if len(subgraph.edges()) <= 1:
-            return
-        
-        # Detectar comunidades
-        try:
-            partition = community_louvain.best_partition(subgraph)
-            communities = {}
-            for node, community_id in partition.items():
-                if community_id not in communities:
-                    communities[community_id] = []
-                communities[community_id].append(node)
-            
-            # Convertir a lista de comunidades
-            community_list = list(communities.values())
-            
-            # Si solo hay una comunidad, no dividir más
-            if len(community_list) <= 1:
-                return
-                
-            # Añadir subdivisiones al árbol
-            for i, community in enumerate(community_list):
-                if len(community) > 0:
+        pending = clusters
+        level = 0
+        while pending and level < self.max_depth:
+            splits = self.engine.split([samples for _, _, samples in pending])
+            next_pending = []
+            for (node, node_name, _), communities in zip(pending, splits):
+                # Si solo hay una comunidad, no dividir más
+                if communities is None or len(communities) <= 1:
+                    continue
+                for i, community in enumerate(communities):
                     child_name = f"{node_name}_sub{i}"
-                    self.tree.add_node(child_name, samples=community)
-                    self.tree.add_edge(node_name, child_name)
-                    
-                    # Recursivamente subdividir
-                    self._subdivide_cluster(child_name, community, level + 1)
-        except Exception as e:
-            print(f"Error al subdividir cluster {node_name}: {e}")
+                    child = self.cluster_tree.add_node(child_name, node, community)
+                    next_pending.append((child, child_name, community))
+            pending = next_pending
+            level += 1
     
     def _generate_cluster_labels(self):
         """Genera etiquetas finales para cada documento basado en el árbol de clustering"""
         
         # Identificar nodos hoja que representan clusters finales
-        leaf_nodes = [node for node, degree in self.tree.degree() if degree == 1 and node != "root"]
+        leaf_nodes = self.cluster_tree.leaves()
         
         # Si no hay nodos hoja (solo root), crear uno por documento
-        if not leaf_nodes or (len(leaf_nodes) == 1 and len(self.tree.nodes[leaf_nodes[0]]["samples"]) == self.n_samples):
+        if len(leaf_nodes) == 0 or (len(leaf_nodes) == 1 and self.cluster_tree.size(leaf_nodes[0]) == self.n_samples):
             print("No se pudieron identificar clusters significativos. Asignando cada documento a su propio cluster.")
             self.labels_ = np.arange(self.n_samples)
             return
         
-        # Ordenar nodos hoja por tamaño para priorizar clusters grandes
-        leaf_sizes = [(node, len(self.tree.nodes[node]["samples"])) for node in leaf_nodes]
-        sorted_leaves = sorted(leaf_sizes, key=lambda x: x[1], reverse=True)
+        # Ordenar nodos hoja por tamaño para priorizar clusters grandes; si hay
+        # más de max_clusters, los más pequeños se combinan en uno
+        self.labels_, sorted_leaves = self.cluster_tree.labels_from_nodes(leaf_nodes, self.max_clusters)
         
         # Mostrar distribución de tamaños
-        sizes = [size for _, size in sorted_leaves[:10]]
+        sizes = self.cluster_tree.size()[sorted_leaves[:10]].tolist()
         print(f"Tamaños de los 10 clusters principales: {sizes}")
         
-        # Limitar número de clusters si es necesario
         if len(sorted_leaves) > self.max_clusters:
             print(f"Limitando clusters de {len(sorted_leaves)} a {self.max_clusters}")
-            
-            # Seleccionar los clusters más grandes
-            main_clusters = [node for node, _ in sorted_leaves[:self.max_clusters-1]]
-            
-            # Combinar todos los clusters pequeños en uno
-            small_samples = []
-            for node, _ in sorted_leaves[self.max_clusters-1:]:
-                small_samples.extend(self.tree.nodes[node]["samples"])
-            
-            # Si hay clusters pequeños combinados, añadirlos
-            if small_samples:
-                combined_node = "combined_small_clusters"
-                self.tree.add_node(combined_node, samples=small_samples)
-                self.tree.add_edge("root", combined_node)
-                main_clusters.append(combined_node)
-                
-            final_clusters = main_clusters
+            self.combined_samples = np.flatnonzero(self.labels_ == self.max_clusters - 1)
+            self._nx_tree = None
+            final_count = self.max_clusters
         else:
-            final_clusters = [node for node, _ in sorted_leaves]
-        
-        # Inicializar todas las etiquetas a -1 (sin asignar)
-        self.labels_ = np.full(self.n_samples, -1)
-        
-        # Asignar etiquetas a cada documento
-        for i, node in enumerate(final_clusters):
-            samples = self.tree.nodes[node]["samples"]
-            for sample in samples:
-                if sample < self.n_samples:  # Verificar índice válido
-                    self.labels_[sample] = i
+            final_count = len(sorted_leaves)
         
         # Verificar si hay documentos sin asignar y asignarlos al cluster más cercano
         unassigned = np.where(self.labels_ == -1)[0]
         if len(unassigned) > 0:
             print(f"Asignando {len(unassigned)} documentos sin etiquetar al cluster más cercano")
             # Para cada documento sin asignar, crear un cluster nuevo
-            for i, doc_idx in enumerate(unassigned):
-                self.labels_[doc_idx] = len(final_clusters) + i
+            self.labels_[unassigned] = final_count + np.arange(len(unassigned))
     
-    def plot_dendrogram(self, labels=None):
+    def plot_dendrogram(self, labels=None, max_nodes=200):
         """
         Genera una visualización del dendrograma como un grafo jerárquico.
         
+        Si el árbol tiene más de max_nodes nodos se dibujan solo los niveles
+        superiores que caben en ese límite; los nodos colapsados muestran el
+        total de documentos que agrupan seguido de "+", y los hijos más
+        pequeños de un nodo con demasiados hijos se agrupan en un nodo
+        "+N clusters (M docs)". Así el tiempo de layout y de dibujo no crece
+        con el corpus.
+        
         Args:
             labels: Etiquetas para los nodos
+            max_nodes: Número máximo de nodos a dibujar (None para el árbol completo)
         """
-        if self.tree is None:
+        if self.cluster_tree is None:
             raise ValueError("El modelo debe ser ajustado primero usando fit()")
         
+        tree, collapsed = self._truncated_tree(max_nodes)
+        
         # Crear una figura grande
         plt.figure(figsize=(22, 18))
         
         # Verificar nodos en el árbol
-        print(f"Visualizando árbol jerárquico con {len(self.tree.nodes())} nodos")
+        print(f"Visualizando árbol jerárquico con {len(tree.nodes())} nodos")
         
         # Usar un layout jerárquico para visualizar claramente la estructura de árbol
         try:
             import pydot
-            pos = nx.nx_pydot.graphviz_layout(self.tree, prog="dot", root="root")
+            pos = nx.nx_pydot.graphviz_layout(tree, prog="dot", root="root")
             print("Usando layout Graphviz (jerárquico)")
         except:
             # Si falla Graphviz, usar un layout alternativo
             try:
-                pos = nx.spring_layout(self.tree, scale=2.0, seed=42)
+                pos = nx.spring_layout(tree, scale=2.0, seed=42)
                 print("Usando layout Spring (fuerza dirigida)")
             except:
                 # Último recurso: layout jerárquico personalizado
-                pos = self._hierarchical_layout()
+                pos = self._hierarchical_layout(tree)
                 print("Usando layout jerárquico personalizado")
         
         # Dividir los nodos por tipo para visualizarlos de manera diferente
-        root_node = ["root"] if "root" in self.tree.nodes() else []
-        leaf_nodes = [node for node, degree in self.tree.degree() if degree == 1 and node != "root"]
-        internal_nodes = [node for node in self.tree.nodes() 
+        root_node = ["root"] if "root" in tree.nodes() else []
+        leaf_nodes = [node for node, degree in tree.degree() if degree == 1 and node != "root"]
+        internal_nodes = [node for node in tree.nodes() 
                          if node not in leaf_nodes and node not in root_node]
         
         # Dibujar las aristas primero con un estilo claro
         nx.draw_networkx_edges(
-            self.tree, pos,
+            tree, pos,
             width=1.2,
             alpha=0.7,
             edge_color="gray",
@@ -372,7 +355,7 @@ class DivisiveClusteringGraph:
         
         # Dibujar nodos internos
         nx.draw_networkx_nodes(
-            self.tree, pos,
+            tree, pos,
             nodelist=internal_nodes,
             node_size=180,
             node_color="cornflowerblue",
@@ -384,7 +367,7 @@ class DivisiveClusteringGraph:
         # Dibujar el nodo raíz con un estilo destacado
         if root_node:
             nx.draw_networkx_nodes(
-                self.tree, pos,
+                tree, pos,
                 nodelist=root_node,
                 node_size=400,
                 node_color="forestgreen",
@@ -395,7 +378,7 @@ class DivisiveClusteringGraph:
         
         # Dibujar nodos hoja (los clusters finales)
         nx.draw_networkx_nodes(
-            self.tree, pos,
+            tree, pos,
             nodelist=leaf_nodes,
             node_size=250,
             node_color="tomato",
@@ -406,21 +389,23 @@ class DivisiveClusteringGraph:
         
         # Crear etiquetas que informen sobre el tamaño del cluster
         node_labels = {}
-        for node in self.tree.nodes():
-            if node in leaf_nodes:
-                n_samples = len(self.tree.nodes[node]["samples"])
-                node_labels[node] = f"{n_samples}"
+        for node in tree.nodes():
+            if "label" in tree.nodes[node]:
+                node_labels[node] = tree.nodes[node]["label"]
+            elif node in leaf_nodes:
+                n_samples = len(tree.nodes[node]["samples"])
+                node_labels[node] = f"{n_samples}+" if node in collapsed else f"{n_samples}"
             elif node in internal_nodes:
                 if len(internal_nodes) < 50:  # Solo etiquetar internos si no hay demasiados
-                    n_samples = len(self.tree.nodes[node]["samples"])
+                    n_samples = len(tree.nodes[node]["samples"])
                     node_labels[node] = f"{n_samples}"
             elif node in root_node:
-                n_samples = len(self.tree.nodes[node]["samples"])
+                n_samples = len(tree.nodes[node]["samples"])
                 node_labels[node] = f"Root ({n_samples})"
         
         # Añadir etiquetas con formato legible
         nx.draw_networkx_labels(
-            self.tree, pos,
+            tree, pos,
             labels=node_labels,
             font_size=9,
             font_weight='bold',
@@ -449,9 +434,73 @@ class DivisiveClusteringGraph:
         
         return plt.gcf()
 
-    def _hierarchical_layout(self):
+    def _truncated_tree(self, max_nodes):
+        """
+        Construye la vista NetworkX de los niveles superiores del árbol.
+        
+        Los niveles se agregan completos mientras el total de nodos cabe en
+        max_nodes. Un nodo con más de max_nodes - 1 hijos conserva los
+        max_nodes - 2 más grandes y el resto se agrupa en un solo nodo
+        "+N clusters (M docs)", así que ni un abanico muy ancho (p. ej. muchos
+        documentos de ruido bajo la raíz) supera el límite. Cada nodo guarda su
+        tamaño en lugar de su lista de muestras, así que el costo del dibujo no
+        crece con el corpus.
+        
+        Args:
+            max_nodes: Número máximo de nodos (None para el árbol completo)
+            
+        Returns:
+            tuple: (árbol NetworkX, conjunto de nodos colapsados)
+        """
+        cluster_tree = self.cluster_tree
+        sizes = cluster_tree.size()
+        names = cluster_tree.names
+        root = ClusterTree.ROOT
+        max_children = None if max_nodes is None else max(max_nodes - 1, 2)
+        
+        def visible_children(node):
+            # (nombre, tamaño, índice en cluster_tree o None, clusters agrupados)
+            kids = [(names[kid], int(sizes[kid]), kid, 0) for kid in cluster_tree.children(node).tolist()]
+            if node == root and self.combined_samples is not None:
+                kids.append(("combined_small_clusters", len(self.combined_samples), None, 0))
+            if max_children is None or len(kids) <= max_children:
+                return kids
+            kids.sort(key=lambda kid: kid[1], reverse=True)
+            kept, folded = kids[:max_children - 1], kids[max_children - 1:]
+            folded_size = sum(kid[1] for kid in folded)
+            return kept + [(f"{names[node]}_others", folded_size, None, len(folded))]
+        
+        tree = nx.Graph()
+        tree.add_node(names[root], samples=range(int(sizes[root])))
+        collapsed = set()
+        n_nodes = 1
+        level = [root]
+        while level:
+            expansions = [(node, visible_children(node)) for node in level]
+            expansions = [(node, kids) for node, kids in expansions if kids]
+            added = sum(len(kids) for _, kids in expansions)
+            if max_nodes is not None and n_nodes + added > max_nodes:
+                collapsed = {names[node] for node, _ in expansions}
+                print(f"Árbol truncado a {n_nodes} nodos para la visualización")
+                break
+            
+            next_level = []
+            for node, kids in expansions:
+                for name, size, kid, n_folded in kids:
+                    # Solo se guarda el tamaño: las etiquetas solo necesitan len(samples)
+                    tree.add_node(name, samples=range(size))
+                    if n_folded:
+                        tree.nodes[name]["label"] = f"+{n_folded} clusters ({size} docs)"
+                    tree.add_edge(names[node], name)
+                    if kid is not None:
+                        next_level.append(kid)
+            n_nodes += added
+            level = next_level
+        return tree, collapsed
+    
+    def _hierarchical_layout(self, tree=None):
         """Layout jerárquico personalizado para visualizar el árbol de manera estructurada"""
-        G = self.tree
+        G = self.tree if tree is None else tree
         pos = {}
         
         # Primero colocar la raíz en la parte superior
@@ -485,4 +534,21 @@ class DivisiveClusteringGraph:
             next_level = []
             level_count += 1
         
-        return pos
\ No newline at end of file
+        return pos
+    
+    def export_tree(self, json_path, labels=None, html_path=None):
+        """
+        Exporta el árbol completo a JSON (formato plano) y, opcionalmente, a un
+        visor HTML interactivo.
+        
+        Args:
+            json_path: Ruta del archivo JSON
+            labels: Etiquetas de los documentos (opcional)
+            html_path: Ruta del visor HTML (None para no generarlo)
+        """
+        if self.cluster_tree is None:
+            raise ValueError("El modelo debe ser ajustado primero usando fit()")
+        nodes, root = cluster_tree_to_nodes(self.cluster_tree, labels)
+        document = export_tree_json(nodes, root, json_path, "Árbol divisivo basado en grafos")
+        if html_path is not None:
+            write_html_viewer(document, html_path)
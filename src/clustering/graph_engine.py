@@ -0,0 +1,198 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Mejora mínima de modularidad para seguir iterando (igual que python-louvain)
+_MIN_GAIN = 1e-7
+
+
+class CSRGraphEngine:
+    """
+    Detección de comunidades Louvain sobre una adyacencia dispersa (CSR).
+
+    El grafo se guarda como arreglos CSR y nunca se copian subgrafos de
+    NetworkX. Varios clusters se procesan en una sola ejecución: cada uno es
+    un subproblema independiente (se descartan las aristas entre clusters y la
+    modularidad se calcula con el peso total de cada cluster), de modo que el
+    resultado equivale a ejecutar Louvain por separado sobre cada subgrafo.
+
+    Convención: la diagonal de la adyacencia agregada guarda el doble del peso
+    interno de cada comunidad, así la suma de cada fila es el grado del nodo.
+    """
+
+    def __init__(self, adjacency, resolution=1.0, random_state=None):
+        """
+        Inicializa el motor.
+
+        Args:
+            adjacency: Matriz de adyacencia dispersa simétrica con pesos
+            resolution: Parámetro de resolución de la modularidad
+            random_state: Semilla del orden de visita de los nodos
+        """
+        adjacency = sp.csr_matrix(adjacency, dtype=np.float64)
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+        self.adjacency = adjacency
+        self.resolution = resolution
+        self.rng = np.random.default_rng(random_state)
+
+    def _modularity(self, A, com, k, groups, m2, n_groups):
+        """Modularidad de la partición ``com`` para cada subproblema."""
+        coo = A.tocoo()
+        same = com[coo.row] == com[coo.col]
+        internal = np.bincount(groups[coo.row[same]], weights=coo.data[same], minlength=n_groups)
+
+        n_coms = com.max() + 1
+        tot = np.bincount(com, weights=k, minlength=n_coms)
+        com_group = np.zeros(n_coms, dtype=np.int64)
+        com_group[com] = groups
+        tot_sq = np.bincount(com_group, weights=tot ** 2, minlength=n_groups)
+
+        safe_m2 = np.where(m2 > 0, m2, 1.0)
+        return internal / safe_m2 - self.resolution * tot_sq / safe_m2 ** 2
+
+    def _one_level(self, A, com, k, groups, m2, active, n_groups):
+        """
+        Fase de movimiento local: mueve cada nodo a la comunidad vecina con
+        mayor ganancia de modularidad hasta que ningún subproblema mejore.
+        """
+        indptr, indices, data = A.indptr, A.indices, A.data
+        tot = np.bincount(com, weights=k, minlength=len(com))
+        m2_node = m2[groups]
+        active = active.copy()
+        current = self._modularity(A, com, k, groups, m2, n_groups)
+
+        while active.any():
+            for i in self.rng.permutation(np.flatnonzero(active[groups])):
+                start, end = indptr[i], indptr[i + 1]
+                nbrs = indices[start:end]
+                weights = data[start:end]
+                not_self = nbrs != i
+                if not not_self.any():
+                    continue
+
+                own, ki, total = com[i], k[i], m2_node[i]
+                tot[own] -= ki
+                neighbor_coms, inverse = np.unique(com[nbrs[not_self]], return_inverse=True)
+                dnc = np.bincount(inverse, weights=weights[not_self])
+                gains = dnc - self.resolution * tot[neighbor_coms] * ki / total
+
+                own_pos = np.searchsorted(neighbor_coms, own)
+                own_weight = dnc[own_pos] if own_pos < len(neighbor_coms) and neighbor_coms[own_pos] == own else 0.0
+                own_gain = own_weight - self.resolution * tot[own] * ki / total
+
+                best = int(np.argmax(gains))
+                new = neighbor_coms[best] if gains[best] > own_gain else own
+                tot[new] += ki
+                com[i] = new
+
+            updated = self._modularity(A, com, k, groups, m2, n_groups)
+            active &= (updated - current) >= _MIN_GAIN
+            current = updated
+
+        return com, current
+
+    def louvain_levels(self, A, groups):
+        """
+        Ejecuta Louvain multinivel sobre subproblemas independientes.
+
+        Args:
+            A: Adyacencia CSR simétrica (sin aristas entre subproblemas)
+            groups: Subproblema al que pertenece cada nodo (0..g-1)
+
+        Returns:
+            list: Particiones de los nodos originales, de la más fina a la más
+                gruesa; las etiquetas son únicas entre subproblemas
+        """
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+        mapping = np.arange(A.shape[0])
+        active = np.ones(n_groups, dtype=bool)
+        levels = []
+
+        while True:
+            n_nodes = A.shape[0]
+            k = np.asarray(A.sum(axis=1)).ravel()
+            m2 = np.bincount(groups, weights=k, minlength=n_groups)
+            active &= m2 > 0
+            before = self._modularity(A, np.arange(n_nodes), k, groups, m2, n_groups)
+
+            com, after = self._one_level(A, np.arange(n_nodes), k, groups, m2, active, n_groups)
+            improved = (after - before) >= _MIN_GAIN
+            if levels:
+                # Los subproblemas que ya no mejoran conservan su partición
+                stalled = ~improved[groups]
+                com[stalled] = np.arange(n_nodes)[stalled]
+                if not improved.any():
+                    break
+
+            _, com = np.unique(com, return_inverse=True)
+            n_coms = int(com.max()) + 1
+            mapping = com[mapping]
+            levels.append(mapping.copy())
+            if n_coms == n_nodes:
+                break
+
+            # Agregar cada comunidad en un nodo: A' = Pᵀ · A · P
+            P = sp.csr_matrix((np.ones(n_nodes), (np.arange(n_nodes), com)), shape=(n_nodes, n_coms))
+            A = (P.T @ A @ P).tocsr()
+            new_groups = np.empty(n_coms, dtype=np.int64)
+            new_groups[com] = groups
+            groups = new_groups
+            active &= improved
+
+        return levels
+
+    def split(self, clusters):
+        """
+        Divide varios clusters en comunidades con una sola ejecución de Louvain.
+
+        Equivale a aplicar best_partition sobre el subgrafo inducido de cada
+        cluster. Los clusters con dos muestras o menos, o con una arista o
+        menos, no se dividen.
+
+        Args:
+            clusters: Lista de listas de índices de muestra
+
+        Returns:
+            list: Para cada cluster, la lista de comunidades (listas de índices
+                en el orden del cluster), o None si no se pudo dividir
+        """
+        results = [None] * len(clusters)
+        eligible = [i for i, samples in enumerate(clusters) if len(samples) > 2]
+        if not eligible:
+            return results
+
+        nodes = np.concatenate([np.asarray(clusters[i], dtype=np.int64) for i in eligible])
+        groups = np.repeat(np.arange(len(eligible)), [len(clusters[i]) for i in eligible])
+
+        # Una sola extracción del grafo inducido y descarte de aristas entre clusters
+        A = self.adjacency[nodes][:, nodes].tocoo()
+        keep = groups[A.row] == groups[A.col]
+        A = sp.csr_matrix((A.data[keep], (A.row[keep], A.col[keep])), shape=(len(nodes), len(nodes)))
+
+        n_edges = np.bincount(groups[A.tocoo().row], minlength=len(eligible)) // 2
+        splittable = n_edges > 1
+        if not splittable.any():
+            return results
+        if not splittable.all():
+            mask = splittable[groups]
+            nodes, groups = nodes[mask], groups[mask]
+            A = A[mask][:, mask]
+            eligible = [e for e, ok in zip(eligible, splittable) if ok]
+            _, groups = np.unique(groups, return_inverse=True)
+
+        levels = self.louvain_levels(A, groups)
+        labels = levels[-1] if levels else np.arange(len(nodes))
+
+        # Comunidades en orden de primera aparición, miembros en el orden del cluster
+        _, first = np.unique(labels, return_index=True)
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(first))
+        order = np.argsort(rank[labels], kind='stable')
+        bounds = np.flatnonzero(np.diff(rank[labels][order])) + 1
+
+        for members in np.split(order, bounds):
+            owner = eligible[groups[members[0]]]
+            if results[owner] is None:
+                results[owner] = []
+            results[owner].append(nodes[members].tolist())
+        return results
@@ -0,0 +1,316 @@
+import zlib
+import numpy as np
+import scipy.sparse as sp
+from scipy.stats import spearmanr
+
+from src.clustering.similarity import SimilarityEngine, normalize_rows
+
+_EMPTY = np.uint32(np.iinfo(np.uint32).max)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def shingle_hashes(documents, ngram_range=(1, 2)):
+    """
+    Hashes de 32 bits de los n-gramas de palabras de todo el corpus.
+
+    Cada palabra distinta se resume una sola vez con CRC32; el hash de un
+    n-grama combina los de sus palabras de forma vectorizada sobre el vector
+    concatenado de tokens del corpus, sin construir las cadenas de los
+    n-gramas. Los duplicados dentro de un documento se eliminan.
+
+    Args:
+        documents: Textos preprocesados (tokens separados por espacios)
+        ngram_range: Tamaños mínimo y máximo de los n-gramas
+
+    Returns:
+        tuple: (índice de documento de cada shingle, hash uint32), ordenados
+            por documento
+    """
+    cache = {}
+    token_lists = [doc.split() for doc in documents]
+    lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.int64)
+    tokens = np.fromiter((cache[t] if t in cache else cache.setdefault(t, zlib.crc32(t.encode('utf-8')))
+                          for tokens in token_lists for t in tokens),
+                         dtype=np.uint64, count=int(lengths.sum()))
+    doc_of_token = np.repeat(np.arange(len(documents), dtype=np.int64), lengths)
+    position = np.arange(len(tokens)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    remaining = np.repeat(lengths, lengths) - position
+
+    docs, hashes = [], []
+    with np.errstate(over='ignore'):
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            valid = np.flatnonzero(remaining >= n)
+            combined = np.full(len(valid), np.uint64(n))
+            for offset in range(n):
+                combined = (combined * _FNV_PRIME) ^ tokens[valid + offset]
+            docs.append(doc_of_token[valid])
+            hashes.append((combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF))
+
+    codes = (np.concatenate(docs).astype(np.uint64) << np.uint64(32)) | np.concatenate(hashes)
+    codes.sort()
+    codes = codes[np.concatenate(([True], codes[1:] != codes[:-1]))]
+    return (codes >> np.uint64(32)).astype(np.int64), (codes & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def _fmix64(h):
+    """Finalizador fmix64 de MurmurHash3, aplicado en el lugar sobre uint64."""
+    with np.errstate(over='ignore'):
+        h ^= h >> np.uint64(33)
+        h *= np.uint64(0xFF51AFD7ED558CCD)
+        h ^= h >> np.uint64(33)
+        h *= np.uint64(0xC4CEB9FE1A85EC53)
+        h ^= h >> np.uint64(33)
+    return h
+
+
+def choose_bands(num_perm, threshold):
+    """
+    Elige bandas y filas por banda para que el umbral LSH (1/b)^(1/r) se
+    acerque a la similitud de Jaccard deseada.
+
+    Args:
+        num_perm: Número de permutaciones de la firma
+        threshold: Similitud de Jaccard a partir de la cual se buscan candidatos
+
+    Returns:
+        tuple: (bandas, filas por banda)
+    """
+    options = [(num_perm // r, r) for r in range(1, num_perm + 1)]
+    return min(options, key=lambda br: abs((1.0 / br[0]) ** (1.0 / br[1]) - threshold))
+
+
+class MinHashSimilarity:
+    """
+    Motor de similitud de Jaccard estimada con MinHash sobre shingles de palabras.
+
+    Cada documento se representa por el conjunto de sus n-gramas de palabras;
+    la firma MinHash (num_perm mínimos de funciones hash universales) se
+    calcula de forma vectorizada para todo el corpus. Con LSH por bandas solo
+    se comparan los pares que coinciden en alguna banda, de modo que el costo
+    crece con el número de candidatos y no con n².
+
+    Ofrece los mismos métodos que SimilarityEngine usados por el grafo de
+    similitud (row_max, top_k y threshold_edges), por lo que puede pasarse
+    como ``engine`` a DivisiveClusteringGraph.fit(). Los pares que no son
+    candidatos se consideran con similitud 0.
+    """
+
+    def __init__(self, documents, num_perm=128, ngram_range=(1, 2), lsh_threshold=0.1,
+                 max_bucket_size=1000, random_state=42, memory_budget_mb=256, dtype=np.float64):
+        """
+        Calcula las firmas MinHash del corpus.
+
+        Args:
+            documents: Textos preprocesados
+            num_perm: Número de funciones hash de la firma
+            ngram_range: Tamaños mínimo y máximo de los n-gramas de palabras
+            lsh_threshold: Jaccard aproximada a partir de la cual un par
+                suele ser candidato
+            max_bucket_size: Las cubetas LSH más grandes se descartan (suelen
+                deberse a shingles muy frecuentes) para acotar los pares
+            random_state: Semilla de las funciones hash
+            memory_budget_mb: Memoria máxima aproximada (MB) al calcular las firmas
+            dtype: Tipo de las similitudes devueltas
+        """
+        self.n_samples = len(documents)
+        self.num_perm = num_perm
+        self.ngram_range = ngram_range
+        self.max_bucket_size = max_bucket_size
+        self.dtype = np.dtype(dtype)
+        self.bands, self.rows_per_band = choose_bands(num_perm, lsh_threshold)
+        self.lsh_threshold = (1.0 / self.bands) ** (1.0 / self.rows_per_band)
+
+        # Los shingles se mezclan una vez con fmix64 (MurmurHash3); cada función
+        # hash es luego ((h XOR semilla) · multiplicador impar) >> 32
+        rng = np.random.default_rng(random_state)
+        self._seeds = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._multipliers = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        doc_index, values = shingle_hashes(documents, ngram_range)
+        self.shingle_counts = np.bincount(doc_index, minlength=self.n_samples)
+        self.signatures = self._signatures(values, memory_budget_mb)
+        self._pairs = None
+        self._matrix = None
+        self.skipped_buckets = 0
+
+    def _signatures(self, values, memory_budget_mb):
+        """
+        Firmas MinHash (n × num_perm) con reducciones por documento.
+
+        Los hashes del corpus están concatenados y ordenados por documento;
+        cada función hash se aplica a la vez sobre todo el vector y el mínimo por documento se
+        obtiene con np.minimum.reduceat. Las permutaciones se procesan por
+        tramos cuyo tamaño se deriva del presupuesto de memoria.
+        """
+        signatures = np.full((self.n_samples, self.num_perm), _EMPTY, dtype=np.uint32)
+        non_empty = np.flatnonzero(self.shingle_counts)
+        if len(non_empty) == 0:
+            return signatures
+        values = _fmix64(values.astype(np.uint64))
+        starts = np.concatenate(([0], np.cumsum(self.shingle_counts[non_empty])[:-1]))
+        # Un arreglo uint64 de chunk_size × total de shingles por tramo
+        chunk_size = max(1, int(memory_budget_mb * 1024 ** 2 // (8 * len(values))))
+
+        for start in range(0, self.num_perm, chunk_size):
+            stop = min(start + chunk_size, self.num_perm)
+            hashed = values[None, :] ^ self._seeds[start:stop, None]
+            with np.errstate(over='ignore'):
+                hashed *= self._multipliers[start:stop, None]
+            hashed >>= np.uint64(32)
+            signatures[non_empty, start:stop] = np.minimum.reduceat(hashed, starts, axis=1).T
+        return signatures
+
+    def _band_keys(self, band):
+        """Clave de 64 bits de una banda para cada documento (hash polinómico)."""
+        columns = self.signatures[:, band * self.rows_per_band:(band + 1) * self.rows_per_band]
+        keys = np.zeros(self.n_samples, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for column in columns.T:
+                keys = keys * _FNV_PRIME + column.astype(np.uint64)
+        return keys
+
+    def candidate_pairs(self):
+        """
+        Pares candidatos (i < j) que coinciden en al menos una banda LSH.
+
+        Returns:
+            tuple: (filas, columnas) de los pares únicos
+        """
+        if self._pairs is not None:
+            return self._pairs
+        n = self.n_samples
+        valid = np.flatnonzero(self.shingle_counts)
+        codes = []
+        self.skipped_buckets = 0
+        for band in range(self.bands):
+            keys = self._band_keys(band)[valid]
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1))
+            sizes = np.diff(np.concatenate((starts, [len(sorted_keys)])))
+            too_big = sizes > self.max_bucket_size
+            self.skipped_buckets += int(np.count_nonzero(too_big))
+
+            # Cada elemento de una cubeta se empareja con los que le siguen en ella
+            rank = np.arange(len(sorted_keys)) - np.repeat(starts, sizes)
+            following = np.repeat(np.where(too_big, 0, sizes), sizes) - rank - 1
+            following = np.maximum(following, 0)
+            total = int(following.sum())
+            if total == 0:
+                continue
+            first = np.repeat(np.arange(len(sorted_keys)), following)
+            offset = np.arange(total) - np.repeat(np.cumsum(following) - following, following)
+            second = first + 1 + offset
+            i = valid[order[first]]
+            j = valid[order[second]]
+            codes.append(np.minimum(i, j).astype(np.int64) * n + np.maximum(i, j))
+
+        codes = np.unique(np.concatenate(codes)) if codes else np.empty(0, dtype=np.int64)
+        self._pairs = (codes // n, codes % n)
+        return self._pairs
+
+    def pair_similarity(self, rows, cols, chunk_size=65536):
+        """
+        Jaccard estimada (fracción de mínimos coincidentes) para pares dados.
+
+        Args:
+            rows: Índices del primer documento de cada par
+            cols: Índices del segundo documento de cada par
+            chunk_size: Pares por tramo
+
+        Returns:
+            ndarray: Similitud estimada de cada par
+        """
+        sims = np.empty(len(rows), dtype=self.dtype)
+        for start in range(0, len(rows), chunk_size):
+            stop = start + chunk_size
+            equal = self.signatures[rows[start:stop]] == self.signatures[cols[start:stop]]
+            sims[start:stop] = equal.mean(axis=1)
+        return sims
+
+    def _candidate_matrix(self):
+        """Matriz CSR simétrica con la similitud estimada de los candidatos."""
+        if self._matrix is None:
+            rows, cols = self.candidate_pairs()
+            sims = self.pair_similarity(rows, cols)
+            upper = sp.coo_matrix((sims, (rows, cols)), shape=(self.n_samples, self.n_samples))
+            self._matrix = (upper + upper.T).tocsr()
+            self._matrix.eliminate_zeros()
+        return self._matrix
+
+    def row_max(self):
+        """Similitud máxima de cada documento con sus candidatos (0 sin candidatos)."""
+        return self._candidate_matrix().max(axis=1).toarray().ravel().astype(self.dtype)
+
+    def top_k(self, k):
+        """
+        Los k candidatos más similares de cada documento.
+
+        Las posiciones sin candidato suficiente se rellenan con el propio
+        documento y similitud -inf, que el grafo descarta al aplicar el umbral.
+        """
+        k = max(1, min(k, self.n_samples - 1))
+        matrix = self._candidate_matrix()
+        row_of = np.repeat(np.arange(self.n_samples), np.diff(matrix.indptr))
+        order = np.lexsort((-matrix.data, row_of))
+        rank = np.arange(len(order)) - matrix.indptr[row_of[order]]
+        keep = order[rank < k]
+
+        indices = np.repeat(np.arange(self.n_samples)[:, None], k, axis=1)
+        sims = np.full((self.n_samples, k), -np.inf, dtype=self.dtype)
+        rank = rank[rank < k]
+        indices[row_of[keep], rank] = matrix.indices[keep]
+        sims[row_of[keep], rank] = matrix.data[keep]
+        return indices, sims
+
+    def threshold_edges(self, threshold):
+        """Pares candidatos (i < j) cuya similitud supera estrictamente el umbral."""
+        rows, cols = self.candidate_pairs()
+        sims = self.pair_similarity(rows, cols)
+        keep = sims > threshold
+        return rows[keep], cols[keep], sims[keep]
+
+    def compare_with_cosine(self, X, k=10, memory_budget_mb=256):
+        """
+        Mide la concordancia entre la Jaccard MinHash y la similitud coseno.
+
+        Args:
+            X: Matriz de características usada para la similitud coseno
+            k: Número de vecinos para comparar vecindarios
+            memory_budget_mb: Presupuesto de memoria del motor coseno
+
+        Returns:
+            dict: Número de candidatos, correlación de Spearman entre ambas
+                similitudes sobre los candidatos, solapamiento medio de los k
+                vecinos más cercanos y fracción de los k vecinos coseno que
+                LSH propone como candidatos
+        """
+        rows, cols = self.candidate_pairs()
+        jaccard = self.pair_similarity(rows, cols)
+        Xn = normalize_rows(X)
+        if sp.issparse(Xn):
+            cosine = np.asarray(Xn[rows].multiply(Xn[cols]).sum(axis=1)).ravel()
+        else:
+            cosine = np.einsum('ij,ij->i', Xn[rows], Xn[cols])
+        correlation = spearmanr(jaccard, cosine)[0] if len(rows) > 1 else float('nan')
+
+        cos_idx, _ = SimilarityEngine(X, memory_budget_mb=memory_budget_mb).top_k(k)
+        mh_idx, mh_sims = self.top_k(k)
+        mh_sets = [set(idx[np.isfinite(s)].tolist()) for idx, s in zip(mh_idx, mh_sims)]
+        overlap = np.mean([len(m & set(c.tolist())) / cos_idx.shape[1] for m, c in zip(mh_sets, cos_idx)])
+
+        # Se busca en los pares candidatos y no en la matriz de similitudes, que
+        # pierde los candidatos con Jaccard estimada 0 al eliminar los ceros
+        query = np.repeat(np.arange(self.n_samples), cos_idx.shape[1])
+        neighbor = cos_idx.ravel()
+        pair_codes = rows.astype(np.int64) * self.n_samples + cols
+        codes = np.minimum(query, neighbor).astype(np.int64) * self.n_samples + np.maximum(query, neighbor)
+        position = np.minimum(np.searchsorted(pair_codes, codes), max(len(pair_codes) - 1, 0))
+        found = (pair_codes[position] == codes) if len(pair_codes) else np.zeros(len(codes), dtype=bool)
+        return {
+            'candidate_pairs': int(len(rows)),
+            'candidate_fraction': len(rows) / max(1, self.n_samples * (self.n_samples - 1) // 2),
+            'spearman': float(correlation),
+            'neighbor_overlap': float(overlap),
+            'cosine_neighbor_recall': float(found.mean())
+        }
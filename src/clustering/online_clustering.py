@@ -0,0 +1,263 @@
+from collections import deque
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+from src.clustering.similarity import normalize_rows
+from src.clustering.cluster_analyzer import ClusterAnalyzer
+
+
+class OnlineClusterAssigner:
+    """
+    Asignación en línea de nuevos abstracts a clusters existentes.
+
+    Parte de las etiquetas de un clustering ya ajustado (aglomerativo o
+    divisivo) y resume cada cluster con su característica (N, suma lineal)
+    sobre vectores unitarios. Cada documento nuevo se asigna al centroide de
+    mayor similitud coseno en O(k·d), y los centroides se actualizan como en
+    k-means por mini-lotes (media acumulada por cluster, renormalizada).
+
+    La calidad se vigila con la similitud de cada documento a su centroide:
+    si la media de las últimas asignaciones cae por debajo de la del ajuste
+    en más de drift_threshold, o si demasiados documentos quedan por debajo
+    del cuantil de baja confianza, se recomienda reagrupar todo el corpus.
+    """
+
+    def __init__(self, drift_threshold=0.15, window=500, low_confidence_quantile=0.05,
+                 max_low_confidence=0.2, min_window=50):
+        """
+        Inicializa el asignador.
+
+        Args:
+            drift_threshold: Caída relativa máxima de la cohesión antes de reagrupar
+            window: Número de asignaciones recientes usadas para medir la deriva
+            low_confidence_quantile: Cuantil de similitud del ajuste que marca
+                una asignación de baja confianza
+            max_low_confidence: Fracción máxima tolerada de asignaciones de baja confianza
+            min_window: Asignaciones mínimas antes de evaluar la deriva
+        """
+        self.drift_threshold = drift_threshold
+        self.window = window
+        self.low_confidence_quantile = low_confidence_quantile
+        self.max_low_confidence = max_low_confidence
+        self.min_window = min_window
+        self.clusters = None
+        self.counts = None
+        self.linear_sums = None
+        self.centroids = None
+        self.baseline = None
+        self.vectorizer = None
+        self.reducer = None
+        self.clustering_argv = None
+        self.recent = deque(maxlen=window)
+        self.n_assigned = 0
+
+    def fit(self, X, labels, vectorizer=None, reducer=None, clustering_argv=None):
+        """
+        Construye los resúmenes de cluster a partir de un clustering existente.
+
+        Args:
+            X: Matriz de características usada en el clustering
+            labels: Etiquetas de cluster por documento
+            vectorizer: Vectorizador TF-IDF ajustado (para asignar textos)
+            reducer: DimensionalityReducer ajustado, si el clustering lo usó
+            clustering_argv: Argumentos de clustering_analysis.py que produjeron
+                el clustering (para reagrupar el mismo corpus en el mismo espacio)
+
+        Returns:
+            self
+        """
+        Xn = normalize_rows(X)
+        self.clusters, inverse, sizes, centroids = ClusterAnalyzer.cluster_centroids(Xn, labels)
+        self.counts = sizes.astype(np.float64)
+        self.linear_sums = centroids * self.counts[:, None]
+        self._refresh_centroids()
+        self.vectorizer = vectorizer
+        self.reducer = reducer
+        self.clustering_argv = list(clustering_argv) if clustering_argv is not None else None
+
+        # Referencia de calidad: similitud de cada documento a su centroide
+        sims = self._row_dot(Xn, self.centroids[inverse])
+        self.baseline = {
+            'cohesion': float(sims.mean()),
+            'low_similarity': float(np.quantile(sims, self.low_confidence_quantile))
+        }
+        self.recent.clear()
+        self.n_assigned = 0
+        print(f"Asignador en línea: {len(self.clusters)} clusters, "
+              f"cohesión de referencia {self.baseline['cohesion']:.4f}")
+        return self
+
+    @staticmethod
+    def _row_dot(A, B):
+        """Producto punto fila a fila entre A (densa o CSR) y B (densa)."""
+        if sp.issparse(A):
+            return np.asarray(A.multiply(B).sum(axis=1)).ravel()
+        return np.einsum('ij,ij->i', A, B)
+
+    def _refresh_centroids(self, rows=None):
+        """Renormaliza los centroides (todos o solo los indicados)."""
+        rows = slice(None) if rows is None else rows
+        sums = self.linear_sums[rows]
+        norms = np.linalg.norm(sums, axis=1)
+        norms[norms == 0] = 1.0
+        if self.centroids is None:
+            self.centroids = np.empty_like(self.linear_sums)
+        self.centroids[rows] = sums / norms[:, None]
+
+    def transform_texts(self, texts):
+        """
+        Vectoriza textos ya preprocesados con el vectorizador (y la reducción) del ajuste.
+
+        Args:
+            texts: Lista de textos preprocesados con TextPreprocessor
+
+        Returns:
+            Matriz de características en el espacio del clustering
+        """
+        if self.vectorizer is None:
+            raise ValueError("El asignador no tiene vectorizador; use predict() con vectores")
+        X = self.vectorizer.transform(texts)
+        return self.reducer.transform(X) if self.reducer is not None else X
+
+    def predict(self, X):
+        """
+        Asigna cada documento al centroide más similar sin modificar el modelo.
+
+        Args:
+            X: Matriz de características de los documentos nuevos
+
+        Returns:
+            tuple: (etiquetas de cluster, similitud con el centroide asignado)
+        """
+        if self.centroids is None:
+            raise ValueError("El asignador debe ajustarse primero usando fit()")
+        Xn = normalize_rows(X)
+        sims = np.asarray(Xn @ self.centroids.T)
+        best = sims.argmax(axis=1)
+        return self.clusters[best], sims[np.arange(len(best)), best]
+
+    def partial_fit(self, X):
+        """
+        Asigna un mini-lote de documentos y actualiza los centroides.
+
+        Args:
+            X: Matriz de características de los documentos nuevos
+
+        Returns:
+            tuple: (etiquetas de cluster, similitud con el centroide asignado)
+        """
+        labels, sims = self.predict(X)
+        self.observe(sims)
+        index = np.searchsorted(self.clusters, labels)
+
+        # Actualización de k-means por mini-lotes: sumas y conteos por cluster
+        Xn = normalize_rows(X)
+        n_rows = Xn.shape[0]
+        indicator = sp.csr_matrix((np.ones(n_rows), (index, np.arange(n_rows))),
+                                  shape=(len(self.clusters), n_rows))
+        batch_sums = indicator @ Xn
+        batch_sums = batch_sums.toarray() if sp.issparse(batch_sums) else np.asarray(batch_sums)
+        touched = np.unique(index)
+        self.linear_sums[touched] += batch_sums[touched]
+        self.counts += np.bincount(index, minlength=len(self.clusters))
+        self._refresh_centroids(touched)
+        return labels, sims
+
+    def observe(self, sims):
+        """
+        Registra las similitudes de asignaciones nuevas para vigilar la deriva.
+
+        partial_fit() lo hace automáticamente; tras predict() se llama a mano
+        para evaluar la deriva sin actualizar los centroides.
+
+        Args:
+            sims: Similitud de cada documento con el centroide asignado
+        """
+        self.recent.extend(np.asarray(sims, dtype=np.float64).tolist())
+        self.n_assigned += len(sims)
+
+    def partial_fit_texts(self, texts):
+        """Igual que partial_fit, a partir de textos preprocesados."""
+        return self.partial_fit(self.transform_texts(texts))
+
+    def drift_report(self):
+        """
+        Resume la calidad de las asignaciones recientes frente al ajuste.
+
+        Returns:
+            dict: Cohesión reciente, caída relativa, fracción de baja confianza
+                y si se recomienda reagrupar
+        """
+        if self.baseline is None:
+            raise ValueError("El asignador debe ajustarse primero usando fit()")
+        if len(self.recent) == 0:
+            return {'assigned': self.n_assigned, 'window': 0, 'recent_cohesion': None,
+                    'cohesion_drop': 0.0, 'low_confidence': 0.0, 'needs_recluster': False}
+
+        recent = np.fromiter(self.recent, dtype=np.float64)
+        cohesion = float(recent.mean())
+        drop = (self.baseline['cohesion'] - cohesion) / max(self.baseline['cohesion'], 1e-12)
+        low_confidence = float(np.mean(recent < self.baseline['low_similarity']))
+        enough = len(recent) >= self.min_window
+        return {
+            'assigned': self.n_assigned,
+            'window': len(recent),
+            'recent_cohesion': cohesion,
+            'cohesion_drop': float(drop),
+            'low_confidence': low_confidence,
+            'needs_recluster': bool(enough and (drop > self.drift_threshold or
+                                                low_confidence > self.max_low_confidence))
+        }
+
+    @property
+    def needs_recluster(self):
+        """True si la calidad reciente se degradó más allá de los umbrales."""
+        return self.drift_report()['needs_recluster']
+
+    def save(self, path):
+        """
+        Guarda el asignador (resúmenes, referencia, vectorizador, reducción y
+        argumentos del clustering de origen).
+
+        Args:
+            path: Ruta del archivo de salida
+        """
+        joblib.dump({
+            'params': {
+                'drift_threshold': self.drift_threshold,
+                'window': self.window,
+                'low_confidence_quantile': self.low_confidence_quantile,
+                'max_low_confidence': self.max_low_confidence,
+                'min_window': self.min_window
+            },
+            'clusters': self.clusters,
+            'counts': self.counts,
+            'linear_sums': self.linear_sums,
+            'baseline': self.baseline,
+            'vectorizer': self.vectorizer,
+            'reducer': self.reducer,
+            'clustering_argv': self.clustering_argv,
+            'recent': list(self.recent),
+            'n_assigned': self.n_assigned
+        }, path, compress=3)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un asignador guardado con save().
+
+        Args:
+            path: Ruta del archivo
+
+        Returns:
+            OnlineClusterAssigner: Asignador listo para partial_fit()
+        """
+        state = joblib.load(path)
+        assigner = cls(**state['params'])
+        for key in ('clusters', 'counts', 'linear_sums', 'baseline', 'vectorizer', 'reducer', 'n_assigned'):
+            setattr(assigner, key, state[key])
+        assigner.clustering_argv = state.get('clustering_argv')
+        assigner.recent.extend(state['recent'])
+        assigner._refresh_centroids()
+        return assigner
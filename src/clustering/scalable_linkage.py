@@ -0,0 +1,312 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Métodos soportados por el modo escalable (actualización de Lance-Williams)
+SCALABLE_METHODS = ('single', 'complete', 'average', 'weighted', 'ward')
+
+
+def _assign_to_centroids(Xn, centroids, block_size=2048):
+    """Asigna cada fila al centroide de mayor similitud coseno, por bloques."""
+    n_samples = Xn.shape[0]
+    assignments = np.empty(n_samples, dtype=np.int64)
+    for start in range(0, n_samples, block_size):
+        sims = Xn[start:start + block_size] @ centroids.T
+        assignments[start:start + block_size] = np.asarray(sims).argmax(axis=1)
+    return assignments
+
+
+def _linear_sums(Xn, assignments, n_groups):
+    """Calcula LS = Pᵀ · X con P la matriz indicadora (n × m) de pertenencia."""
+    n_samples = Xn.shape[0]
+    indicator = sp.csr_matrix(
+        (np.ones(n_samples), (np.arange(n_samples), assignments)),
+        shape=(n_samples, n_groups)
+    )
+    linear_sums = indicator.T @ Xn
+    if sp.issparse(linear_sums):
+        linear_sums = linear_sums.toarray()
+    return np.asarray(linear_sums, dtype=np.float64)
+
+
+def summarize_cf(Xn, n_summaries, random_state=42, n_iter=10):
+    """
+    Resume los documentos en micro-clusters al estilo BIRCH.
+
+    Cada resumen guarda su característica de clustering CF = (N, LS): el número
+    de documentos y la suma lineal de sus vectores. Como los vectores tienen
+    norma unitaria, la suma de cuadrados es simplemente N y no se almacena.
+    La partición se obtiene con k-means esférico (similitud coseno), cuyas
+    iteraciones son productos dispersos X · Cᵀ calculados por bloques.
+
+    Args:
+        Xn: Matriz de características normalizada L2 (densa o CSR)
+        n_summaries: Número máximo de resúmenes a generar
+        random_state: Semilla para elegir los centroides iniciales
+        n_iter: Número de iteraciones de k-means
+
+    Returns:
+        tuple: (assignments, sizes, linear_sums) donde assignments asigna cada
+            documento a un resumen, sizes es N por resumen y linear_sums es la
+            matriz densa (m × d) de sumas lineales
+    """
+    n_samples = Xn.shape[0]
+    n_summaries = min(n_summaries, n_samples)
+    rng = np.random.default_rng(random_state)
+
+    # Centroides iniciales: documentos elegidos al azar
+    seeds = rng.choice(n_samples, size=n_summaries, replace=False)
+    centroids = Xn[seeds]
+    centroids = centroids.toarray() if sp.issparse(centroids) else np.array(centroids)
+
+    assignments = None
+    for _ in range(n_iter):
+        new_assignments = _assign_to_centroids(Xn, centroids)
+        if assignments is not None and np.array_equal(new_assignments, assignments):
+            break
+        assignments = new_assignments
+
+        linear_sums = _linear_sums(Xn, assignments, n_summaries)
+        norms = np.linalg.norm(linear_sums, axis=1)
+        empty = norms == 0
+        # Los centroides vacíos se reinician con documentos al azar
+        if empty.any():
+            reseed = rng.choice(n_samples, size=int(empty.sum()), replace=False)
+            rows = Xn[reseed]
+            linear_sums[empty] = rows.toarray() if sp.issparse(rows) else rows
+            norms[empty] = 1.0
+        centroids = linear_sums / norms[:, None]
+
+    # Descartar resúmenes vacíos y reindexar de forma compacta
+    used, assignments = np.unique(assignments, return_inverse=True)
+    sizes = np.bincount(assignments, minlength=len(used))
+    linear_sums = _linear_sums(Xn, assignments, len(used))
+
+    return assignments, sizes, linear_sums
+
+
+def summary_distances(sizes, linear_sums, method):
+    """
+    Calcula la matriz de distancias inicial entre resúmenes.
+
+    - 'average': distancia coseno media exacta entre todos los pares de
+      documentos de ambos grupos, 1 - LSa·LSb / (Na·Nb).
+    - 'ward': distancia de Ward exacta entre los grupos, en la convención de
+      scipy, sqrt(2·Na·Nb / (Na+Nb)) · ||ca - cb||.
+    - 'single', 'complete', 'weighted': aproximación con la distancia coseno
+      entre centroides (CF no conserva el mínimo ni el máximo por par).
+
+    Args:
+        sizes: Número de documentos por resumen
+        linear_sums: Sumas lineales por resumen (m × d)
+        method: Método de enlace
+
+    Returns:
+        ndarray: Matriz simétrica m × m de distancias
+    """
+    sizes = sizes.astype(np.float64)
+    gram = linear_sums @ linear_sums.T
+
+    if method == 'average':
+        D = 1.0 - gram / np.outer(sizes, sizes)
+    elif method == 'ward':
+        centroid_gram = gram / np.outer(sizes, sizes)
+        sq_norms = np.diag(centroid_gram)
+        sq_dist = sq_norms[:, None] + sq_norms[None, :] - 2.0 * centroid_gram
+        factor = 2.0 * np.outer(sizes, sizes) / (sizes[:, None] + sizes[None, :])
+        D = np.sqrt(np.maximum(factor * sq_dist, 0.0))
+    else:
+        norms = np.sqrt(np.maximum(np.diag(gram), 1e-300))
+        D = 1.0 - gram / np.outer(norms, norms)
+
+    np.maximum(D, 0.0, out=D)
+    np.fill_diagonal(D, 0.0)
+    return D
+
+
+def nn_chain_linkage(D, sizes, method):
+    """
+    Enlace jerárquico por cadena de vecinos más cercanos (NN-chain).
+
+    Trabaja sobre una matriz de distancias densa entre grupos con tamaños
+    iniciales arbitrarios, actualizando las distancias con la fórmula de
+    Lance-Williams. Requiere O(m²) memoria y O(m²) tiempo.
+
+    Args:
+        D: Matriz simétrica m × m de distancias iniciales
+        sizes: Tamaño inicial de cada grupo
+        method: Uno de SCALABLE_METHODS
+
+    Returns:
+        list: Fusiones (representante_a, representante_b, distancia) en el
+            orden en que fueron encontradas
+    """
+    m = D.shape[0]
+    D = np.array(D, dtype=np.float64, copy=True)
+    np.fill_diagonal(D, np.inf)
+    size = np.asarray(sizes, dtype=np.float64).copy()
+    active = np.ones(m, dtype=bool)
+
+    merges = []
+    chain = []
+    remaining = m
+
+    while remaining > 1:
+        if not chain:
+            chain.append(int(np.flatnonzero(active)[0]))
+
+        a = chain[-1]
+        row = D[a]
+        b = int(np.argmin(row))
+        # Preferir el elemento anterior de la cadena en caso de empate
+        if len(chain) > 1 and row[chain[-2]] <= row[b]:
+            b = chain[-2]
+
+        if len(chain) > 1 and b == chain[-2]:
+            chain.pop()
+            chain.pop()
+            dist = row[b]
+            merges.append((a, b, dist))
+
+            # Actualización de Lance-Williams: el grupo fusionado ocupa el slot b
+            d_a, d_b = D[a], D[b]
+            n_a, n_b = size[a], size[b]
+            if method == 'single':
+                new = np.minimum(d_a, d_b)
+            elif method == 'complete':
+                new = np.maximum(d_a, d_b)
+            elif method == 'average':
+                new = (n_a * d_a + n_b * d_b) / (n_a + n_b)
+            elif method == 'weighted':
+                new = 0.5 * (d_a + d_b)
+            else:  # ward
+                n_k = size
+                new = np.sqrt(np.maximum(
+                    ((n_a + n_k) * d_a ** 2 + (n_b + n_k) * d_b ** 2 - n_k * dist ** 2)
+                    / (n_a + n_b + n_k), 0.0))
+
+            new[~active] = np.inf
+            new[a] = np.inf
+            new[b] = np.inf
+            D[b, :] = new
+            D[:, b] = new
+            D[a, :] = np.inf
+            D[:, a] = np.inf
+            active[a] = False
+            size[b] = n_a + n_b
+            remaining -= 1
+        else:
+            chain.append(b)
+
+    return merges
+
+
+def label_merges(merges, n_leaves):
+    """
+    Convierte fusiones entre representantes en una matriz de enlace de scipy.
+
+    Las fusiones se ordenan de forma estable por distancia y se etiquetan con
+    union-find, igual que hace scipy con la salida de NN-chain.
+
+    Args:
+        merges: Lista de (representante_a, representante_b, distancia) con
+            índices de hoja como representantes
+        n_leaves: Número de hojas de la jerarquía
+
+    Returns:
+        ndarray: Matriz de enlace (n_leaves - 1) × 4
+    """
+    order = np.argsort([m[2] for m in merges], kind='stable')
+    parent = np.arange(2 * n_leaves - 1)
+    size = np.ones(2 * n_leaves - 1, dtype=np.int64)
+    Z = np.empty((len(merges), 4), dtype=np.float64)
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    for row, idx in enumerate(order):
+        a, b, dist = merges[idx]
+        ra, rb = find(a), find(b)
+        new_id = n_leaves + row
+        parent[ra] = new_id
+        parent[rb] = new_id
+        size[new_id] = size[ra] + size[rb]
+        Z[row] = (min(ra, rb), max(ra, rb), dist, size[new_id])
+
+    return Z
+
+
+def scalable_linkage(Xn, method='average', n_summaries=1000, random_state=42):
+    """
+    Enlace jerárquico aproximado para corpus grandes.
+
+    1. Resume los documentos en a lo sumo ``n_summaries`` micro-clusters CF.
+    2. Une los miembros de cada resumen en cadena, en orden de distancia
+       coseno creciente a su centroide (altura = esa distancia).
+    3. Aplica NN-chain con tamaños iniciales sobre los resúmenes.
+
+    Las alturas del nivel de resúmenes se elevan al máximo de sus hijos para
+    que la matriz resultante sea monótona. El resultado tiene n - 1 filas y
+    es compatible con fcluster y dendrogram de scipy.
+
+    Args:
+        Xn: Matriz de características normalizada L2 (densa o CSR)
+        method: Uno de SCALABLE_METHODS
+        n_summaries: Número máximo de micro-clusters
+        random_state: Semilla para la etapa de resumen
+
+    Returns:
+        ndarray: Matriz de enlace (n - 1) × 4
+    """
+    if method not in SCALABLE_METHODS:
+        raise ValueError(f"El método '{method}' no está soportado en modo escalable. "
+                         f"Opciones: {', '.join(SCALABLE_METHODS)}")
+
+    n_samples = Xn.shape[0]
+    assignments, sizes, linear_sums = summarize_cf(Xn, n_summaries, random_state)
+    n_groups = len(sizes)
+
+    # Distancia coseno de cada documento al centroide de su resumen
+    centroid_norms = np.linalg.norm(linear_sums, axis=1)
+    centroid_norms[centroid_norms == 0] = 1.0
+    unit_centroids = linear_sums / centroid_norms[:, None]
+    if sp.issparse(Xn):
+        to_centroid = np.asarray(Xn.multiply(unit_centroids[assignments]).sum(axis=1)).ravel()
+    else:
+        to_centroid = np.einsum('ij,ij->i', Xn, unit_centroids[assignments])
+    radius = np.maximum(1.0 - to_centroid, 0.0)
+    if method == 'ward':
+        radius = np.sqrt(2.0 * radius)
+
+    # Fusiones internas: miembros ordenados por resumen y por distancia creciente
+    order = np.lexsort((radius, assignments))
+    sorted_groups = assignments[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    representatives = order[starts]
+    group_height = np.zeros(n_groups)
+
+    merges = []
+    for start, end in zip(starts, np.r_[starts[1:], n_samples]):
+        first = order[start]
+        for pos in range(start + 1, end):
+            merges.append((first, order[pos], radius[order[pos]]))
+        if end - start > 1:
+            group_height[sorted_groups[start]] = radius[order[end - 1]]
+
+    # Enlace exacto sobre los resúmenes
+    if n_groups > 1:
+        D = summary_distances(sizes, linear_sums, method)
+        summary_merges = nn_chain_linkage(D, sizes, method)
+
+        # Recorrer las fusiones por distancia para garantizar monotonía
+        height = group_height.copy()
+        for a, b, dist in sorted(summary_merges, key=lambda m: m[2]):
+            dist = max(dist, height[a], height[b])
+            height[a] = height[b] = dist
+            merges.append((representatives[a], representatives[b], dist))
+
+    return label_merges(merges, n_samples)
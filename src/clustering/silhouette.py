@@ -0,0 +1,150 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Estimadores disponibles para el coeficiente silhouette
+SILHOUETTE_ESTIMATORS = ('exact', 'blockwise', 'sampled', 'simplified', 'auto')
+
+
+def _indicator(inverse, n_clusters):
+    """Matriz indicadora dispersa (n × k) de pertenencia a cada cluster."""
+    n_samples = len(inverse)
+    return sp.csr_matrix((np.ones(n_samples), (np.arange(n_samples), inverse)),
+                         shape=(n_samples, n_clusters))
+
+
+def silhouette_rows(X, inverse, sizes, rows=None, memory_budget_mb=256):
+    """
+    Calcula el silhouette exacto (distancia euclídea) de un subconjunto de filas.
+
+    Las distancias de cada bloque de filas a todas las muestras se calculan
+    con ||x||² + ||y||² - 2·x·y y se reducen de inmediato a sumas por cluster
+    con la matriz indicadora, de modo que nunca se guarda la matriz n×n.
+    Coincide con sklearn: las muestras de clusters unitarios valen 0.
+
+    Args:
+        X: Datos vectorizados (densos o dispersos CSR)
+        inverse: Índice compacto de cluster por muestra (0..k-1)
+        sizes: Tamaño de cada cluster
+        rows: Filas a evaluar (None para todas)
+        memory_budget_mb: Memoria máxima aproximada por bloque, en MB
+
+    Returns:
+        ndarray: Silhouette de cada fila evaluada
+    """
+    n_samples = X.shape[0]
+    rows = np.arange(n_samples) if rows is None else np.asarray(rows)
+    indicator = _indicator(inverse, len(sizes))
+    if sp.issparse(X):
+        X = sp.csr_matrix(X, dtype=np.float64)
+        sq_norms = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    else:
+        X = np.asarray(X, dtype=np.float64)
+        sq_norms = np.einsum('ij,ij->i', X, X)
+
+    # Bloque de distancias más copias temporales: ~3 valores por par
+    block_size = int(max(1, memory_budget_mb * 1024 ** 2 // (3 * 8 * max(n_samples, 1))))
+    values = np.empty(len(rows))
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        block = X[block_rows]
+        block = block.toarray() if sp.issparse(block) else block
+        products = np.asarray(X @ block.T).T
+        distances = np.sqrt(np.maximum(sq_norms[block_rows, None] + sq_norms[None, :] - 2.0 * products, 0.0))
+        distances[np.arange(len(block_rows)), block_rows] = 0.0
+        sums = np.asarray(distances @ indicator)
+
+        own = inverse[block_rows]
+        local = np.arange(len(block_rows))
+        own_size = sizes[own]
+        a = sums[local, own] / np.maximum(own_size - 1, 1)
+        means = sums / sizes[None, :]
+        means[local, own] = np.inf
+        b = means.min(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            s = (b - a) / np.maximum(a, b)
+        s[own_size == 1] = 0.0
+        values[start:start + len(block_rows)] = np.nan_to_num(s)
+    return values
+
+
+def silhouette_simplified(X, inverse, sizes, centroids):
+    """
+    Silhouette simplificado basado en centroides, en O(n·k).
+
+    a es la distancia de cada muestra al centroide de su cluster y b la
+    distancia al centroide más cercano de otro cluster.
+
+    Args:
+        X: Datos vectorizados (densos o dispersos CSR)
+        inverse: Índice compacto de cluster por muestra
+        sizes: Tamaño de cada cluster
+        centroids: Matriz densa k × d de centroides
+
+    Returns:
+        float: Media del silhouette simplificado
+    """
+    if sp.issparse(X):
+        sq_norms = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    else:
+        sq_norms = np.einsum('ij,ij->i', X, X)
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    products = np.asarray(X @ centroids.T)
+    distances = np.sqrt(np.maximum(sq_norms[:, None] + centroid_norms[None, :] - 2.0 * products, 0.0))
+
+    local = np.arange(X.shape[0])
+    a = distances[local, inverse]
+    distances[local, inverse] = np.inf
+    b = distances.min(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = np.nan_to_num((b - a) / np.maximum(a, b))
+    s[sizes[inverse] == 1] = 0.0
+    return float(s.mean())
+
+
+def silhouette_sampled(X, inverse, sizes, sample_size=2000, random_state=42,
+                       memory_budget_mb=256, confidence_z=1.96):
+    """
+    Estima el silhouette con muestreo estratificado por cluster.
+
+    Se elige un número de muestras proporcional al tamaño de cada cluster (al
+    menos una) y se calcula su silhouette exacto contra todos los puntos. La
+    media ponderada por estrato es insesgada y su varianza da el intervalo
+    de confianza (con corrección por población finita).
+
+    Args:
+        X: Datos vectorizados (densos o dispersos CSR)
+        inverse: Índice compacto de cluster por muestra
+        sizes: Tamaño de cada cluster
+        sample_size: Número aproximado de muestras a evaluar
+        random_state: Semilla del muestreo
+        memory_budget_mb: Memoria máxima por bloque de distancias
+        confidence_z: Valor z del intervalo (1.96 para 95 %)
+
+    Returns:
+        dict: Estimación, intervalo de confianza y número de muestras usadas
+    """
+    n_samples = len(inverse)
+    rng = np.random.default_rng(random_state)
+    allocation = np.minimum(np.maximum(np.round(sample_size * sizes / n_samples), 1), sizes).astype(np.int64)
+
+    # Muestreo sin reemplazo dentro de cada cluster
+    order = np.lexsort((rng.random(n_samples), inverse))
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    rank = np.arange(n_samples) - np.repeat(starts, sizes)
+    rows = order[rank < np.repeat(allocation, sizes)]
+
+    values = silhouette_rows(X, inverse, sizes, rows, memory_budget_mb)
+    strata = inverse[rows]
+    weights = sizes / n_samples
+    means = np.bincount(strata, weights=values, minlength=len(sizes)) / allocation
+    sq_dev = np.bincount(strata, weights=(values - means[strata]) ** 2, minlength=len(sizes))
+    variances = np.where(allocation > 1, sq_dev / np.maximum(allocation - 1, 1), 0.0)
+
+    estimate = float(np.sum(weights * means))
+    fpc = 1.0 - allocation / sizes
+    std_error = float(np.sqrt(np.sum(weights ** 2 * fpc * variances / allocation)))
+    return {
+        'silhouette': estimate,
+        'ci': (estimate - confidence_z * std_error, estimate + confidence_z * std_error),
+        'sample_size': int(len(rows))
+    }
@@ -0,0 +1,274 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+def normalize_rows(X, dtype=np.float64):
+    """
+    Normaliza cada fila a norma L2 unitaria conservando el formato de entrada.
+
+    Las matrices dispersas se devuelven en formato CSR, de modo que la memoria
+    queda acotada por el número de valores no nulos y no por n × vocabulario.
+    Las filas nulas (documentos sin términos) se mantienen en cero.
+
+    Args:
+        X: Matriz densa (ndarray) o dispersa (scipy.sparse) de características
+        dtype: Tipo de punto flotante del resultado (float64 o float32)
+
+    Returns:
+        Matriz normalizada (CSR si la entrada era dispersa, ndarray en otro caso)
+    """
+    if sp.issparse(X):
+        return normalize(sp.csr_matrix(X, dtype=dtype), norm='l2', copy=True)
+    return normalize(np.asarray(X, dtype=dtype), norm='l2', copy=True)
+
+
+def iter_similarity_blocks(Xn, block_size=1024):
+    """
+    Recorre la matriz de similitud coseno por bloques de filas.
+
+    Cada bloque S[start:stop, :] se obtiene a partir de X · Bᵀ, donde B son las
+    filas del bloque densificadas (block_size × d); con X en CSR es un producto
+    disperso-denso, mucho más rápido que un producto disperso-disperso cuyo
+    resultado es casi denso. Nunca se materializa la matriz n×n completa: la
+    memoria máxima es block_size × (n + d) valores.
+
+    Args:
+        Xn: Matriz de características normalizada L2 (densa o CSR)
+        block_size: Número de filas por bloque
+
+    Yields:
+        tuple: (start, stop, bloque denso de tamaño (stop - start) × n)
+    """
+    n_samples = Xn.shape[0]
+    for start in range(0, n_samples, block_size):
+        stop = min(start + block_size, n_samples)
+        rows = Xn[start:stop]
+        rows = rows.toarray() if sp.issparse(rows) else np.asarray(rows)
+        # S es simétrica: X · Bᵀ es el bloque de columnas S[:, start:stop];
+        # su traspuesta (una vista, sin copia) es el bloque de filas
+        columns = Xn @ np.ascontiguousarray(rows.T, dtype=Xn.dtype)
+        yield start, stop, np.asarray(columns).T
+
+
+class SimilarityEngine:
+    """
+    Motor de similitud coseno por bloques con memoria acotada.
+
+    Normaliza los vectores una sola vez y recorre la matriz de similitud en
+    bloques de filas cuyo tamaño se deriva de un presupuesto de memoria. Cada
+    método emite solo lo que necesita quien lo llama (vecinos más cercanos,
+    aristas sobre un umbral o distancias condensadas), de modo que la matriz
+    n×n densa solo se materializa si se pide explícitamente con to_memmap().
+    """
+
+    # Copias temporales por valor del bloque (máscaras, índices, -inf, etc.)
+    _BLOCK_OVERHEAD = 3
+
+    def __init__(self, X, memory_budget_mb=256, dtype=np.float64, normalized=False):
+        """
+        Inicializa el motor de similitud.
+
+        Args:
+            X: Matriz de características (densa o dispersa CSR)
+            memory_budget_mb: Memoria máxima aproximada por bloque, en MB
+            dtype: np.float64 o np.float32 (la mitad de memoria y más rápido)
+            normalized: True si las filas de X ya tienen norma L2 unitaria
+        """
+        self.dtype = np.dtype(dtype)
+        if normalized:
+            self.Xn = X.astype(self.dtype) if X.dtype != self.dtype else X
+        else:
+            self.Xn = normalize_rows(X, dtype=self.dtype)
+        self.n_samples, self.n_features = self.Xn.shape
+        self.memory_budget_mb = memory_budget_mb
+        self.block_size = self._block_size_for_budget(memory_budget_mb)
+
+    def _block_size_for_budget(self, memory_budget_mb):
+        """Calcula cuántas filas caben en un bloque según el presupuesto."""
+        bytes_per_row = (self._BLOCK_OVERHEAD * self.n_samples + self.n_features) * self.dtype.itemsize
+        block_size = int(memory_budget_mb * 1024 ** 2 // max(bytes_per_row, 1))
+        return int(min(max(block_size, 1), max(self.n_samples, 1)))
+
+    def iter_blocks(self, exclude_self=False):
+        """
+        Recorre la matriz de similitud por bloques de filas.
+
+        Args:
+            exclude_self: Si es True, la diagonal se marca con -inf
+
+        Yields:
+            tuple: (start, stop, bloque denso de tamaño (stop - start) × n)
+        """
+        for start, stop, block in iter_similarity_blocks(self.Xn, self.block_size):
+            if exclude_self:
+                block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            yield start, stop, block
+
+    def row_max(self):
+        """
+        Calcula la similitud máxima de cada documento con cualquier otro.
+
+        Returns:
+            ndarray: Vector de longitud n (-inf si n == 1)
+        """
+        result = np.full(self.n_samples, -np.inf)
+        for start, stop, block in self.iter_blocks(exclude_self=True):
+            result[start:stop] = block.max(axis=1)
+        return result
+
+    def top_k(self, k):
+        """
+        Obtiene los k vecinos más similares de cada documento.
+
+        Args:
+            k: Número de vecinos (se limita a n - 1)
+
+        Returns:
+            tuple: (indices, similitudes) ambos de tamaño n × k, ordenados de
+                mayor a menor similitud
+        """
+        k = max(1, min(k, self.n_samples - 1))
+        indices = np.empty((self.n_samples, k), dtype=np.int64)
+        sims = np.empty((self.n_samples, k), dtype=self.dtype)
+        for start, stop, block in self.iter_blocks(exclude_self=True):
+            local = np.arange(stop - start)[:, None]
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            top_sims = block[local, top]
+            order = np.argsort(-top_sims, axis=1, kind='stable')
+            indices[start:stop] = top[local, order]
+            sims[start:stop] = top_sims[local, order]
+        return indices, sims
+
+    def threshold_edges(self, threshold):
+        """
+        Emite los pares (i < j) cuya similitud supera estrictamente el umbral.
+
+        Args:
+            threshold: Umbral de similitud
+
+        Returns:
+            tuple: (origen, destino, similitud)
+        """
+        rows, cols, weights = [], [], []
+        column_index = np.arange(self.n_samples)
+        for start, stop, block in self.iter_blocks():
+            upper = column_index[None, :] > np.arange(start, stop)[:, None]
+            r, c = np.nonzero((block > threshold) & upper)
+            rows.append(r + start)
+            cols.append(c)
+            weights.append(block[r, c])
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=self.dtype)
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(weights)
+
+    def condensed_distances(self):
+        """
+        Calcula las distancias coseno en forma condensada (como scipy.pdist).
+
+        Las filas start..stop-1 ocupan un tramo contiguo del vector condensado,
+        por lo que cada bloque se escribe directamente sin la matriz n×n.
+
+        Returns:
+            ndarray: Vector de longitud n(n-1)/2 con distancias 1 - cos
+        """
+        n = self.n_samples
+        condensed = np.empty(n * (n - 1) // 2, dtype=self.dtype)
+        column_index = np.arange(n)
+        offset = 0
+        for start, stop, block in self.iter_blocks():
+            upper = column_index[None, :] > np.arange(start, stop)[:, None]
+            values = 1.0 - block[upper]
+            condensed[offset:offset + len(values)] = values
+            offset += len(values)
+        np.maximum(condensed, 0.0, out=condensed)
+        return condensed
+
+    def to_memmap(self, path):
+        """
+        Escribe la matriz n×n completa en un archivo mapeado en memoria.
+
+        Solo debe usarse cuando realmente se necesita la matriz completa;
+        el archivo ocupa n² × itemsize bytes en disco.
+
+        Args:
+            path: Ruta del archivo de salida (.npy)
+
+        Returns:
+            np.memmap: Matriz de similitud de tamaño n × n
+        """
+        matrix = np.lib.format.open_memmap(
+            path, mode='w+', dtype=self.dtype, shape=(self.n_samples, self.n_samples))
+        for start, stop, block in self.iter_blocks():
+            matrix[start:stop] = block
+        matrix.flush()
+        return matrix
+
+
+class PrecomputedSimilarity:
+    """
+    Vista de similitud sobre distancias coseno condensadas ya calculadas.
+
+    Ofrece los mismos métodos que SimilarityEngine que usa el grafo de
+    similitud (row_max, top_k y threshold_edges), de modo que varias
+    configuraciones pueden compartir una sola pasada de distancias (por
+    ejemplo, un vector en memoria compartida entre procesos).
+    """
+
+    def __init__(self, distances, n_samples, dtype=np.float64):
+        """
+        Inicializa la vista.
+
+        Args:
+            distances: Vector condensado de longitud n(n-1)/2 con 1 - cos
+            n_samples: Número de documentos
+            dtype: Tipo de las similitudes devueltas
+        """
+        if len(distances) != n_samples * (n_samples - 1) // 2:
+            raise ValueError("Las distancias condensadas no corresponden al número de documentos")
+        self.distances = distances
+        self.n_samples = n_samples
+        self.dtype = np.dtype(dtype)
+        # Inicio del tramo de la fila i (pares (i, j) con j > i) en el vector condensado
+        rows = np.arange(n_samples, dtype=np.int64)
+        self.offsets = rows * (2 * n_samples - rows - 1) // 2
+
+    def _row(self, i):
+        """Similitudes de la fila i con todos los documentos (-inf en la diagonal)."""
+        n = self.n_samples
+        previous = np.arange(i)
+        row = np.empty(n, dtype=self.dtype)
+        row[:i] = 1.0 - self.distances[self.offsets[previous] + (i - previous - 1)]
+        row[i] = -np.inf
+        row[i + 1:] = 1.0 - self.distances[self.offsets[i]:self.offsets[i] + n - i - 1]
+        return row
+
+    def row_max(self):
+        """Similitud máxima de cada documento con cualquier otro."""
+        n = self.n_samples
+        row_min = np.full(n, np.inf)
+        for i in range(n - 1):
+            segment = self.distances[self.offsets[i]:self.offsets[i] + n - i - 1]
+            row_min[i] = min(row_min[i], segment.min())
+            np.minimum(row_min[i + 1:], segment, out=row_min[i + 1:])
+        return 1.0 - row_min
+
+    def top_k(self, k):
+        """Los k vecinos más similares de cada documento (ver SimilarityEngine)."""
+        k = max(1, min(k, self.n_samples - 1))
+        indices = np.empty((self.n_samples, k), dtype=np.int64)
+        sims = np.empty((self.n_samples, k), dtype=self.dtype)
+        for i in range(self.n_samples):
+            row = self._row(i)
+            top = np.argpartition(-row, k - 1)[:k]
+            order = np.argsort(-row[top], kind='stable')
+            indices[i] = top[order]
+            sims[i] = row[top[order]]
+        return indices, sims
+
+    def threshold_edges(self, threshold):
+        """Pares (i < j) cuya similitud supera estrictamente el umbral."""
+        positions = np.flatnonzero(1.0 - self.distances > threshold)
+        rows = np.searchsorted(self.offsets, positions, side='right') - 1
+        cols = positions - self.offsets[rows] + rows + 1
+        return rows, cols, (1.0 - self.distances[positions]).astype(self.dtype)
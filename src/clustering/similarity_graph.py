@@ -0,0 +1,120 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def candidate_thresholds(threshold, step=0.05, min_threshold=0.05):
+    """
+    Genera la secuencia de umbrales que prueba la búsqueda adaptativa.
+
+    Reproduce la reducción original: se resta ``step`` mientras el umbral
+    siga siendo mayor que ``min_threshold``.
+
+    Args:
+        threshold: Umbral inicial
+        step: Decremento entre intentos
+        min_threshold: Umbral mínimo a partir del cual se detiene la búsqueda
+
+    Returns:
+        list: Umbrales en el orden en que se prueban
+    """
+    thresholds = [threshold]
+    current = threshold
+    while current > min_threshold:
+        current -= step
+        thresholds.append(current)
+    return thresholds
+
+
+def select_adaptive_threshold(row_max, threshold, min_coverage=0.8,
+                              step=0.05, min_threshold=0.05):
+    """
+    Elige el umbral adaptativo a partir de la distribución ordenada de
+    similitudes máximas por nodo, sin reconstruir el grafo en cada intento.
+
+    Un nodo queda conectado con umbral t si y solo si su vecino más similar
+    supera t, por lo que la cobertura de cada candidato se obtiene con una
+    búsqueda binaria sobre las similitudes máximas ordenadas.
+
+    Args:
+        row_max: Similitud máxima de cada nodo con cualquier otro nodo
+        threshold: Umbral inicial
+        min_coverage: Fracción mínima de nodos que deben quedar conectados
+        step: Decremento entre intentos
+        min_threshold: Umbral mínimo de la búsqueda
+
+    Returns:
+        tuple: (umbral elegido, lista de (umbral, nodos conectados) probados)
+    """
+    n_samples = len(row_max)
+    sorted_max = np.sort(row_max)
+    tried = []
+    for t in candidate_thresholds(threshold, step, min_threshold):
+        # Nodos con similitud máxima estrictamente mayor que t
+        connected = n_samples - np.searchsorted(sorted_max, t, side='right')
+        tried.append((t, int(connected)))
+        if connected >= n_samples * min_coverage:
+            break
+    return tried[-1][0], tried
+
+
+def build_similarity_graph(engine, threshold, n_neighbors=None, adaptive=True,
+                           min_coverage=0.8, step=0.05, min_threshold=0.05):
+    """
+    Construye la matriz de adyacencia del grafo de similitud de forma vectorizada.
+
+    Se hacen dos pasadas por bloques sobre la matriz de similitud: la primera
+    obtiene la similitud máxima de cada nodo (para elegir el umbral adaptativo)
+    y la segunda emite las aristas, ya sea todas las que superan el umbral o
+    solo los ``n_neighbors`` vecinos más similares de cada nodo.
+
+    Args:
+        engine: SimilarityEngine sobre los documentos
+        threshold: Umbral de similitud inicial
+        n_neighbors: Si se indica, conservar solo los k vecinos más similares
+            de cada nodo (la unión se simetriza)
+        adaptive: Reducir el umbral hasta alcanzar min_coverage
+        min_coverage: Fracción mínima de nodos conectados
+        step: Decremento del umbral entre intentos
+        min_threshold: Umbral mínimo de la búsqueda
+
+    Returns:
+        tuple: (adyacencia CSR simétrica con pesos de similitud, umbral usado,
+            lista de (umbral, nodos conectados) probados)
+    """
+    n_samples = engine.n_samples
+
+    if adaptive:
+        used_threshold, tried = select_adaptive_threshold(
+            engine.row_max(), threshold, min_coverage, step, min_threshold)
+    else:
+        used_threshold, tried = threshold, [(threshold, None)]
+
+    if n_neighbors is not None and n_neighbors < n_samples - 1:
+        indices, sims = engine.top_k(n_neighbors)
+        rows = np.repeat(np.arange(n_samples), indices.shape[1])
+        cols, weights = indices.ravel(), sims.ravel()
+        keep = weights > used_threshold
+        rows, cols, weights = rows[keep], cols[keep], weights[keep]
+    else:
+        rows, cols, weights = engine.threshold_edges(used_threshold)
+
+    upper = sp.coo_matrix((weights, (rows, cols)), shape=(n_samples, n_samples)).tocsr()
+    # Simetrizar; con top-k una arista puede aparecer en ambos sentidos con
+    # el mismo peso, por lo que se toma el máximo en lugar de sumar
+    adjacency = upper.maximum(upper.T).tocsr()
+    adjacency.eliminate_zeros()
+    return adjacency, used_threshold, tried
+
+
+def edge_arrays(adjacency):
+    """
+    Extrae las aristas (i < j) de una adyacencia simétrica como arreglos.
+
+    Args:
+        adjacency: Matriz de adyacencia dispersa simétrica
+
+    Returns:
+        tuple: (origen, destino, peso)
+    """
+    upper = sp.triu(adjacency, k=1).tocoo()
+    return upper.row, upper.col, upper.data
@@ -0,0 +1,207 @@
+import html
+import json
+import numpy as np
+
+
+def linkage_to_nodes(Z, labels=None):
+    """
+    Convierte una matriz de enlace de scipy en una lista plana de nodos.
+
+    Se usa un formato plano (id, padre, hijos) en lugar de un JSON anidado
+    para que árboles muy profundos (por ejemplo, enlace simple) no agoten la
+    recursión al serializar ni al leer.
+
+    Args:
+        Z: Matriz de enlace (n - 1) × 4
+        labels: Etiquetas de las hojas (opcional)
+
+    Returns:
+        tuple: (lista de nodos, id de la raíz)
+    """
+    n = len(Z) + 1
+    parent = np.full(2 * n - 1, -1, dtype=np.int64)
+    children = Z[:, :2].astype(np.int64)
+    parent[children[:, 0]] = n + np.arange(n - 1)
+    parent[children[:, 1]] = n + np.arange(n - 1)
+
+    nodes = []
+    for i in range(n):
+        nodes.append({
+            "id": i,
+            "parent": int(parent[i]),
+            "children": [],
+            "size": 1,
+            "height": 0.0,
+            "label": str(labels[i]) if labels is not None else f"doc_{i}"
+        })
+    for i, (a, b, height, size) in enumerate(Z.tolist()):
+        nodes.append({
+            "id": n + i,
+            "parent": int(parent[n + i]),
+            "children": [int(a), int(b)],
+            "size": int(size),
+            "height": float(height),
+            "label": None
+        })
+    return nodes, 2 * n - 2 if n > 1 else 0
+
+
+def cluster_tree_to_nodes(tree, labels=None):
+    """
+    Convierte un ClusterTree en una lista plana de nodos.
+
+    Las hojas incluyen sus documentos; los nodos internos solo su tamaño, de
+    modo que cada documento aparece una sola vez en el archivo.
+
+    Args:
+        tree: ClusterTree ya construido
+        labels: Etiquetas de los documentos (opcional)
+
+    Returns:
+        tuple: (lista de nodos, id de la raíz)
+    """
+    sizes = tree.size()
+    nodes = []
+    for node, name in enumerate(tree.names):
+        kids = tree.children(node).tolist()
+        entry = {
+            "id": node,
+            "parent": int(tree.parent[node]),
+            "children": kids,
+            "size": int(sizes[node]),
+            "label": name
+        }
+        if not kids:
+            samples = tree.samples(node).tolist()
+            entry["samples"] = [str(labels[s]) if labels is not None else s for s in samples]
+        nodes.append(entry)
+    return nodes, tree.ROOT
+
+
+def export_tree_json(nodes, root, path, title):
+    """
+    Guarda el árbol completo en JSON plano.
+
+    Args:
+        nodes: Lista de nodos (linkage_to_nodes o cluster_tree_to_nodes)
+        root: Id del nodo raíz
+        path: Ruta del archivo de salida
+        title: Título mostrado por el visor
+
+    Returns:
+        dict: Documento JSON escrito
+    """
+    document = {"title": title, "root": int(root), "nodes": nodes}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+    return document
+
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { font-family: sans-serif; margin: 20px; }
+  ul { list-style: none; padding-left: 18px; margin: 0; }
+  .node { cursor: pointer; padding: 1px 4px; border-radius: 3px; }
+  .node:hover { background: #e8eefc; }
+  .size { color: #1f77b4; font-weight: bold; }
+  .height { color: #888; font-size: 0.85em; }
+  .leaf { color: #d62728; }
+  .docs { color: #555; font-size: 0.85em; padding-left: 22px; }
+</style>
+</head>
+<body>
+<h2>__TITLE__</h2>
+<p>Haga clic en un nodo para expandirlo. Los hijos se muestran de mayor a menor tamaño
+y solo se generan al expandir, por lo que la página abre igual de rápido sin importar
+el tamaño del corpus.</p>
+<div id="tree"></div>
+<script>
+const data = __DATA__;
+const byId = new Map(data.nodes.map(n => [n.id, n]));
+
+// Las etiquetas vienen del texto de los abstracts: se insertan como texto, nunca como HTML
+function describe(node, span) {
+  if (node.label !== null && node.label !== undefined) {
+    span.appendChild(document.createTextNode(node.label + ' '));
+  }
+  const size = document.createElement('span');
+  size.className = 'size';
+  size.textContent = '(' + node.size + ')';
+  span.appendChild(size);
+  if (node.height) {
+    const height = document.createElement('span');
+    height.className = 'height';
+    height.textContent = 'h=' + node.height.toFixed(4);
+    span.appendChild(document.createTextNode(' '));
+    span.appendChild(height);
+  }
+}
+
+function render(node, container) {
+  const li = document.createElement('li');
+  const span = document.createElement('span');
+  const isLeaf = node.children.length === 0;
+  span.className = 'node' + (isLeaf ? ' leaf' : '');
+  span.textContent = isLeaf ? '\u2022 ' : '\u25B8 ';
+  describe(node, span);
+  li.appendChild(span);
+  let expanded = null;
+  span.onclick = () => {
+    if (expanded) { expanded.remove(); expanded = null; return; }
+    expanded = document.createElement('ul');
+    if (isLeaf) {
+      const docs = node.samples || [];
+      docs.slice(0, 200).forEach(d => {
+        const item = document.createElement('li');
+        item.className = 'docs';
+        item.textContent = d;
+        expanded.appendChild(item);
+      });
+      if (docs.length > 200) {
+        const more = document.createElement('li');
+        more.className = 'docs';
+        more.textContent = '... ' + (docs.length - 200) + ' más';
+        expanded.appendChild(more);
+      }
+    } else {
+      node.children.map(id => byId.get(id))
+        .sort((a, b) => b.size - a.size)
+        .forEach(child => render(child, expanded));
+    }
+    li.appendChild(expanded);
+  };
+  container.appendChild(li);
+}
+
+const rootList = document.createElement('ul');
+render(byId.get(data.root), rootList);
+document.getElementById('tree').appendChild(rootList);
+</script>
+</body>
+</html>
+"""
+
+
+def write_html_viewer(document, path):
+    """
+    Genera un visor HTML autónomo (sin dependencias externas) para el árbol.
+
+    Los datos se incrustan en la página para que funcione abriendo el archivo
+    directamente; los nodos se dibujan solo al expandirlos. El título se escapa
+    como HTML y en los datos se escapa todo "<", de modo que el texto de los
+    abstracts no puede cerrar el script ni inyectar marcado.
+
+    Args:
+        document: Documento devuelto por export_tree_json
+        path: Ruta del archivo HTML
+    """
+    data = json.dumps(document, ensure_ascii=False).replace('<', '\\u003c')
+    page = (_HTML_TEMPLATE
+            .replace('__TITLE__', html.escape(document['title']))
+            .replace('__DATA__', data))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
@@ -1,7 +1,11 @@
 import os
 import sys
+import csv
+import json
+import argparse
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
 import matplotlib.pyplot as plt
 from collections import Counter
 
@@ -14,41 +18,62 @@ from src.clustering.abstract_extractor import AbstractExtractor
 from src.clustering.agglomerative_clustering import AgglomerativeClustering
 from src.clustering.divisive_clustering import DivisiveClusteringGraph
 from src.clustering.cluster_analyzer import ClusterAnalyzer
+from src.clustering.dimensionality_reduction import DimensionalityReducer
+from src.clustering.online_clustering import OnlineClusterAssigner
+from src.clustering.minhash import MinHashSimilarity
 
-def main():
-    # Definir rutas
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = os.path.join(base_dir, 'data')
-    processed_dir = os.path.join(data_dir, 'processed')
-    bibtex_path = os.path.join(processed_dir, 'unique_entries.bib')
-    output_dir = os.path.join(data_dir, 'clustering_results')
-    
-    # Crear directorio de salida si no existe
-    os.makedirs(output_dir, exist_ok=True)
-    
-    print("=== Iniciando análisis de clustering de abstracts ===")
+def load_abstracts(bibtex_path, sample_size=200, extra_bibtex_paths=()):
+    """
+    Extrae los abstracts del archivo BibTeX y toma una muestra.
     
-    # Extraer abstracts
+    Args:
+        bibtex_path: Ruta al archivo BibTeX
+        sample_size: Número máximo de abstracts a analizar
+        extra_bibtex_paths: Archivos BibTeX cuyos abstracts se agregan siempre,
+            además de la muestra (p. ej. los asignados en línea antes de reagrupar)
+        
+    Returns:
+        tuple: (abstracts por doc_id, lista de doc_ids, categorías)
+    """
     print("Extrayendo abstracts del archivo BibTeX...")
     extractor = AbstractExtractor()
     all_abstracts, categories = extractor.extract_from_bibtex(bibtex_path)
     
     # Tomar una muestra para análisis (ajustar según capacidad computacional)
-    sample_size = 200
     abstracts = extractor.extract_sample(all_abstracts, max_samples=sample_size)
-    
-    # Preprocesar abstracts
-    print(f"Preprocesando {len(abstracts)} abstracts...")
-    preprocessor = TextPreprocessor()
-    
-    # Documentos y sus IDs
+
+    for extra_path in extra_bibtex_paths:
+        extra_abstracts, extra_categories = extractor.extract_from_bibtex(extra_path)
+        added = {doc_id: abstract for doc_id, abstract in extra_abstracts.items()
+                 if doc_id not in abstracts}
+        abstracts.update(added)
+        for keyword, keyword_ids in extra_categories.items():
+            categories.setdefault(keyword, []).extend(
+                doc_id for doc_id in keyword_ids if doc_id in added)
+        print(f"- {len(added)} abstracts adicionales de: {extra_path}")
+
     doc_ids = list(abstracts.keys())
-    documents = [abstracts[doc_id] for doc_id in doc_ids]
-    
-    # Preprocesar cada documento
-    processed_docs = [preprocessor.preprocess(doc) for doc in documents]
+    return abstracts, doc_ids, categories
+
+
+def preprocess_abstracts(abstracts, doc_ids):
+    """
+    Preprocesa cada abstract con TextPreprocessor.
     
-    # Guardar los abstracts procesados
+    Args:
+        abstracts: Abstracts por doc_id
+        doc_ids: Orden de los documentos
+        
+    Returns:
+        list: Textos preprocesados en el orden de doc_ids
+    """
+    print(f"Preprocesando {len(doc_ids)} abstracts...")
+    preprocessor = TextPreprocessor()
+    return [preprocessor.preprocess(abstracts[doc_id]) for doc_id in doc_ids]
+
+
+def save_processed_abstracts(output_dir, abstracts, doc_ids, processed_docs):
+    """Guarda los abstracts procesados en JSON y CSV."""
     print("Guardando abstracts procesados...")
     abstracts_output = []
     for i, doc_id in enumerate(doc_ids):
@@ -59,13 +84,11 @@ def main():
         })
 
     # Guardar en formato JSON
-    import json
     abstracts_processed_path = os.path.join(output_dir, 'processed_abstracts.json')
     with open(abstracts_processed_path, 'w', encoding='utf-8') as f:
         json.dump(abstracts_output, f, indent=2, ensure_ascii=False)
 
     # Opcionalmente, guardar también en formato CSV para más facilidad de lectura
-    import csv
     abstracts_csv_path = os.path.join(output_dir, 'processed_abstracts.csv')
     with open(abstracts_csv_path, 'w', encoding='utf-8', newline='') as f:
         writer = csv.writer(f)
@@ -76,12 +99,60 @@ def main():
     print(f"- Abstracts procesados guardados en: {abstracts_processed_path}")
     print(f"- Abstracts procesados (CSV) guardados en: {abstracts_csv_path}")
 
-    # Vectorizar los documentos usando TF-IDF
+
+def vectorize_abstracts(processed_docs, max_features=500, reduction_method=None,
+                        n_components=50, output_dir=None):
+    """
+    Vectoriza los documentos con TF-IDF y aplica la reducción opcional.
+    
+    Args:
+        processed_docs: Textos preprocesados
+        max_features: Tamaño máximo del vocabulario
+        reduction_method: 'lsa', 'random_projection' o None (sin reducción)
+        n_components: Dimensión de destino de la reducción
+        output_dir: Directorio donde guardar la proyección (None para no guardarla)
+        
+    Returns:
+        tuple: (matriz de características, vectorizador ajustado, reducción o None)
+    """
+    # Se conserva la matriz dispersa (CSR): la memoria queda acotada por los
+    # valores no nulos y no por n × max_features
     print("Vectorizando documentos...")
-    vectorizer = TfidfVectorizer(max_features=500)
-    X = vectorizer.fit_transform(processed_docs).toarray()
+    vectorizer = TfidfVectorizer(max_features=max_features)
+    X = vectorizer.fit_transform(processed_docs).tocsr()
+    reducer = None
+
+    # La misma proyección la usan ambos algoritmos y la evaluación
+    if reduction_method is not None:
+        print(f"Reduciendo dimensionalidad ({reduction_method}, {n_components} componentes)...")
+        reducer = DimensionalityReducer(method=reduction_method, n_components=n_components)
+        X_reduced = reducer.fit_transform(X)
+
+        preservation = DimensionalityReducer.neighborhood_preservation(X, X_reduced, k=10)
+        print(f"- Dimensión: {X.shape[1]} -> {X_reduced.shape[1]}")
+        if reducer.explained_variance is not None:
+            print(f"- Varianza explicada: {reducer.explained_variance:.3f}")
+        print(f"- Vecindarios conservados (recall@{preservation['k']}): "
+              f"{preservation['neighborhood_recall']:.3f}")
+        if output_dir is not None:
+            reducer_path = os.path.join(output_dir, 'projection.joblib')
+            reducer.save(reducer_path)
+            print(f"- Proyección guardada en: {reducer_path}")
+        X = X_reduced
+    return X, vectorizer, reducer
+
+
+def build_true_labels(doc_ids, categories):
+    """
+    Prepara las etiquetas verdaderas a partir de las categorías disponibles.
     
-    # Preparar etiquetas verdaderas si hay categorías disponibles
+    Args:
+        doc_ids: Orden de los documentos
+        categories: Documentos por categoría
+        
+    Returns:
+        ndarray: Índice de categoría por documento
+    """
     print("Preparando categorías para evaluación...")
     
     # Encontrar la categoría más frecuente para cada documento
@@ -102,25 +173,116 @@ def main():
         if doc_id in doc_to_category:
             category = doc_to_category[doc_id]
             true_labels[i] = category_to_index.get(category, -1)
+    return true_labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis de clustering de abstracts")
+    parser.add_argument('--bibtex', default=None,
+                        help="Archivo BibTeX del corpus (por defecto data/processed/unique_entries.bib)")
+    parser.add_argument('--extra-bibtex', nargs='+', action='extend', default=[],
+                        help="Archivos BibTeX cuyos abstracts se incluyen siempre además de la muestra")
+    parser.add_argument('--sample-size', type=int, default=200)
+    parser.add_argument('--reduction', choices=['lsa', 'random_projection', 'none'], default='none',
+                        help="Reducción de dimensionalidad opcional tras TF-IDF")
+    parser.add_argument('--n-components', type=int, default=50)
+    args = parser.parse_args(argv)
+    reduction_method = None if args.reduction == 'none' else args.reduction
+
+    # Definir rutas
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.path.join(base_dir, 'data')
+    processed_dir = os.path.join(data_dir, 'processed')
+    bibtex_path = os.path.abspath(args.bibtex or os.path.join(processed_dir, 'unique_entries.bib'))
+    extra_bibtex_paths = [os.path.abspath(path) for path in args.extra_bibtex]
+    # Opciones resueltas: el asignador en línea las guarda para reagrupar igual
+    clustering_argv = ['--bibtex', bibtex_path, '--sample-size', str(args.sample_size),
+                       '--reduction', args.reduction, '--n-components', str(args.n_components)]
+    if extra_bibtex_paths:
+        clustering_argv += ['--extra-bibtex'] + extra_bibtex_paths
+    output_dir = os.path.join(data_dir, 'clustering_results')
+    
+    # Crear directorio de salida si no existe
+    os.makedirs(output_dir, exist_ok=True)
+    
+    print("=== Iniciando análisis de clustering de abstracts ===")
+    
+    # Extraer abstracts (muestra ajustable según capacidad computacional)
+    abstracts, doc_ids, categories = load_abstracts(bibtex_path, args.sample_size,
+                                                    extra_bibtex_paths=extra_bibtex_paths)
+    
+    # Preprocesar y guardar los abstracts procesados
+    processed_docs = preprocess_abstracts(abstracts, doc_ids)
+    save_processed_abstracts(output_dir, abstracts, doc_ids, processed_docs)
+
+    # Vectorizar con TF-IDF y reducir dimensionalidad solo si se pidió (--reduction)
+    X, vectorizer, reducer = vectorize_abstracts(processed_docs, max_features=500,
+                                                 reduction_method=reduction_method,
+                                                 n_components=args.n_components, output_dir=output_dir)
+    
+    # Preparar etiquetas verdaderas si hay categorías disponibles
+    true_labels = build_true_labels(doc_ids, categories)
     
     # Aplicar algoritmo 1: Clustering Aglomerativo con número fijo de clusters
     print("Ejecutando algoritmo de clustering aglomerativo...")
     agg_clustering = AgglomerativeClustering(linkage='average', n_clusters=20)
     agg_clustering.fit(X)
     
+    # Guardar el enlace con el vectorizador: labels_for() permite explorar
+    # otros números de clusters sin volver a ajustar
+    agg_model_path = os.path.join(output_dir, 'agglomerative_model.joblib')
+    agg_clustering.save(agg_model_path, vectorizer=vectorizer)
+    print(f"- Modelo aglomerativo guardado en: {agg_model_path}")
+
+    # Resúmenes de cluster para asignar abstracts nuevos sin reajustar
+    # (ver src/assign_new_abstracts.py)
+    online_assigner = OnlineClusterAssigner().fit(X, agg_clustering.labels_,
+                                                  vectorizer=vectorizer, reducer=reducer,
+                                                  clustering_argv=clustering_argv)
+    online_model_path = os.path.join(output_dir, 'online_model.joblib')
+    online_assigner.save(online_model_path)
+    print(f"- Asignador en línea guardado en: {online_model_path}")
+    
     # Aplicar algoritmo 2: Clustering Divisivo con límite de clusters
     print("Ejecutando algoritmo de clustering divisivo basado en grafos...")
     div_clustering = DivisiveClusteringGraph(threshold=0.15, max_clusters=20)  # Umbral más bajo para incluir más conexiones
     div_clustering.fit(X)
     
+    # Segunda técnica de similitud: Jaccard MinHash sobre shingles de palabras,
+    # usada como fuente alternativa de aristas del grafo divisivo
+    print("Ejecutando clustering divisivo con similitud Jaccard (MinHash + LSH)...")
+    minhash_engine = MinHashSimilarity(processed_docs, num_perm=128, ngram_range=(1, 2), lsh_threshold=0.1)
+    div_minhash = DivisiveClusteringGraph(threshold=0.1, max_clusters=20)
+    div_minhash.fit(X, engine=minhash_engine)
+    
     # Evaluar los resultados
     print("Evaluando resultados de clustering...")
     metrics_agg = ClusterAnalyzer.evaluate_clustering(X, true_labels, agg_clustering.labels_)
     metrics_div = ClusterAnalyzer.evaluate_clustering(X, true_labels, div_clustering.labels_)
+    metrics_minhash = ClusterAnalyzer.evaluate_clustering(X, true_labels, div_minhash.labels_)
     
     print("\nResultados de Evaluación:")
     print("Algoritmo Aglomerativo:", metrics_agg)
     print("Algoritmo Divisivo:", metrics_div)
+    print("Algoritmo Divisivo (Jaccard MinHash):", metrics_minhash)
+    
+    # Concordancia entre las dos técnicas de similitud
+    agreement = minhash_engine.compare_with_cosine(X, k=10)
+    agreement['lsh_threshold'] = minhash_engine.lsh_threshold
+    agreement['divisive_ari'] = float(adjusted_rand_score(div_clustering.labels_, div_minhash.labels_))
+    agreement['divisive_nmi'] = float(normalized_mutual_info_score(div_clustering.labels_, div_minhash.labels_))
+    agreement['metrics_minhash'] = {key: (float(value) if isinstance(value, (int, float, np.floating)) else value)
+                                    for key, value in metrics_minhash.items()}
+    print("\nConcordancia Jaccard (MinHash) vs coseno (TF-IDF):")
+    print(f"- Pares candidatos LSH: {agreement['candidate_pairs']} "
+          f"({100 * agreement['candidate_fraction']:.1f}% de todos los pares)")
+    print(f"- Correlación de Spearman en los candidatos: {agreement['spearman']:.4f}")
+    print(f"- Solapamiento de los 10 vecinos más cercanos: {agreement['neighbor_overlap']:.4f}")
+    print(f"- ARI / NMI entre ambos clusterings divisivos: "
+          f"{agreement['divisive_ari']:.4f} / {agreement['divisive_nmi']:.4f}")
+    agreement_path = os.path.join(output_dir, 'similarity_agreement.json')
+    with open(agreement_path, 'w', encoding='utf-8') as f:
+        json.dump(agreement, f, indent=4, ensure_ascii=False)
     
     # Generar dendrogramas
     print("Generando visualizaciones...")
@@ -167,6 +329,14 @@ def main():
         fig_div_path = os.path.join(output_dir, 'dendrogram_divisive.png')
         fig_div.savefig(fig_div_path, dpi=300, bbox_inches='tight')
 
+    # Árboles completos en JSON con visor HTML interactivo (los PNG pueden estar truncados)
+    tree_agg_path = os.path.join(output_dir, 'tree_agglomerative.json')
+    viewer_agg_path = os.path.join(output_dir, 'tree_agglomerative.html')
+    agg_clustering.export_tree(tree_agg_path, labels=short_labels, html_path=viewer_agg_path)
+    tree_div_path = os.path.join(output_dir, 'tree_divisive.json')
+    viewer_div_path = os.path.join(output_dir, 'tree_divisive.html')
+    div_clustering.export_tree(tree_div_path, labels=short_labels, html_path=viewer_div_path)
+
     # Comparación de algoritmos
     fig_comp = ClusterAnalyzer.plot_cluster_comparison(metrics_agg, metrics_div)
     fig_comp_path = os.path.join(output_dir, 'clustering_comparison.png')
@@ -183,6 +353,9 @@ def main():
             print(f"- Tabla Divisivo: {table_div_path}")
 
     print(f"- Comparación de Algoritmos: {fig_comp_path}")
+    print(f"- Concordancia de similitudes (Jaccard vs coseno): {agreement_path}")
+    print(f"- Árbol Aglomerativo (JSON / visor HTML): {tree_agg_path} / {viewer_agg_path}")
+    print(f"- Árbol Divisivo (JSON / visor HTML): {tree_div_path} / {viewer_div_path}")
     print("\nAnálisis de clustering completado!")
 
 if __name__ == "__main__":
@@ -204,7 +377,7 @@ El tiempo de procesamiento sería extremadamente largo (posiblemente días)
 La visualización de un dendrograma con 12,000 hojas sería prácticamente imposible de interpretar
 Limitaciones de visualización: Un dendrograma con miles de nodos es visualmente incomprensible y la mayoría de las bibliotecas de visualización tendrían dificultades para renderizarlo.
 
-Si quieres aumentar el número de abstracts para el análisis, puedes modificar el valor de sample_size a un número mayor (por ejemplo, 200 o 500), pero ten en cuenta que:
+Si quieres aumentar el número de abstracts para el análisis, puedes pasar un valor mayor en --sample-size (por ejemplo, 200 o 500), pero ten en cuenta que:
 
 El tiempo de procesamiento aumentará sustancialmente
 La memoria requerida crecerá cuadráticamente con el número de documentos
@@ -0,0 +1,214 @@
+import os
+import io
+import sys
+import csv
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+
+# Añadir el directorio raíz al path de Python para resolver las importaciones
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from src.clustering_analysis import (load_abstracts, preprocess_abstracts,
+                                     vectorize_abstracts, build_true_labels)
+from src.clustering.similarity import SimilarityEngine, PrecomputedSimilarity
+from src.clustering.agglomerative_clustering import AgglomerativeClustering
+from src.clustering.divisive_clustering import DivisiveClusteringGraph
+from src.clustering.cluster_analyzer import ClusterAnalyzer
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+default_bibtex_path = os.path.join(base_dir, 'data', 'processed', 'unique_entries.bib')
+output_dir = os.path.join(base_dir, 'data', 'clustering_results')
+
+# Estado de cada proceso trabajador (se inicializa una vez por proceso)
+_worker = {}
+
+
+def _init_worker(shm_name, n_samples, dtype, X, true_labels, silhouette):
+    """Conecta el trabajador a las distancias compartidas y guarda los datos comunes."""
+    # Los trabajadores comparten el rastreador de recursos del proceso principal,
+    # que es el único que libera el bloque (unlink)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker['shm'] = shm
+    _worker['distances'] = np.ndarray((n_samples * (n_samples - 1) // 2,), dtype=dtype, buffer=shm.buf)
+    _worker['n_samples'] = n_samples
+    _worker['X'] = X
+    _worker['true_labels'] = true_labels
+    _worker['silhouette'] = silhouette
+
+
+def run_configuration(config):
+    """
+    Ajusta y evalúa una configuración usando las distancias compartidas.
+
+    Args:
+        config: Diccionario con 'algorithm' ('agglomerative' o 'divisive') y
+            sus parámetros
+
+    Returns:
+        dict: Fila de la tabla comparativa
+    """
+    X = _worker['X']
+    distances = _worker['distances']
+
+    # La salida detallada de cada algoritmo se descarta para no mezclar procesos
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if config['algorithm'] == 'agglomerative':
+            model = AgglomerativeClustering(linkage=config['linkage'], n_clusters=config['n_clusters'])
+            model.fit(X, distances=distances)
+            description = f"linkage={config['linkage']}, k={config['n_clusters']}"
+        else:
+            model = DivisiveClusteringGraph(threshold=config['threshold'], max_clusters=config['n_clusters'])
+            model.fit(X, engine=PrecomputedSimilarity(distances, _worker['n_samples']))
+            description = f"umbral={config['threshold']}, max={config['n_clusters']}"
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        metrics = ClusterAnalyzer.evaluate_clustering(
+            X, _worker['true_labels'], model.labels_, silhouette=_worker['silhouette'])
+        eval_time = time.perf_counter() - start
+
+    return {
+        "Algoritmo": "Aglomerativo" if config['algorithm'] == 'agglomerative' else "Divisivo",
+        "Configuración": description,
+        "Clusters": int(len(np.unique(model.labels_))),
+        "Silhouette": float(metrics['silhouette']),
+        "Estimador": metrics['silhouette_estimator'],
+        "ARI": float(metrics['adjusted_rand']),
+        "NMI": float(metrics['nmi']),
+        "Tiempo ajuste (s)": round(fit_time, 4),
+        "Tiempo evaluación (s)": round(eval_time, 4)
+    }
+
+
+def build_grid(linkages, thresholds, n_clusters):
+    """Genera la lista de configuraciones a comparar."""
+    grid = []
+    for k in n_clusters:
+        grid.extend({'algorithm': 'agglomerative', 'linkage': m, 'n_clusters': k} for m in linkages)
+        grid.extend({'algorithm': 'divisive', 'threshold': t, 'n_clusters': k} for t in thresholds)
+    return grid
+
+
+def prepare_inputs(args):
+    """
+    Ejecuta una sola vez extracción, preprocesamiento y vectorización.
+
+    Returns:
+        tuple: (matriz de características, etiquetas verdaderas)
+    """
+    if args.corpus:
+        # Abstracts ya procesados (sin categorías disponibles)
+        with open(args.corpus, 'r', encoding='utf-8') as f:
+            records = json.load(f)[:args.sample_size]
+        processed_docs = [r['abstract_processed'] for r in records]
+        true_labels = np.zeros(len(processed_docs), dtype=int)
+    else:
+        abstracts, doc_ids, categories = load_abstracts(args.bibtex, args.sample_size)
+        processed_docs = preprocess_abstracts(abstracts, doc_ids)
+        true_labels = build_true_labels(doc_ids, categories)
+
+    reduction = None if args.reduction == 'none' else args.reduction
+    X, _, _ = vectorize_abstracts(processed_docs, max_features=args.max_features,
+                                  reduction_method=reduction, n_components=args.n_components)
+    return X, true_labels
+
+
+def print_table(rows):
+    """Imprime la tabla comparativa ordenada por silhouette."""
+    header = "{:<14} {:<30} {:>8} {:>11} {:>8} {:>8} {:>11} {:>11}"
+    print(header.format("Algoritmo", "Configuración", "Clusters", "Silhouette",
+                        "ARI", "NMI", "Ajuste (s)", "Eval. (s)"))
+    print("-" * 107)
+    for r in rows:
+        print("{:<14} {:<30} {:>8} {:>11.4f} {:>8.4f} {:>8.4f} {:>11.4f} {:>11.4f}".format(
+            r["Algoritmo"], r["Configuración"], r["Clusters"], r["Silhouette"],
+            r["ARI"], r["NMI"], r["Tiempo ajuste (s)"], r["Tiempo evaluación (s)"]))
+
+
+def save_results(rows, results_dir):
+    """Guarda la tabla comparativa en CSV y JSON."""
+    os.makedirs(results_dir, exist_ok=True)
+    json_path = os.path.join(results_dir, 'sweep_results.json')
+    csv_path = os.path.join(results_dir, 'sweep_results.csv')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=4, ensure_ascii=False)
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nResultados guardados en:\n- {json_path}\n- {csv_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Barrido de configuraciones de clustering con precomputación compartida")
+    parser.add_argument('--bibtex', default=default_bibtex_path)
+    parser.add_argument('--corpus', default=None,
+                        help="processed_abstracts.json para omitir extracción y preprocesamiento")
+    parser.add_argument('--sample-size', type=int, default=200)
+    parser.add_argument('--max-features', type=int, default=500)
+    parser.add_argument('--reduction', choices=['lsa', 'random_projection', 'none'], default='lsa')
+    parser.add_argument('--n-components', type=int, default=50)
+    parser.add_argument('--linkages', nargs='+', default=['single', 'complete', 'average', 'ward'])
+    parser.add_argument('--thresholds', nargs='+', type=float, default=[0.1, 0.15, 0.2, 0.3])
+    parser.add_argument('--n-clusters', nargs='+', type=int, default=[20])
+    parser.add_argument('--silhouette', default='auto',
+                        choices=['exact', 'blockwise', 'sampled', 'simplified', 'auto'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default=output_dir)
+    args = parser.parse_args()
+
+    print("=== Barrido de configuraciones de clustering ===")
+    start = time.perf_counter()
+    X, true_labels = prepare_inputs(args)
+    prepare_time = time.perf_counter() - start
+
+    # Distancias coseno condensadas: se calculan una vez y se comparten
+    start = time.perf_counter()
+    distances = SimilarityEngine(X).condensed_distances()
+    distance_time = time.perf_counter() - start
+    print(f"Preparación compartida: {prepare_time:.2f} s, distancias: {distance_time:.2f} s "
+          f"({distances.nbytes / 1024 ** 2:.1f} MB en memoria compartida)")
+
+    grid = build_grid(args.linkages, args.thresholds, args.n_clusters)
+    print(f"Ejecutando {len(grid)} configuraciones con {args.workers} procesos...")
+
+    shm = shared_memory.SharedMemory(create=True, size=max(distances.nbytes, 1))
+    try:
+        shared = np.ndarray(distances.shape, dtype=distances.dtype, buffer=shm.buf)
+        shared[:] = distances
+        del distances
+
+        rows = []
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(shm.name, X.shape[0], shared.dtype, X,
+                                           true_labels, args.silhouette)) as executor:
+            futures = {executor.submit(run_configuration, config): config for config in grid}
+            for future in as_completed(futures):
+                try:
+                    rows.append(future.result())
+                except Exception as e:
+                    print(f"Error en la configuración {futures[future]}: {e}")
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if not rows:
+        print("No se completó ninguna configuración")
+        return
+
+    rows.sort(key=lambda r: r["Silhouette"], reverse=True)
+    print()
+    print_table(rows)
+    save_results(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
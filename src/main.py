@@ -13,6 +13,8 @@ from src.scrapers.sciencedirect_scraper import fetch_data_from_sciencedirect
 from src.processors.data_processor import remove_duplicates_and_save
 from src.formatters.bibtex_formatter import save_to_bibtex
 from src.reader_resourses.algorithmsExecution import AlgorithmsExecution
+from src.reader_resourses.benchmark import SortBenchmark
+from src.reader_resourses.parallel import ParallelRunner
 from src.processors.statistics_generator import generate_all_statistics
 
 
@@ -97,7 +99,18 @@ def main():
     # Execute sorting algorithms on titles
     print("\n=== Ejecutando algoritmos de ordenamiento ===")
     algorithms_execution = AlgorithmsExecution()
-    results = algorithms_execution.execute_algorithms(titles, "Títulos")
+    # Cada algoritmo corre en un proceso aislado con límite de tiempo y memoria:
+    # los cuadráticos o los que agotan la recursión quedan registrados como
+    # "timed out" o "crashed" sin bloquear el resto del pipeline. Los procesos
+    # corren en paralelo, cada uno fijado a su propia CPU, y leen los títulos
+    # de un único bloque de memoria compartida
+    isolation = ParallelRunner(timeout_s=120, memory_limit_mb=4096)
+    # Además del tiempo se cuentan comparaciones, movimientos, asignaciones y
+    # profundidad de recursión, y se mide la memoria (pico y total asignado),
+    # cada cosa en una ejecución aparte que no se cronometra
+    benchmark = SortBenchmark(instrument=True, profile_memory=True)
+    results = algorithms_execution.execute_algorithms(titles, "Títulos", benchmark=benchmark,
+                                                      isolation=isolation)
     
     # Save results to a table
     sorting_results_path = os.path.join(processed_data_path, 'sorting_results.json')
@@ -1,16 +1,19 @@
-import time
 from src.sorting_algorithms.binary_insertion import BinaryInsertionSort
 from src.sorting_algorithms.bitonic_sort import BitonicSort
 from src.sorting_algorithms.bucket_sort import BucketSort
 from src.sorting_algorithms.comb_sort import CombSort
 from src.sorting_algorithms.gnome_sort import GnomeSort
 from src.sorting_algorithms.heap_sort import HeapSort
+from src.sorting_algorithms.msd_radix_sort import MSDRadixSort
+from src.sorting_algorithms.multikey_quick_sort import MultikeyQuickSort
 from src.sorting_algorithms.pingeon_sort import PingeonSort
 from src.sorting_algorithms.quick_sort import StringQuickSort
 from src.sorting_algorithms.radix_sort import RadixSort
 from src.sorting_algorithms.selection_sort import SelectionSort
 from src.sorting_algorithms.tim_sort_algorithm import TimSort
-from src.sorting_algorithms.tree_sort import TreeSort
+from src.sorting_algorithms.tree_sort import AVLTreeSort, TreeSort
+from src.reader_resourses.benchmark import SortBenchmark
+from src.reader_resourses.isolation import STATUS_OK, STATUS_CRASHED
 
 
 class AlgorithmsExecution:
@@ -19,59 +22,173 @@ class AlgorithmsExecution:
     """
 
     @staticmethod
-    def run_algorithm(algorithm, arr):
+    def run_algorithm(algorithm, arr, benchmark=None):
         """
         Run a specific sorting algorithm and measure its execution time.
+
+        Each repetition sorts a fresh copy of the array (copied outside the
+        timed region); see SortBenchmark for the repetition policy. A failure
+        in the untimed profiling runs keeps the timing statistics.
+
+        Returns:
+            dict: Timing statistics in milliseconds, or None if the algorithm failed
         """
+        benchmark = benchmark or SortBenchmark()
         try:
-            arr_copy = arr.copy()  # Work with a copy to avoid modifying the original array
-            start_time = time.time()
-            algorithm(arr_copy)
-            end_time = time.time()
-            exec_time = (end_time - start_time) * 1000  # Convert to milliseconds
-            return exec_time
+            stats = benchmark.measure(algorithm, arr)
         except Exception as e:
-            print(f"Error executing {algorithm.__name__}: {e}")
-            return -1
+            print(f"Error executing {getattr(algorithm, '__name__', algorithm)}: {e}")
+            return None
+        if benchmark.profiling:
+            try:
+                stats.update(benchmark.profile(algorithm, arr))
+            except Exception as e:
+                print(f"Error profiling {getattr(algorithm, '__name__', algorithm)}: {e}")
+        return stats
 
     @staticmethod
-    def execute_algorithms(data, data_type):
+    def get_algorithms():
         """
-        Execute all sorting algorithms on the given data and return a table of results.
+        Return the (name, callable) pairs of every benchmarked sorting algorithm.
         """
-        algorithms = [
+        return [
             ("TimSort", TimSort().run_tim_sort),
             ("CombSort", CombSort.comb_sort),
             ("SelectionSort", SelectionSort.selection_sort),
             ("TreeSort", lambda arr: TreeSort(arr).sort()),  # Corrección para TreeSort
+            ("AVLTreeSort", lambda arr: AVLTreeSort(arr).sort()),
             ("PigeonholeSort", PingeonSort.pigeonhole_sort),
             ("BucketSort", BucketSort().sort),
             ("QuickSort", StringQuickSort().quick_sort),
+            ("IntroSort", StringQuickSort().intro_sort),
             ("HeapSort", HeapSort.heap_sort),
+            ("BottomUpHeapSort", HeapSort.bottom_up_heap_sort),
             ("BitonicSort", BitonicSort.sort),
             ("GnomeSort", GnomeSort().sort),
             ("BinaryInsertionSort", BinaryInsertionSort.sort_in_place),
-            ("RadixSort", lambda arr: RadixSort(arr).sort())  # Corrección para RadixSort
+            ("RadixSort", lambda arr: RadixSort(arr).sort()),  # Corrección para RadixSort
+            ("MSDRadixSort", MSDRadixSort().sort),
+            ("MultikeyQuickSort", MultikeyQuickSort().sort)
         ]
 
+    @staticmethod
+    def result_row(name, size, status, stats=None, detail=""):
+        """
+        Build one row of sorting_results.json from the timing statistics
+        (and the memory use and operation counts when the benchmark measures them).
+        """
+        row = {
+            "Método de ordenamiento": name,
+            "Tamaño": size,
+            "Estado": status,
+            "Tiempo (ms)": None,
+            "IQR (ms)": None,
+            "Mínimo (ms)": None,
+            "IC 95% (ms)": None,
+            "Repeticiones": 0,
+            "Atípicos descartados": 0
+        }
+        if stats is not None:
+            row.update({
+                "Tiempo (ms)": stats["median_ms"],
+                "IQR (ms)": stats["iqr_ms"],
+                "Mínimo (ms)": stats["min_ms"],
+                "IC 95% (ms)": list(stats["ci_ms"]),
+                "Repeticiones": stats["repeats"],
+                "Atípicos descartados": stats["outliers"]
+            })
+        if stats is not None and "memory" in stats:
+            memory = stats["memory"]
+            row.update({
+                "Memoria pico (KB)": memory["peak_bytes"] / 1024,
+                "Memoria asignada (KB)": memory["allocated_bytes"] / 1024
+            })
+        if stats is not None and "counts" in stats:
+            counts = stats["counts"]
+            row.update({
+                "Comparaciones": counts["comparisons"],
+                "Movimientos": counts["moves"],
+                "Asignaciones": counts["allocations"],
+                "Elementos asignados": counts["allocated_slots"],
+                "Profundidad de recursión": counts["max_depth"]
+            })
+        if detail:
+            row["Detalle"] = detail
+        return row
+
+    @staticmethod
+    def execute_algorithms(data, data_type, benchmark=None, isolation=None):
+        """
+        Execute all sorting algorithms on the given data and return a table of results.
+
+        "Tiempo (ms)" is the median over the repetitions; the IQR, the minimum
+        and the 95% confidence interval of the median are reported next to it.
+        With an IsolatedRunner each algorithm runs in its own worker process
+        under a time and memory budget, and failures are reported as
+        "timed out" or "crashed" rows instead of stopping the run. A
+        ParallelRunner additionally runs the algorithms concurrently.
+        """
+        algorithms = AlgorithmsExecution.get_algorithms()
+
+        benchmark = benchmark or SortBenchmark()
+        outcomes = {}
+        if hasattr(isolation, "run_all"):
+            outcomes = isolation.run_all([name for name, _ in algorithms], data, benchmark)
+
         results = []
         for name, algorithm in algorithms:
-            time_taken = AlgorithmsExecution.run_algorithm(algorithm, data)
-            if time_taken != -1:
-                results.append({
-                    "Método de ordenamiento": name,
-                    "Tamaño": len(data),
-                    "Tiempo (ms)": time_taken
-                })
+            if isolation is not None:
+                status, stats, detail = outcomes.get(name) or isolation.run(name, data, benchmark)
+                if detail:
+                    print(f"{name}: {status} ({detail})")
+            else:
+                stats = AlgorithmsExecution.run_algorithm(algorithm, data, benchmark)
+                status, detail = (STATUS_OK, "") if stats is not None else (STATUS_CRASHED, "")
+            results.append(AlgorithmsExecution.result_row(name, len(data), status, stats, detail))
 
         # Print results in a table format
         print(f"\n=== Resultados para {data_type} ===")
-        print("{:<20} {:<10} {:<15}".format("Método", "Tamaño", "Tiempo (ms)"))
+        print("{:<20} {:<10} {:>15} {:>12} {:>12} {:>8}".format(
+            "Método", "Tamaño", "Mediana (ms)", "IQR (ms)", "Mínimo (ms)", "Reps"))
         for result in results:
-            print("{:<20} {:<10} {:<15.2f}".format(
+            if result["Estado"] != STATUS_OK:
+                print("{:<20} {:<10} {:>15}".format(
+                    result["Método de ordenamiento"], result["Tamaño"], result["Estado"]))
+                continue
+            print("{:<20} {:<10} {:>15.2f} {:>12.2f} {:>12.2f} {:>8}".format(
                 result["Método de ordenamiento"],
                 result["Tamaño"],
-                result["Tiempo (ms)"]
+                result["Tiempo (ms)"],
+                result["IQR (ms)"],
+                result["Mínimo (ms)"],
+                result["Repeticiones"]
             ))
 
-        return results
\ No newline at end of file
+        if any("Memoria pico (KB)" in result for result in results):
+            print(f"\n=== Memoria para {data_type} ===")
+            print("{:<20} {:>18} {:>22}".format("Método", "Pico (KB)", "Total asignado (KB)"))
+            for result in results:
+                if "Memoria pico (KB)" not in result:
+                    continue
+                print("{:<20} {:>18.1f} {:>22.1f}".format(
+                    result["Método de ordenamiento"],
+                    result["Memoria pico (KB)"],
+                    result["Memoria asignada (KB)"]
+                ))
+
+        if any("Comparaciones" in result for result in results):
+            print(f"\n=== Operaciones para {data_type} ===")
+            print("{:<20} {:>15} {:>15} {:>13} {:>12}".format(
+                "Método", "Comparaciones", "Movimientos", "Asignaciones", "Profundidad"))
+            for result in results:
+                if "Comparaciones" not in result:
+                    continue
+                print("{:<20} {:>15} {:>15} {:>13} {:>12}".format(
+                    result["Método de ordenamiento"],
+                    result["Comparaciones"],
+                    result["Movimientos"],
+                    result["Asignaciones"],
+                    result["Profundidad de recursión"]
+                ))
+
+        return results
@@ -0,0 +1,215 @@
+import gc
+import math
+import time
+
+from src.sorting_algorithms.instrumentation import count_operations, measure_memory
+
+
+def median_confidence_interval(sorted_samples, z=1.96):
+    """
+    Distribution-free confidence interval for the median.
+
+    Uses the order statistics around n/2 (binomial normal approximation), so no
+    assumption is made about the shape of the timing distribution, which is
+    usually skewed to the right.
+
+    Args:
+        sorted_samples (list): Samples sorted in ascending order
+        z (float): Normal quantile of the confidence level (1.96 for 95%)
+
+    Returns:
+        tuple: (lower bound, upper bound)
+    """
+    n = len(sorted_samples)
+    spread = z * math.sqrt(n) / 2
+    lower = max(0, int(math.floor(n / 2 - spread)))
+    upper = min(n - 1, int(math.ceil(n / 2 + spread)) - 1)
+    return sorted_samples[lower], sorted_samples[upper]
+
+
+def _quantile(sorted_samples, q):
+    """Linear-interpolated quantile of already sorted samples."""
+    position = (len(sorted_samples) - 1) * q
+    low = int(math.floor(position))
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (position - low)
+
+
+class SortBenchmark:
+    """
+    Repeatable timing of sorting algorithms.
+
+    Every repetition sorts a fresh copy of the input; the copy is made outside
+    the timed region and the garbage collector is run before and disabled
+    during the measurement. After the warmup runs, repetitions continue until
+    the 95% confidence interval of the median is narrower than target_ci
+    (relative half-width), max_repeats is reached or the time budget runs out.
+    The output of the first run is checked against sorted(data) outside the
+    timed region, and measure() raises ValueError if it is not sorted.
+    Outliers are discarded with Tukey fences before computing the statistics.
+    With instrument=True one extra, untimed run counts the comparisons, moves,
+    allocations and recursion depth of the algorithm (see count_operations),
+    and with profile_memory=True another one measures its memory use (see
+    measure_memory). These runs are much slower than a plain run, so they are
+    done by profile(), separately from measure().
+    """
+
+    def __init__(self, warmup=1, min_repeats=5, max_repeats=100, target_ci=0.05,
+                 time_budget_s=10.0, outlier_iqr=1.5, disable_gc=True, instrument=False,
+                 profile_memory=False):
+        """
+        Initialize the benchmark settings.
+
+        Args:
+            warmup (int): Untimed runs before measuring
+            min_repeats (int): Minimum number of measured runs
+            max_repeats (int): Maximum number of measured runs
+            target_ci (float): Target relative half-width of the median's 95% CI
+            time_budget_s (float): Wall-clock budget per algorithm (seconds)
+            outlier_iqr (float): Tukey fence factor (None keeps every sample)
+            disable_gc (bool): Disable the garbage collector while timing
+            instrument (bool): Add operation counts to the statistics
+            profile_memory (bool): Add peak and total allocated memory to the statistics
+        """
+        self.warmup = warmup
+        self.min_repeats = min_repeats
+        self.max_repeats = max_repeats
+        self.target_ci = target_ci
+        self.time_budget_s = time_budget_s
+        self.outlier_iqr = outlier_iqr
+        self.disable_gc = disable_gc
+        self.instrument = instrument
+        self.profile_memory = profile_memory
+
+    def _run_once(self, algorithm, data, verify=False):
+        """
+        Time a single run of the algorithm on a fresh copy of the data.
+
+        Args:
+            verify (bool): Check the output against sorted(data) after the
+                timed region (the returned list, or the input for in-place sorts)
+
+        Returns:
+            int: Elapsed time in nanoseconds
+        """
+        arr = list(data)
+        gc_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            result = algorithm(arr)
+            end = time.perf_counter_ns()
+        finally:
+            if self.disable_gc and gc_enabled:
+                gc.enable()
+        if verify:
+            output = arr if result is None else list(result)
+            if output != sorted(data):
+                raise ValueError("the algorithm did not sort its input")
+        return end - start
+
+    def _converged(self, samples):
+        """Check whether the median's confidence interval is narrow enough."""
+        if len(samples) < self.min_repeats:
+            return False
+        ordered = sorted(samples)
+        median = _quantile(ordered, 0.5)
+        if median <= 0:
+            return True
+        lower, upper = median_confidence_interval(ordered)
+        return (upper - lower) / 2 / median <= self.target_ci
+
+    def measure(self, algorithm, data):
+        """
+        Measure an algorithm until its timing is statistically stable.
+
+        A warmup run slow enough to exhaust the budget in fewer than
+        min_repeats runs is kept as a sample: for such algorithms the steady
+        state dominates and a second run would only double the cost.
+
+        Args:
+            algorithm (callable): Sorting function taking the list to sort
+            data (list): Input data (never modified)
+
+        Returns:
+            dict: Timing statistics (see summarize)
+        """
+        budget_ns = self.time_budget_s * 1e9
+        start = time.perf_counter_ns()
+        samples = []
+
+        runs = 0
+
+        for _ in range(self.warmup):
+            elapsed = self._run_once(algorithm, data, verify=runs == 0)
+            runs += 1
+            if elapsed * self.min_repeats > budget_ns:
+                samples.append(elapsed)
+                break
+
+        while len(samples) < self.max_repeats:
+            if samples and time.perf_counter_ns() - start >= budget_ns:
+                break
+            if self._converged(samples):
+                break
+            samples.append(self._run_once(algorithm, data, verify=runs == 0))
+            runs += 1
+
+        return self.summarize(samples)
+
+    @property
+    def profiling(self):
+        """Whether profile() has any untimed run to do."""
+        return self.instrument or self.profile_memory
+
+    def profile(self, algorithm, data):
+        """
+        Untimed instrumented runs requested by instrument and profile_memory.
+
+        Args:
+            algorithm (callable): Sorting function taking the list to sort
+            data (list): Input data (never modified)
+
+        Returns:
+            dict: "counts" and/or "memory", to be merged into the timing statistics
+        """
+        extra = {}
+        if self.instrument:
+            extra["counts"] = count_operations(algorithm, data)
+        if self.profile_memory:
+            extra["memory"] = measure_memory(algorithm, data)
+        return extra
+
+    def summarize(self, samples_ns):
+        """
+        Compute robust statistics from the raw samples.
+
+        Args:
+            samples_ns (list): Elapsed times in nanoseconds
+
+        Returns:
+            dict: median_ms, iqr_ms, min_ms, mean_ms, ci_ms (95% CI of the
+                median), relative_ci, repeats and outliers
+        """
+        ordered = sorted(samples_ns)
+        kept = ordered
+        if self.outlier_iqr is not None and len(ordered) >= 4:
+            q1, q3 = _quantile(ordered, 0.25), _quantile(ordered, 0.75)
+            fence = self.outlier_iqr * (q3 - q1)
+            kept = [s for s in ordered if q1 - fence <= s <= q3 + fence]
+
+        median = _quantile(kept, 0.5)
+        lower, upper = median_confidence_interval(kept)
+        to_ms = 1e-6
+        return {
+            "median_ms": median * to_ms,
+            "iqr_ms": (_quantile(kept, 0.75) - _quantile(kept, 0.25)) * to_ms,
+            "min_ms": ordered[0] * to_ms,
+            "mean_ms": sum(kept) / len(kept) * to_ms,
+            "ci_ms": (lower * to_ms, upper * to_ms),
+            "relative_ci": (upper - lower) / 2 / median if median > 0 else 0.0,
+            "repeats": len(ordered),
+            "outliers": len(ordered) - len(kept)
+        }
@@ -0,0 +1,221 @@
+import os
+import sys
+import threading
+import multiprocessing
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limits
+    resource = None
+
+from src.reader_resourses.benchmark import SortBenchmark
+
+STATUS_OK = "ok"
+STATUS_TIMED_OUT = "timed out"
+STATUS_CRASHED = "crashed"
+_PROFILE = "profile"
+
+
+def resolve_algorithm(name):
+    """
+    Look up a sorting algorithm by name in AlgorithmsExecution.get_algorithms().
+
+    Workers receive the name instead of the callable because several entries
+    are lambdas, which cannot be sent to a spawned process.
+    """
+    from src.reader_resourses.algorithmsExecution import AlgorithmsExecution
+
+    for algorithm_name, algorithm in AlgorithmsExecution.get_algorithms():
+        if algorithm_name == name:
+            return algorithm
+    raise ValueError(f"Unknown sorting algorithm '{name}'")
+
+
+def _limit_memory(memory_limit_mb):
+    """Cap the address space of the current process (POSIX only)."""
+    if resource is None or memory_limit_mb is None:
+        return
+    limit = int(memory_limit_mb * 1024 ** 2)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _isolated_worker(conn, name, data, benchmark, memory_limit_mb, recursion_limit, stack_size_mb,
+                     cpu=None):
+    """
+    Entry point of the worker process: apply the limits, measure and report.
+
+    ``data`` may be the list itself or any object with a ``load()`` method
+    (see SharedTitles), and ``cpu`` pins the worker to one core.
+
+    The timing statistics are sent as soon as they are ready; the untimed
+    profiling runs of the benchmark (if any) follow in a second message, so
+    the parent keeps the timings even if profiling runs out of time.
+
+    The measurement runs in a thread with a large stack when a recursion limit
+    is given, so deep recursion (TreeSort on sorted input, recursive heapify)
+    is bounded by the limit instead of overflowing the C stack.
+    """
+    sent = []
+
+    def send(message):
+        conn.send(message)
+        sent.append(message[0])
+
+    def measure():
+        try:
+            algorithm = resolve_algorithm(name)
+            stats = benchmark.measure(algorithm, data)
+        except BaseException as e:  # RecursionError, MemoryError, ...
+            send((STATUS_CRASHED, f"{type(e).__name__}: {e}"))
+            return
+        send((STATUS_OK, stats))
+        if benchmark.profiling:
+            try:
+                send((_PROFILE, benchmark.profile(algorithm, data)))
+            except BaseException as e:
+                send((STATUS_CRASHED, f"{type(e).__name__}: {e}"))
+
+    try:
+        if cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        if hasattr(data, "load"):
+            data = data.load()
+        _limit_memory(memory_limit_mb)
+        if recursion_limit is not None:
+            sys.setrecursionlimit(recursion_limit)
+            # The thread stack counts against the address-space cap
+            if memory_limit_mb is not None:
+                stack_size_mb = min(stack_size_mb, memory_limit_mb // 4)
+            threading.stack_size(max(1, stack_size_mb) * 1024 ** 2)
+            worker = threading.Thread(target=measure)
+            worker.start()
+            worker.join()
+        else:
+            measure()
+    except BaseException as e:
+        if not sent:
+            conn.send((STATUS_CRASHED, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+class IsolatedRunner:
+    """
+    Runs each sorting algorithm in its own worker process.
+
+    The parent waits at most timeout_s for the result and kills the worker
+    afterwards; the worker runs with an address-space cap (RLIMIT_AS) and an
+    optional recursion limit. A hanging, exhausted or dying algorithm is
+    recorded as "timed out" or "crashed" instead of blocking or killing the
+    whole run.
+    """
+
+    def __init__(self, timeout_s=120.0, memory_limit_mb=4096, recursion_limit=100000,
+                 stack_size_mb=512, start_method=None):
+        """
+        Initialize the runner.
+
+        Args:
+            timeout_s (float): Wall-clock budget per algorithm, including repetitions
+            memory_limit_mb (int): Address-space cap of the worker (None for no cap)
+            recursion_limit (int): Recursion limit inside the worker (None keeps the default)
+            stack_size_mb (int): Thread stack size used with recursion_limit
+            start_method (str): multiprocessing start method (None for the platform default)
+        """
+        self.timeout_s = timeout_s
+        self.memory_limit_mb = memory_limit_mb
+        self.recursion_limit = recursion_limit
+        self.stack_size_mb = stack_size_mb
+        self.context = multiprocessing.get_context(start_method)
+
+    def run(self, name, data, benchmark=None):
+        """
+        Measure one algorithm in an isolated worker.
+
+        The timing and the untimed profiling runs (operation counts, memory)
+        get timeout_s each; when profiling times out or fails the timing
+        statistics are kept and the problem is reported in the detail.
+
+        Args:
+            name (str): Algorithm name as listed in AlgorithmsExecution.get_algorithms()
+            data (list): Input data
+            benchmark (SortBenchmark): Timing policy used inside the worker
+
+        Returns:
+            tuple: (status, timing statistics or None, detail message)
+        """
+        benchmark = benchmark or SortBenchmark()
+        process, receiver = self._start(name, data, benchmark)
+        try:
+            if not receiver.poll(self.timeout_s):
+                return self._timed_out()
+            outcome = self._receive_timing(process, receiver)
+            if outcome[0] == STATUS_OK and benchmark.profiling:
+                if receiver.poll(self.timeout_s):
+                    outcome = self._receive_profile(process, receiver, outcome)
+                else:
+                    outcome = self._profile_timed_out(outcome)
+            return outcome
+        finally:
+            self._stop(process, receiver)
+
+    def _start(self, name, data, benchmark, cpu=None):
+        """Start a worker process and return it with the receiving end of its pipe."""
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=_isolated_worker,
+            args=(sender, name, data, benchmark, self.memory_limit_mb,
+                  self.recursion_limit, self.stack_size_mb, cpu),
+            daemon=True)
+        process.start()
+        sender.close()
+        return process, receiver
+
+    @staticmethod
+    def _receive(process, receiver):
+        """Read the next message of a worker whose pipe is ready (None on EOF)."""
+        try:
+            return receiver.recv()
+        except EOFError:
+            process.join()
+            return None
+
+    def _receive_timing(self, process, receiver):
+        """Read the timing outcome of a worker (result, error or EOF)."""
+        message = self._receive(process, receiver)
+        if message is None:
+            return STATUS_CRASHED, None, f"worker exited with code {process.exitcode}"
+        status, payload = message
+        if status == STATUS_OK:
+            return STATUS_OK, payload, ""
+        return STATUS_CRASHED, None, payload
+
+    def _receive_profile(self, process, receiver, outcome):
+        """Merge the profiling message of a worker into its timing outcome."""
+        status, stats, _ = outcome
+        message = self._receive(process, receiver)
+        if message is None:
+            return status, stats, f"profiling failed: worker exited with code {process.exitcode}"
+        kind, payload = message
+        if kind == _PROFILE:
+            return status, dict(stats, **payload), ""
+        return status, stats, f"profiling failed: {payload}"
+
+    def _timed_out(self):
+        """Outcome of a worker that exceeded the time budget."""
+        return STATUS_TIMED_OUT, None, f"no result after {self.timeout_s:g} s"
+
+    def _profile_timed_out(self, outcome):
+        """Timing outcome of a worker whose profiling runs exceeded the time budget."""
+        status, stats, _ = outcome
+        return status, stats, f"profiling timed out after {self.timeout_s:g} s"
+
+    @staticmethod
+    def _stop(process, receiver):
+        """Kill the worker if it is still running and release the pipe."""
+        if process.is_alive():
+            process.kill()
+            process.join()
+        receiver.close()
@@ -0,0 +1,176 @@
+import os
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from src.reader_resourses.benchmark import SortBenchmark
+from src.reader_resourses.isolation import STATUS_OK, IsolatedRunner
+
+
+class SharedTitles:
+    """
+    A list of strings stored once in shared memory.
+
+    The block holds the n + 1 byte offsets (int64) followed by the UTF-8 bytes
+    of every title, so each worker rebuilds its own list from the block instead
+    of receiving a pickled copy of the whole list. Only the block name and the
+    sizes are pickled when the handle is sent to a worker.
+    """
+
+    def __init__(self, shm_name, n_items, n_bytes):
+        self.shm_name = shm_name
+        self.n_items = n_items
+        self.n_bytes = n_bytes
+        self._shm = None
+
+    @classmethod
+    def create(cls, titles):
+        """
+        Copy the titles into a new shared memory block.
+
+        Args:
+            titles (list): Strings to share
+
+        Returns:
+            SharedTitles: Handle owning the block (call unlink() when done)
+        """
+        encoded = [title.encode("utf-8") for title in titles]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        header = offsets.nbytes
+        total = header + int(offsets[-1])
+
+        shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        shm.buf[:header] = offsets.tobytes()
+        shm.buf[header:total] = b"".join(encoded)
+        handle = cls(shm.name, len(encoded), total)
+        handle._shm = shm
+        return handle
+
+    def __getstate__(self):
+        return {"shm_name": self.shm_name, "n_items": self.n_items, "n_bytes": self.n_bytes}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def load(self):
+        """
+        Rebuild the list of titles from the shared block.
+
+        Returns:
+            list: A private copy of the titles
+        """
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            header = (self.n_items + 1) * 8
+            offsets = np.frombuffer(shm.buf[:header], dtype=np.int64).tolist()
+            payload = bytes(shm.buf[header:self.n_bytes])
+        finally:
+            shm.close()
+        return [payload[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.n_items)]
+
+    def unlink(self):
+        """Release the shared block (owner only)."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class ParallelRunner(IsolatedRunner):
+    """
+    Runs independent sorting algorithms concurrently.
+
+    Up to ``workers`` isolated worker processes run at the same time, each
+    pinned to its own CPU so that concurrent jobs do not steal each other's
+    core (and their timings stay comparable to a sequential run). The input is
+    shared once through SharedTitles. Time and memory limits work as in
+    IsolatedRunner; the timeout of each job starts when the job starts, and
+    its profiling runs (if any) get a fresh timeout once the timings arrive.
+    """
+
+    def __init__(self, workers=None, pin_cpus=True, **kwargs):
+        """
+        Initialize the runner.
+
+        Args:
+            workers (int): Concurrent jobs (defaults to the number of usable CPUs)
+            pin_cpus (bool): Pin each worker to a dedicated CPU (Linux only)
+            **kwargs: Limits passed to IsolatedRunner (timeout_s, memory_limit_mb, ...)
+        """
+        super().__init__(**kwargs)
+        if hasattr(os, "sched_getaffinity"):
+            self.cpus = sorted(os.sched_getaffinity(0))
+        else:
+            self.cpus = list(range(os.cpu_count() or 1))
+        self.workers = workers or len(self.cpus)
+        self.pin_cpus = pin_cpus and hasattr(os, "sched_setaffinity")
+        if self.pin_cpus and self.workers > len(self.cpus):
+            print(f"Warning: {self.workers} workers on {len(self.cpus)} CPUs; "
+                  "pinned jobs will share cores and timings will interfere")
+
+    def run_all(self, names, data, benchmark=None):
+        """
+        Measure several algorithms concurrently on the same input.
+
+        Args:
+            names (list): Algorithm names as listed in AlgorithmsExecution.get_algorithms()
+            data (list): Input strings
+            benchmark (SortBenchmark): Timing policy used inside each worker
+
+        Returns:
+            dict: name -> (status, timing statistics or None, detail message)
+        """
+        benchmark = benchmark or SortBenchmark()
+        shared = SharedTitles.create(data)
+        pending = list(names)
+        load = {cpu: 0 for cpu in self.cpus}
+        running = {}
+        outcomes = {}
+        try:
+            while pending or running:
+                while pending and len(running) < self.workers:
+                    name = pending.pop(0)
+                    cpu = None
+                    if self.pin_cpus:
+                        # Least loaded CPU: a dedicated one while workers <= CPUs
+                        cpu = min(self.cpus, key=lambda c: load[c])
+                        load[cpu] += 1
+                    process, receiver = self._start(name, shared, benchmark, cpu)
+                    running[receiver] = (name, process, cpu, time.monotonic() + self.timeout_s, None)
+                    print(f"Started {name}" + (f" on CPU {cpu}" if cpu is not None else ""))
+
+                deadline = min(entry[3] for entry in running.values())
+                ready = wait(list(running), timeout=max(0.0, deadline - time.monotonic()))
+                now = time.monotonic()
+                for receiver in list(running):
+                    name, process, cpu, job_deadline, timing = running[receiver]
+                    if receiver in ready and timing is None:
+                        outcome = self._receive_timing(process, receiver)
+                        if outcome[0] == STATUS_OK and benchmark.profiling:
+                            # Timings kept; the profiling runs get their own deadline
+                            running[receiver] = (name, process, cpu,
+                                                 time.monotonic() + self.timeout_s, outcome)
+                            continue
+                        outcomes[name] = outcome
+                    elif receiver in ready:
+                        outcomes[name] = self._receive_profile(process, receiver, timing)
+                    elif now >= job_deadline:
+                        outcomes[name] = (self._timed_out() if timing is None
+                                          else self._profile_timed_out(timing))
+                    else:
+                        continue
+                    self._stop(process, receiver)
+                    del running[receiver]
+                    if cpu is not None:
+                        load[cpu] -= 1
+                    print(f"Finished {name}: {outcomes[name][0]}")
+        finally:
+            for name, process, _, _, _ in running.values():
+                process.kill()
+                process.join()
+            shared.unlink()
+        return outcomes
@@ -0,0 +1,240 @@
+import math
+import random
+
+from src.reader_resourses.benchmark import SortBenchmark
+
+INPUT_SHAPES = ("random", "sorted", "reverse", "nearly_sorted", "duplicates", "shared_prefix")
+
+_DEFAULT_WORDS = (
+    "analysis", "learning", "systems", "education", "students", "model", "data",
+    "programming", "computational", "thinking", "approach", "evaluation", "study",
+    "software", "design", "network", "review", "framework", "teaching", "algorithm"
+)
+_SHARED_PREFIX = "A systematic literature review of the effects of computational thinking on "
+
+
+def generate_titles(n, shape="random", words=None, seed=42):
+    """
+    Generate n synthetic article titles with a given input shape.
+
+    Args:
+        n (int): Number of titles
+        shape (str): One of INPUT_SHAPES
+        words (list): Vocabulary to draw words from (defaults to a small built-in list)
+        seed (int): Random seed
+
+    Returns:
+        list: Titles arranged according to the requested shape
+    """
+    if shape not in INPUT_SHAPES:
+        raise ValueError(f"Unknown input shape '{shape}', expected one of {INPUT_SHAPES}")
+    rng = random.Random(seed)
+    words = list(words or _DEFAULT_WORDS)
+
+    def title():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(4, 12))).capitalize()
+
+    if shape == "duplicates":
+        # Roughly sqrt(n) distinct titles, each repeated many times
+        pool = [title() for _ in range(max(1, int(math.sqrt(n))))]
+        return [rng.choice(pool) for _ in range(n)]
+    if shape == "shared_prefix":
+        return [_SHARED_PREFIX + title().lower() for _ in range(n)]
+
+    titles = [title() for _ in range(n)]
+    if shape == "sorted":
+        titles.sort()
+    elif shape == "reverse":
+        titles.sort(reverse=True)
+    elif shape == "nearly_sorted":
+        # Sorted input with 1% of the positions swapped at random
+        titles.sort()
+        for _ in range(max(1, n // 100)):
+            i, j = rng.randrange(n), rng.randrange(n)
+            titles[i], titles[j] = titles[j], titles[i]
+    return titles
+
+
+def geometric_sizes(start=100, stop=1_000_000, per_decade=2):
+    """
+    Geometric range of input sizes, e.g. 100, 316, 1000, ... 1000000.
+
+    Args:
+        start (int): Smallest size
+        stop (int): Largest size
+        per_decade (int): Number of sizes per factor of 10
+
+    Returns:
+        list: Sizes in increasing order
+    """
+    steps = int(round(math.log10(stop / start) * per_decade))
+    return [int(round(start * 10 ** (i / per_decade))) for i in range(steps + 1)]
+
+
+def fit_exponent(sizes, times_ms, min_time_ms=1.0):
+    """
+    Fit times ≈ c · n^k by least squares on the log-log points.
+
+    Points faster than min_time_ms are dominated by call overhead and timer
+    resolution, so they are left out when at least two slower points exist.
+
+    Args:
+        sizes (list): Input sizes
+        times_ms (list): Median times in milliseconds
+        min_time_ms (float): Minimum time of the points used in the fit
+
+    Returns:
+        dict: exponent, r_squared and points used (exponent None with < 2 points)
+    """
+    points = [(n, t) for n, t in zip(sizes, times_ms) if t > 0]
+    slow = [(n, t) for n, t in points if t >= min_time_ms]
+    if len(slow) >= 2:
+        points = slow
+    if len(points) < 2:
+        return {"exponent": None, "r_squared": None, "points": len(points)}
+
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    ss_res = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys))
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    return {
+        "exponent": slope,
+        "r_squared": 1 - ss_res / ss_tot if ss_tot > 0 else 1.0,
+        "points": len(points)
+    }
+
+
+class ScalingBenchmark:
+    """
+    Runs every sorting algorithm over a range of sizes and input shapes.
+
+    Sizes are visited in increasing order; before each run the time is
+    predicted from the previous points (using at least a linear growth) and
+    sizes predicted to exceed max_run_s are skipped, so quadratic algorithms
+    stop early instead of running for hours at 1e6 titles.
+    """
+
+    def __init__(self, algorithms, sizes=None, shapes=INPUT_SHAPES, benchmark=None,
+                 max_run_s=10.0, words=None, seed=42):
+        """
+        Initialize the suite.
+
+        Args:
+            algorithms (list): (name, callable) pairs, see AlgorithmsExecution.get_algorithms
+            sizes (list): Input sizes (defaults to geometric_sizes())
+            shapes (tuple): Input shapes to test
+            benchmark (SortBenchmark): Timing policy for each point
+            max_run_s (float): Skip sizes whose single run is predicted to exceed this
+            words (list): Vocabulary for the synthetic titles
+            seed (int): Random seed of the generated inputs
+        """
+        self.algorithms = algorithms
+        self.sizes = sorted(sizes or geometric_sizes())
+        self.shapes = shapes
+        self.benchmark = benchmark or SortBenchmark(min_repeats=3, max_repeats=30, time_budget_s=3.0)
+        self.max_run_s = max_run_s
+        self.words = words
+        self.seed = seed
+
+    def _predict_ms(self, measured, n):
+        """Predict the time at size n from the points measured so far."""
+        if not measured:
+            return 0.0
+        if len(measured) >= 2:
+            (n0, t0), (n1, t1) = measured[-2], measured[-1]
+            exponent = math.log(t1 / t0) / math.log(n1 / n0) if t0 > 0 and t1 > 0 else 1.0
+        else:
+            exponent = 1.0
+        n_last, t_last = measured[-1]
+        return t_last * (n / n_last) ** max(1.0, exponent)
+
+    def run(self):
+        """
+        Run the whole grid.
+
+        Returns:
+            tuple: (list of measurement rows, list of exponent-fit rows)
+        """
+        rows, fits = [], []
+        for shape in self.shapes:
+            inputs = {n: generate_titles(n, shape, self.words, self.seed) for n in self.sizes}
+            for name, algorithm in self.algorithms:
+                measured = []
+                for n in self.sizes:
+                    row = {"Método de ordenamiento": name, "Forma de entrada": shape, "Tamaño": n}
+                    predicted = self._predict_ms(measured, n)
+                    if predicted > self.max_run_s * 1000:
+                        row.update({"Estado": "omitido", "Tiempo (ms)": None,
+                                    "Predicción (ms)": predicted})
+                        rows.append(row)
+                        continue
+                    try:
+                        stats = self.benchmark.measure(algorithm, inputs[n])
+                    except Exception as e:
+                        # Unsorted output, RecursionError, MemoryError...: the larger sizes would fail too
+                        print(f"Error executing {name} ({shape}, n={n}): {type(e).__name__}: {e}")
+                        row.update({"Estado": f"error: {type(e).__name__}", "Tiempo (ms)": None,
+                                    "Detalle": str(e)})
+                        rows.append(row)
+                        break
+                    row.update({"Estado": "ok", "Tiempo (ms)": stats["median_ms"],
+                                "IQR (ms)": stats["iqr_ms"], "Mínimo (ms)": stats["min_ms"],
+                                "Repeticiones": stats["repeats"]})
+                    rows.append(row)
+                    measured.append((n, stats["median_ms"]))
+                    print(f"{name:<20} {shape:<14} n={n:<8} {stats['median_ms']:>12.2f} ms")
+
+                fit = fit_exponent([n for n, _ in measured], [t for _, t in measured])
+                fits.append({"Método de ordenamiento": name, "Forma de entrada": shape,
+                             "Exponente": fit["exponent"], "R2": fit["r_squared"],
+                             "Puntos": fit["points"]})
+        return rows, fits
+
+
+def plot_scaling(rows, shape):
+    """
+    Log-log plot of time versus size for every algorithm on one input shape.
+
+    Args:
+        rows (list): Measurement rows from ScalingBenchmark.run
+        shape (str): Input shape to plot
+
+    Returns:
+        matplotlib.figure.Figure: The figure
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 7))
+    ax.set_prop_cycle(color=plt.cm.tab20.colors)
+    names = list(dict.fromkeys(r["Método de ordenamiento"] for r in rows))
+    for name in names:
+        points = [(r["Tamaño"], r["Tiempo (ms)"]) for r in rows
+                  if r["Método de ordenamiento"] == name and r["Forma de entrada"] == shape
+                  and r["Estado"] == "ok"]
+        if points:
+            ax.plot(*zip(*points), marker="o", label=name)
+
+    # Reference slopes anchored at the smallest measured point
+    ok = [r for r in rows if r["Forma de entrada"] == shape and r["Estado"] == "ok"]
+    if ok:
+        n0 = min(r["Tamaño"] for r in ok)
+        t0 = min(r["Tiempo (ms)"] for r in ok if r["Tamaño"] == n0)
+        n1 = max(r["Tamaño"] for r in ok)
+        for exponent, style in ((1, ":"), (2, "--")):
+            ax.plot([n0, n1], [t0, t0 * (n1 / n0) ** exponent], "k" + style, alpha=0.4,
+                    label=f"O(n^{exponent})")
+
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Tamaño de la entrada (n)")
+    ax.set_ylabel("Tiempo mediano (ms)")
+    ax.set_title(f"Escalamiento de los algoritmos de ordenamiento ({shape})")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend(fontsize=8, ncol=2)
+    fig.tight_layout()
+    return fig
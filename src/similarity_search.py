@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import argparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Añadir el directorio raíz al path de Python para resolver las importaciones
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from src.clustering.ann_index import LSHIndex
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+output_dir = os.path.join(base_dir, 'data', 'clustering_results')
+default_corpus_path = os.path.join(output_dir, 'processed_abstracts.json')
+default_index_path = os.path.join(output_dir, 'ann_index.joblib')
+
+
+def load_processed_abstracts(path):
+    """
+    Carga los abstracts procesados generados por clustering_analysis.py.
+
+    Args:
+        path: Ruta al archivo processed_abstracts.json
+
+    Returns:
+        list: Registros con doc_id, abstract_original y abstract_processed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_index(corpus_path, index_path, max_features=500, n_tables=16):
+    """Construye el índice LSH sobre el corpus procesado y lo guarda."""
+    records = load_processed_abstracts(corpus_path)
+    doc_ids = [r['doc_id'] for r in records]
+    documents = [r['abstract_processed'] for r in records]
+
+    print(f"Vectorizando {len(documents)} abstracts...")
+    vectorizer = TfidfVectorizer(max_features=max_features)
+    X = vectorizer.fit_transform(documents)
+
+    index = LSHIndex(n_tables=n_tables).fit(X, doc_ids=doc_ids, vectorizer=vectorizer)
+    index.save(index_path)
+    print(f"Índice guardado en: {index_path}")
+
+    metrics = index.evaluate_recall(k=10)
+    print_recall(metrics)
+    return index
+
+
+def print_recall(metrics):
+    """Muestra el recall y las latencias frente a fuerza bruta."""
+    print(f"Recall@{metrics['k']} frente a fuerza bruta ({metrics['queries']} consultas): "
+          f"{metrics['recall']:.3f}")
+    speedup = metrics['exact_ms'] / metrics['ann_ms'] if metrics['ann_ms'] > 0 else float('inf')
+    print(f"Latencia media: índice {metrics['ann_ms']:.3f} ms, "
+          f"fuerza bruta {metrics['exact_ms']:.3f} ms (aceleración {speedup:.2f}x)")
+    if metrics['exact_fallback']:
+        print("Corpus menor que exact_max_samples: las consultas usan la búsqueda exacta")
+
+
+def print_results(results, abstracts):
+    """Imprime los resultados de una consulta."""
+    print("{:<5} {:<30} {:<10} {}".format("#", "Documento", "Similitud", "Abstract"))
+    for rank, (_, doc_id, similarity) in enumerate(results, start=1):
+        snippet = abstracts.get(doc_id, "")[:60].replace('\n', ' ')
+        print("{:<5} {:<30} {:<10.4f} {}".format(rank, str(doc_id)[:30], similarity, snippet))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Búsqueda de abstracts similares con un índice LSH de vecinos aproximados")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Construir y guardar el índice")
+    build.add_argument('--corpus', default=default_corpus_path)
+    build.add_argument('--index', default=default_index_path)
+    build.add_argument('--max-features', type=int, default=500)
+    build.add_argument('--tables', type=int, default=16)
+
+    query = subparsers.add_parser('query', help="Consultar los abstracts más similares")
+    query.add_argument('--index', default=default_index_path)
+    query.add_argument('--corpus', default=default_corpus_path)
+    group = query.add_mutually_exclusive_group(required=True)
+    group.add_argument('--doc-id', help="Documento del corpus usado como consulta")
+    group.add_argument('--text', help="Texto libre (se preprocesa igual que el corpus)")
+    query.add_argument('-k', type=int, default=10)
+
+    recall = subparsers.add_parser('recall', help="Medir recall frente a fuerza bruta")
+    recall.add_argument('--index', default=default_index_path)
+    recall.add_argument('-k', type=int, default=10)
+    recall.add_argument('--queries', type=int, default=100)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_index(args.corpus, args.index, args.max_features, args.tables)
+        return
+
+    index = LSHIndex.load(args.index)
+
+    if args.command == 'recall':
+        print_recall(index.evaluate_recall(k=args.k, n_queries=args.queries))
+        return
+
+    abstracts = {r['doc_id']: r['abstract_original'] for r in load_processed_abstracts(args.corpus)}
+    if args.doc_id is not None:
+        results = index.query_doc(args.doc_id, k=args.k)
+    else:
+        from src.clustering.preprocessor import TextPreprocessor
+        results = index.query_text(TextPreprocessor().preprocess(args.text), k=args.k)
+    print_results(results, abstracts)
+
+
+if __name__ == "__main__":
+    main()
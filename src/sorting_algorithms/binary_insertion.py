@@ -20,6 +20,9 @@ además que el desplaamiento de elementos puede ser también costoso
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class BinaryInsertionSort:
     """
     A class that implements the Binary Insertion Sort algorithm.
@@ -44,7 +47,7 @@ class BinaryInsertionSort:
         Binary insertion sort algorithm implementation.
         Returns a new sorted array.
         """
-        arr_copy = arr.copy()
+        arr_copy = probe.track(arr.copy())
         BinaryInsertionSort.sort_in_place(arr_copy)
         return arr_copy
 
@@ -15,6 +15,10 @@ Esta fase se realiza de forma recursive
 
 este proceso se repite hasta que el arreglo esté completamente ordenado
 
+La red clásica solo ordena listas de tamaño potencia de dos; aquí cada mezcla compara
+el elemento i con el i + k, donde k es la mayor potencia de dos menor que el tamaño del
+rango, así que funciona con cualquier número de títulos sin rellenar la lista
+
 Precauciones:
 Es un logaritmo eficiente para hardware paralelo o especializado
 En listas grandes de strings con elementos grandes puede ser algo ineficiente
@@ -41,13 +45,16 @@ class BitonicSort:
     def bitonic_merge(arr, low, cnt, ascending):
         """
         Bitonic merge method for bitonic sort algorithm.
+
+        Works for any cnt: the first half has the largest power of two below cnt
+        elements, so the network does not need a power-of-two size.
         """
         if cnt > 1:
-            k = cnt // 2
-            for i in range(low, low + k):
+            k = 1 << ((cnt - 1).bit_length() - 1)
+            for i in range(low, low + cnt - k):
                 BitonicSort.compare_and_swap(arr, i, i + k, ascending)
             BitonicSort.bitonic_merge(arr, low, k, ascending)
-            BitonicSort.bitonic_merge(arr, low + k, k, ascending)
+            BitonicSort.bitonic_merge(arr, low + k, cnt - k, ascending)
 
     @staticmethod
     def bitonic_sort_recursive(arr, low, cnt, ascending):
@@ -56,8 +63,8 @@ class BitonicSort:
         """
         if cnt > 1:
             k = cnt // 2
-            BitonicSort.bitonic_sort_recursive(arr, low, k, True)
-            BitonicSort.bitonic_sort_recursive(arr, low + k, k, False)
+            BitonicSort.bitonic_sort_recursive(arr, low, k, not ascending)
+            BitonicSort.bitonic_sort_recursive(arr, low + k, cnt - k, ascending)
             BitonicSort.bitonic_merge(arr, low, cnt, ascending)
 
     @staticmethod
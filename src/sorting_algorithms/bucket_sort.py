@@ -27,6 +27,9 @@ puede también ocupar mucha memoria si se usan muchos buckets
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class BucketSort:
     def __init__(self, bucket_size=26):
         """
@@ -62,7 +65,7 @@ class BucketSort:
 
         # Create buckets
         bucket_count = self.bucket_size
-        buckets = [[] for _ in range(bucket_count)]
+        buckets = [probe.track([]) for _ in range(bucket_count)]
 
         # Distribute elements into buckets
         for item in arr:
@@ -84,7 +87,7 @@ class BucketSort:
             self._insertion_sort(buckets[i])
 
         # Concatenate buckets back into a single array
-        result = []
+        result = probe.track([])
         for bucket in buckets:
             result.extend(bucket)
 
@@ -21,12 +21,15 @@ O(n) en su mejor caso, O(n^2) en su peor caso
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class GnomeSort:
     def __init__(self):
         pass
 
     def gnome(self, aList):
-        nlist = list(aList)
+        nlist = probe.track(list(aList))
         size = len(nlist)
 
         if size < 2:
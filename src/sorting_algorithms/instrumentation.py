@@ -0,0 +1,284 @@
+"""
+Instrumentation of the sorting algorithms.
+
+Explicación:
+Los tiempos por sí solos no explican por qué un algoritmo es lento, así que este
+módulo cuenta las operaciones que realiza cada algoritmo sobre los títulos:
+
+- Comparaciones: cada elemento se envuelve en un CountingKey, que cuenta las
+  comparaciones (<, >, <=, >=, ==, !=) incluso dentro de min, max o sorted
+- Movimientos: la lista de entrada es una CountingList que cuenta cada escritura
+  (un intercambio son dos escrituras); las listas auxiliares se registran con
+  probe.track o probe.allocate y cada elemento copiado cuenta como un movimiento
+- Asignaciones: listas y nodos auxiliares que crea el algoritmo (probe.allocate)
+- Profundidad de recursión: máxima anidación de llamadas dentro de
+  src/sorting_algorithms (sys.setprofile)
+
+measure_memory mide aparte el pico de memoria con tracemalloc y estima el total
+de bytes asignados a partir de las listas y nodos auxiliares registrados en probe
+(nunca por debajo del pico, que es una cota inferior exacta del total)
+
+Los algoritmos solo llaman a probe en los puntos donde crean memoria auxiliar
+(nunca dentro de los bucles de comparación), y mientras no hay una medición
+activa esas llamadas no hacen nada, así que las mediciones de tiempo no cambian
+"""
+
+import os
+import struct
+import sys
+import threading
+import tracemalloc
+
+_THIS_FILE = os.path.abspath(__file__)
+_ALGORITHMS_DIR = os.path.dirname(_THIS_FILE)
+_EMPTY_LIST_BYTES = sys.getsizeof([])
+_POINTER_BYTES = struct.calcsize("P")
+
+
+class OperationCounts:
+    """
+    Counters filled during one instrumented run.
+    """
+
+    def __init__(self):
+        self.comparisons = 0
+        self.moves = 0
+        self.allocations = 0
+        self.allocated_slots = 0
+        self.max_depth = 0
+
+    def as_dict(self):
+        """
+        Return the counters as a plain dictionary.
+        """
+        return {
+            "comparisons": self.comparisons,
+            "moves": self.moves,
+            "allocations": self.allocations,
+            "allocated_slots": self.allocated_slots,
+            "max_depth": self.max_depth
+        }
+
+
+class CountingKey:
+    """
+    Wrapper around a title that counts every comparison made on it.
+
+    Indexing and len() are delegated to the title so the non comparative
+    algorithms (radix, bucket, pigeonhole) still work on the wrapped values.
+    """
+
+    __slots__ = ("value", "counts")
+
+    def __init__(self, value, counts):
+        self.value = value
+        self.counts = counts
+
+    def __lt__(self, other):
+        self.counts.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.counts.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.counts.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.counts.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        self.counts.comparisons += 1
+        return self.value == other.value
+
+    def __ne__(self, other):
+        self.counts.comparisons += 1
+        return self.value != other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, index):
+        return self.value[index]
+
+    def __repr__(self):
+        return f"CountingKey({self.value!r})"
+
+
+class CountingList(list):
+    """
+    List that counts the element writes made on it.
+
+    Growing the list (append, extend, insert) also counts as allocated slots.
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self, items, counts):
+        super().__init__(items)
+        self.counts = counts
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counts.moves += len(value)
+        else:
+            self.counts.moves += 1
+        super().__setitem__(index, value)
+
+    def append(self, value):
+        self.counts.moves += 1
+        self.counts.allocated_slots += 1
+        super().append(value)
+
+    def extend(self, values):
+        if not hasattr(values, "__len__"):
+            values = list(values)
+        self.counts.moves += len(values)
+        self.counts.allocated_slots += len(values)
+        super().extend(values)
+
+    def insert(self, index, value):
+        self.counts.moves += 1
+        self.counts.allocated_slots += 1
+        super().insert(index, value)
+
+
+class _Probe:
+    """
+    Hook points called by the sorting algorithms.
+
+    Every hook returns immediately unless an instrumented run is active.
+    """
+
+    def __init__(self):
+        self.counts = None
+        self.wrap = True
+
+    def allocate(self, slots, count=1):
+        """
+        Record count auxiliary containers holding slots copied elements in total.
+        """
+        counts = self.counts
+        if counts is not None:
+            counts.allocations += count
+            counts.allocated_slots += slots
+            counts.moves += slots
+
+    def track(self, items):
+        """
+        Record a new auxiliary list and return it (counting its writes when active).
+        """
+        counts = self.counts
+        if counts is None:
+            return items
+        self.allocate(len(items))
+        if not self.wrap and items:
+            return items  # Copying into a CountingList would inflate the memory peak
+        return CountingList(items, counts)
+
+
+probe = _Probe()
+_lock = threading.Lock()
+
+
+def _in_algorithms(frame):
+    """Whether the frame runs code of a sorting algorithm module."""
+    filename = frame.f_code.co_filename
+    return filename.startswith(_ALGORITHMS_DIR) and filename != _THIS_FILE
+
+
+def _depth_tracer(counts):
+    """Profile function that tracks the nesting of the algorithms' frames."""
+    depth = [0]
+
+    def tracer(frame, event, arg):
+        if event not in ("call", "return") or not _in_algorithms(frame):
+            return
+        if event == "call":
+            depth[0] += 1
+            if depth[0] > counts.max_depth:
+                counts.max_depth = depth[0]
+        else:
+            depth[0] -= 1
+
+    return tracer
+
+
+def count_operations(algorithm, data):
+    """
+    Run the algorithm once on an instrumented copy of the data.
+
+    Args:
+        algorithm (callable): Sorting function taking the list to sort
+        data (list): Input data (never modified)
+
+    Returns:
+        dict: comparisons, moves, allocations, allocated_slots and max_depth
+    """
+    counts = OperationCounts()
+    arr = CountingList((CountingKey(item, counts) for item in data), counts)
+    counts.moves = 0  # Building the instrumented input is not part of the algorithm
+
+    with _lock:
+        previous_profile = sys.getprofile()
+        probe.counts = counts
+        sys.setprofile(_depth_tracer(counts))
+        try:
+            algorithm(arr)
+        finally:
+            sys.setprofile(previous_profile)
+            probe.counts = None
+    return counts.as_dict()
+
+
+def measure_memory(algorithm, data):
+    """
+    Run the algorithm once under tracemalloc and measure its memory use.
+
+    The peak is exact (relative to the memory in use before the run, so the
+    input copy is excluded). tracemalloc cannot tell how much was allocated in
+    total, so the total is estimated from the probe hooks, which only fire
+    where the algorithms create their auxiliary lists and nodes: every
+    container counts as an empty list header plus one pointer per element
+    slot. That misses list over-allocation and the objects the containers
+    point to (e.g. the int indices of AVLTreeSort), so the estimate is a
+    lower bound; since nothing can allocate less in total than its peak, the
+    reported total is never below peak_bytes.
+
+    Args:
+        algorithm (callable): Sorting function taking the list to sort
+        data (list): Input data (never modified)
+
+    Returns:
+        dict: peak_bytes and allocated_bytes
+    """
+    arr = list(data)
+    counts = OperationCounts()
+
+    with _lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        probe.counts = counts
+        probe.wrap = False
+        try:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            algorithm(arr)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            probe.counts = None
+            probe.wrap = True
+            if started:
+                tracemalloc.stop()
+
+    peak_bytes = max(0, peak - baseline)
+    allocated = counts.allocations * _EMPTY_LIST_BYTES + counts.allocated_slots * _POINTER_BYTES
+    return {"peak_bytes": peak_bytes, "allocated_bytes": max(allocated, peak_bytes)}
@@ -0,0 +1,89 @@
+"""
+MSD radix sort module
+
+Explicación:
+A diferencia de RadixSort (LSD), que recorre todas las posiciones de la palabra más
+larga para todos los títulos, MSD radix sort empieza por el primer carácter
+
+Los títulos se reparten en cubetas según su carácter en la posición d; las cubetas se
+escriben de vuelta en orden y cada cubeta con más de un título se vuelve a repartir
+por el carácter siguiente (d + 1). Así solo se examina el prefijo que distingue a cada
+título de los demás y no su longitud completa
+
+Los títulos que terminan en la posición d van en una cubeta propia (carácter vacío)
+que queda antes que cualquier otro carácter, igual que en la comparación de strings
+de Python ("abc" < "abcd"); esos títulos son iguales entre sí y no se reparten más
+
+Los caracteres se comparan por su código Unicode (code point), así que los títulos
+con tildes, ñ u otros alfabetos quedan en el mismo orden que con sorted(); las
+cubetas son un diccionario con los caracteres que aparecen, no un arreglo con una
+posición por cada código posible
+
+Las cubetas pequeñas se terminan con inserción, que es más rápida que repartir
+pocos títulos en un diccionario
+
+Precauciones:
+Crea listas auxiliares para las cubetas de cada nivel
+
+Es eficiente cuando los títulos se distinguen en los primeros caracteres; si muchos
+comparten un prefijo largo hay un nivel de reparto por cada carácter del prefijo
+
+O(n * p) donde p es la longitud media del prefijo distintivo
+"""
+
+
+from src.sorting_algorithms.instrumentation import probe
+
+
+class MSDRadixSort:
+    """
+    Most-significant-digit radix sort for strings.
+    """
+
+    def __init__(self):
+        self.INSERTION_CUTOFF = 16
+
+    def sort(self, arr):
+        """
+        Sort the list of strings in place.
+        """
+        # Explicit stack of (lo, hi, d): arr[lo:hi] shares its first d characters
+        stack = [(0, len(arr), 0)]
+        while stack:
+            lo, hi, d = stack.pop()
+            if hi - lo <= self.INSERTION_CUTOFF:
+                self._insertion_sort(arr, lo, hi)
+                continue
+
+            buckets = {}
+            for word in arr[lo:hi]:
+                char = word[d] if d < len(word) else ""
+                bucket = buckets.get(char)
+                if bucket is None:
+                    buckets[char] = [word]
+                else:
+                    bucket.append(word)
+            probe.allocate(hi - lo, count=len(buckets) + 1)
+
+            start = lo
+            for char in sorted(buckets):
+                bucket = buckets[char]
+                end = start + len(bucket)
+                arr[start:end] = bucket
+                # Titles that end at d are equal: nothing left to sort
+                if char and end - start > 1:
+                    stack.append((start, end, d + 1))
+                start = end
+
+    @staticmethod
+    def _insertion_sort(arr, lo, hi):
+        """
+        Insertion sort of arr[lo:hi].
+        """
+        for i in range(lo + 1, hi):
+            key = arr[i]
+            j = i - 1
+            while j >= lo and key < arr[j]:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = key
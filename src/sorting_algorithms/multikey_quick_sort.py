@@ -0,0 +1,108 @@
+"""
+Multikey quicksort module (Bentley–Sedgewick)
+
+Explicación:
+Es un quicksort de tres vías que, en lugar de comparar títulos completos, compara un
+solo carácter a la vez
+
+Se elige como pivote el carácter v en la posición d (mediana de tres títulos) y el
+rango se parte en tres grupos: los títulos cuyo carácter d es menor que v, igual a v
+y mayor que v. Los grupos menor y mayor se vuelven a partir por el mismo carácter d,
+y el grupo igual avanza al carácter siguiente (d + 1), porque ya se sabe que esos
+títulos comparten los primeros d + 1 caracteres
+
+Así cada carácter del prefijo común se compara una sola vez por grupo, en lugar de
+volver a recorrerlo en cada comparación de strings como en un quicksort normal, y la
+partición se hace en el lugar, sin listas auxiliares
+
+Los títulos que terminan en la posición d tienen el carácter vacío, que queda antes
+que cualquier otro carácter; los caracteres se comparan por su código Unicode (code
+point), así que el orden es el mismo que el de sorted()
+
+Los rangos pequeños se terminan con inserción
+
+Precauciones:
+Como todo quicksort, depende de la elección del pivote; la mediana de tres evita el
+peor caso en listas ya ordenadas o invertidas
+
+O(n log n + D) en promedio, donde D es la suma de los prefijos distintivos
+"""
+
+
+class MultikeyQuickSort:
+    """
+    Bentley–Sedgewick three-way radix quicksort for strings.
+    """
+
+    def __init__(self):
+        self.INSERTION_CUTOFF = 16
+
+    def sort(self, arr):
+        """
+        Sort the list of strings in place.
+        """
+        # Explicit stack of (lo, hi, d): arr[lo..hi] shares its first d characters
+        stack = [(0, len(arr) - 1, 0)]
+        while stack:
+            lo, hi, d = stack.pop()
+            if hi - lo + 1 <= self.INSERTION_CUTOFF:
+                self._insertion_sort(arr, lo, hi)
+                continue
+
+            self._median_of_three(arr, lo, hi, d)
+            pivot = self._char_at(arr[lo], d)
+
+            # Dijkstra three-way partition on the character at d
+            lt, i, gt = lo, lo + 1, hi
+            while i <= gt:
+                char = self._char_at(arr[i], d)
+                if char < pivot:
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    lt += 1
+                    i += 1
+                elif char > pivot:
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                    gt -= 1
+                else:
+                    i += 1
+
+            stack.append((lo, lt - 1, d))
+            stack.append((gt + 1, hi, d))
+            # Titles that end at d are equal: nothing left to sort
+            if pivot:
+                stack.append((lt, gt, d + 1))
+
+    @staticmethod
+    def _char_at(word, d):
+        """
+        Character at position d, or "" (smaller than any character) past the end.
+        """
+        return word[d] if d < len(word) else ""
+
+    @staticmethod
+    def _median_of_three(arr, lo, hi, d):
+        """
+        Move the title whose character at d is the median of lo, mid and hi to arr[lo].
+        """
+        mid = (lo + hi) // 2
+        a = MultikeyQuickSort._char_at(arr[lo], d)
+        b = MultikeyQuickSort._char_at(arr[mid], d)
+        c = MultikeyQuickSort._char_at(arr[hi], d)
+        if a < b:
+            median = mid if b < c else (hi if a < c else lo)
+        else:
+            median = lo if a < c else (hi if b < c else mid)
+        arr[lo], arr[median] = arr[median], arr[lo]
+
+    @staticmethod
+    def _insertion_sort(arr, lo, hi):
+        """
+        Insertion sort of arr[lo..hi] (inclusive).
+        """
+        for i in range(lo + 1, hi + 1):
+            key = arr[i]
+            j = i - 1
+            while j >= lo and key < arr[j]:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = key
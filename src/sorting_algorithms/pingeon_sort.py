@@ -35,6 +35,9 @@ O(n + k) donde k es el numero de casilleros o huecos
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class PingeonSort:
     """
     Class for pingeon Sort algorithm.
@@ -51,7 +54,7 @@ class PingeonSort:
         max_value = max(arr)
         size = ord(max_value[0]) - ord(min_value[0]) + 1
 
-        holes = [[] for _ in range(size)]
+        holes = [probe.track([]) for _ in range(size)]
 
         for word in arr:
             index = ord(word[0]) - ord(min_value[0])
@@ -59,6 +62,6 @@ class PingeonSort:
 
         index = 0
         for hole in holes:
-            for word in sorted(hole):
+            for word in probe.track(sorted(hole)):
                 arr[index] = word
                 index += 1
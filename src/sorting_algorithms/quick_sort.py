@@ -13,12 +13,30 @@ La mayoria de los casos el algoritmo resulta eficiente, pero dependiendo de la e
 puede incluso resultar en una ineficiencia
 
 O(n log n) pero O(n^2) en el peor de los casos (mala elección de pivotes)
+
+Variante en el lugar (intro_sort):
+quick_sort crea tres listas nuevas en cada nivel de la recursión. intro_sort ordena
+la lista en el lugar, sin listas auxiliares:
+
+- El pivote es la mediana del primer, el central y el último elemento, así que una
+  lista ya ordenada o invertida no produce el peor caso
+- La partición es de tres vías (Bentley–McIlroy): los elementos iguales al pivote
+  se acumulan en los extremos mientras se recorre el rango y al final se mueven al
+  centro, de modo que los títulos repetidos no se vuelven a ordenar
+- Se recurre sobre la parte más pequeña y se itera sobre la más grande, lo que
+  limita la pila a O(log n)
+- Si la profundidad supera 2·log2(n) el rango se termina con heap sort (introsort),
+  lo que garantiza O(n log n) incluso con pivotes malos
+- Los rangos pequeños se terminan con inserción, más rápida que particionar
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class StringQuickSort:
     def __init__(self):
-        pass
+        self.INSERTION_CUTOFF = 16
 
     def quick_sort(self, arr):
         """
@@ -30,10 +48,145 @@ class StringQuickSort:
         left = [x for x in arr if x < pivot]
         middle = [x for x in arr if x == pivot]
         right = [x for x in arr if x > pivot]
+        # The three partitions plus the concatenated result
+        probe.allocate(2 * len(arr), count=4)
         return self.quick_sort(left) + middle + self.quick_sort(right)
 
     def run_quick_sort(self, arr):
         """
-        Run method for Selection Sort algorithm.
+        Sort the array in place with the introsort variant.
+        """
+        self.intro_sort(arr)
+
+    def intro_sort(self, arr):
+        """
+        In-place quick sort with three-way partitioning and a heap sort fallback.
+        """
+        n = len(arr)
+        if n > 1:
+            self._intro_sort(arr, 0, n - 1, 2 * (n.bit_length() - 1))
+
+    def _intro_sort(self, arr, lo, hi, depth_limit):
+        """
+        Sort arr[lo..hi] (inclusive), switching to heap sort when depth_limit runs out.
+        """
+        while hi - lo + 1 > self.INSERTION_CUTOFF:
+            if depth_limit == 0:
+                self._heap_sort(arr, lo, hi)
+                return
+            depth_limit -= 1
+
+            self._median_of_three(arr, lo, hi)
+            lt, gt = self._partition(arr, lo, hi)
+
+            # Recurse into the smaller side, loop on the larger one
+            if lt - lo < hi - gt:
+                self._intro_sort(arr, lo, lt, depth_limit)
+                lo = gt
+            else:
+                self._intro_sort(arr, gt, hi, depth_limit)
+                hi = lt
+        self._insertion_sort(arr, lo, hi)
+
+    @staticmethod
+    def _median_of_three(arr, lo, hi):
+        """
+        Move the median of arr[lo], arr[mid] and arr[hi] to arr[lo] as the pivot.
         """
-        self.quick_sort(arr)
+        mid = (lo + hi) // 2
+        if arr[mid] < arr[lo]:
+            arr[mid], arr[lo] = arr[lo], arr[mid]
+        if arr[hi] < arr[lo]:
+            arr[hi], arr[lo] = arr[lo], arr[hi]
+        if arr[hi] < arr[mid]:
+            arr[hi], arr[mid] = arr[mid], arr[hi]
+        # arr[lo] <= arr[mid] <= arr[hi]: the median becomes the pivot
+        arr[lo], arr[mid] = arr[mid], arr[lo]
+
+    @staticmethod
+    def _partition(arr, lo, hi):
+        """
+        Bentley–McIlroy three-way partition of arr[lo..hi] around the pivot arr[lo].
+
+        Returns:
+            tuple: (lt, gt) such that arr[lo..lt] < pivot, arr[lt+1..gt-1] == pivot
+                and arr[gt..hi] > pivot
+        """
+        pivot = arr[lo]
+        i, j = lo, hi + 1
+        p, q = lo, hi + 1  # arr[lo..p] and arr[q..hi] hold keys equal to the pivot
+        while True:
+            i += 1
+            while arr[i] < pivot:
+                if i == hi:
+                    break
+                i += 1
+            j -= 1
+            while pivot < arr[j]:
+                if j == lo:
+                    break
+                j -= 1
+
+            if i == j and arr[i] == pivot:
+                p += 1
+                arr[p], arr[i] = arr[i], arr[p]
+            if i >= j:
+                break
+
+            arr[i], arr[j] = arr[j], arr[i]
+            if arr[i] == pivot:
+                p += 1
+                arr[p], arr[i] = arr[i], arr[p]
+            if arr[j] == pivot:
+                q -= 1
+                arr[q], arr[j] = arr[j], arr[q]
+
+        # Move the equal keys from both ends to the middle
+        i = j + 1
+        for k in range(lo, p + 1):
+            arr[k], arr[j] = arr[j], arr[k]
+            j -= 1
+        for k in range(hi, q - 1, -1):
+            arr[k], arr[i] = arr[i], arr[k]
+            i += 1
+        return j, i
+
+    @staticmethod
+    def _insertion_sort(arr, lo, hi):
+        """
+        Insertion sort of arr[lo..hi] (inclusive).
+        """
+        for i in range(lo + 1, hi + 1):
+            key = arr[i]
+            j = i - 1
+            while j >= lo and key < arr[j]:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = key
+
+    @staticmethod
+    def _heap_sort(arr, lo, hi):
+        """
+        Iterative max-heap sort of arr[lo..hi] (inclusive), used as the introsort fallback.
+        """
+        n = hi - lo + 1
+
+        def sift_down(root, end):
+            # Sift arr[lo + root] down within the heap arr[lo..lo + end - 1]
+            item = arr[lo + root]
+            child = 2 * root + 1
+            while child < end:
+                if child + 1 < end and arr[lo + child] < arr[lo + child + 1]:
+                    child += 1
+                if not item < arr[lo + child]:
+                    break
+                arr[lo + root] = arr[lo + child]
+                root = child
+                child = 2 * root + 1
+            arr[lo + root] = item
+
+        for root in range(n // 2 - 1, -1, -1):
+            sift_down(root, n)
+        for end in range(n - 1, 0, -1):
+            arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+            sift_down(0, end)
@@ -29,6 +29,8 @@ O(n * k) donde k es el número de caracteres de la palabra más larga
 
 from collections import defaultdict
 
+from src.sorting_algorithms.instrumentation import probe
+
 
 class RadixSort:
     def __init__(self, arr):
@@ -46,8 +48,9 @@ class RadixSort:
         for word in arr:
             char = word[pos] if pos < len(word) else ""
             buckets[char].append(word)
+        probe.allocate(len(arr), count=len(buckets))
 
-        sorted_arr = []
+        sorted_arr = probe.track([])
         for key in sorted(buckets.keys()):  # Sorting keys ensures lexicographic order
             sorted_arr.extend(buckets[key])
 
@@ -20,6 +20,9 @@ O(n log n)
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class TimSort:
     """
       This class contains the implementation of the Tim Sort algorithm.
@@ -46,6 +49,7 @@ class TimSort:
         """
         left = arr[l:m + 1]
         right = arr[m + 1:r + 1]
+        probe.allocate(len(left) + len(right), count=2)
 
         i, j, k = 0, 0, l
         while i < len(left) and j < len(right):
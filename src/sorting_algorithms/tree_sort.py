@@ -13,9 +13,22 @@ El algoritmo con listas muy grandes puede ser inestable y lento, ya que el arbol
 puede llegar a ser muy profundo, lo que puede causar un stack overflow o un desbalance en el arbol
 
 O(n log n) pero O(n^2) si el arbol es mas profundo
+
+Variante balanceada (AVLTreeSort):
+Usa un árbol AVL, que después de cada inserción rota los nodos necesarios para que
+las alturas de los dos subárboles de cada nodo difieran a lo sumo en uno. La altura
+queda en O(log n) incluso con títulos ya ordenados, así que el ordenamiento es
+O(n log n) con cualquier entrada
+
+El árbol se guarda en listas paralelas (clave, hijo izquierdo, hijo derecho, altura)
+indexadas por número de nodo en lugar de objetos Node, y tanto la inserción como el
+recorrido inorder son iterativos: no hay recursión ni concatenación de listas
 """
 
 
+from src.sorting_algorithms.instrumentation import probe
+
+
 class Node:
     def __init__(self, key):
         self.key = key
@@ -55,6 +68,7 @@ class TreeSort:
         # Build the BST by inserting every element
         for key in self.arr:
             self._insert(key)
+        probe.allocate(len(self.arr), count=len(self.arr))
         # Perform in-order traversal to get the sorted array
         return self._inorder(self.root)
 
@@ -67,4 +81,131 @@ class TreeSort:
     def _inorder(self, node):
         if node is None:
             return []
-        return self._inorder(node.left) + [node.key] + self._inorder(node.right)
+        result = self._inorder(node.left) + [node.key] + self._inorder(node.right)
+        probe.allocate(len(result))
+        return result
+
+
+class AVLTreeSort:
+    """
+    Tree sort over an array-backed AVL tree.
+
+    Node i is stored as keys[i], left[i], right[i] and height[i]. Index 0 is a
+    sentinel for the empty subtree (height 0), so no None checks are needed.
+    Equal keys go to the right, which keeps the sort stable.
+    """
+
+    def __init__(self, arr):
+        self.arr = arr
+        self.keys = [None]
+        self.left = [0]
+        self.right = [0]
+        self.height = [0]
+        self.root = 0
+
+    def sort(self):
+        # Build the AVL tree by inserting every element
+        for key in self.arr:
+            self._insert(key)
+        probe.allocate(4 * len(self.keys), count=4)
+        # Iterative in-order traversal
+        return self._inorder()
+
+    def _insert(self, key):
+        """
+        Insert key as a new leaf and rebalance the path back to the root.
+        """
+        keys, left, right, height = self.keys, self.left, self.right, self.height
+        node = len(keys)
+        keys.append(key)
+        left.append(0)
+        right.append(0)
+        height.append(1)
+        if self.root == 0:
+            self.root = node
+            return
+
+        # Walk down to the insertion point, remembering the path
+        path = []
+        current = self.root
+        go_left = False
+        while current:
+            path.append(current)
+            go_left = key < keys[current]
+            current = left[current] if go_left else right[current]
+        probe.allocate(len(path))
+        if go_left:
+            left[path[-1]] = node
+        else:
+            right[path[-1]] = node
+
+        # Walk back up updating heights; one (single or double) rotation restores balance
+        for k in range(len(path) - 1, -1, -1):
+            i = path[k]
+            left_height, right_height = height[left[i]], height[right[i]]
+            balance = left_height - right_height
+            if balance > 1:
+                if height[left[left[i]]] < height[right[left[i]]]:
+                    left[i] = self._rotate_left(left[i])
+                subtree = self._rotate_right(i)
+            elif balance < -1:
+                if height[right[right[i]]] < height[left[right[i]]]:
+                    right[i] = self._rotate_right(right[i])
+                subtree = self._rotate_left(i)
+            else:
+                new_height = 1 + max(left_height, right_height)
+                if height[i] == new_height:
+                    return  # Heights above this node are unchanged
+                height[i] = new_height
+                continue
+
+            # Link the rotated subtree to its parent
+            if k == 0:
+                self.root = subtree
+            elif left[path[k - 1]] == i:
+                left[path[k - 1]] = subtree
+            else:
+                right[path[k - 1]] = subtree
+            return
+
+    def _rotate_right(self, i):
+        """
+        Rotate the subtree rooted at i to the right and return its new root.
+        """
+        left, right, height = self.left, self.right, self.height
+        pivot = left[i]
+        left[i] = right[pivot]
+        right[pivot] = i
+        height[i] = 1 + max(height[left[i]], height[right[i]])
+        height[pivot] = 1 + max(height[left[pivot]], height[i])
+        return pivot
+
+    def _rotate_left(self, i):
+        """
+        Rotate the subtree rooted at i to the left and return its new root.
+        """
+        left, right, height = self.left, self.right, self.height
+        pivot = right[i]
+        right[i] = left[pivot]
+        left[pivot] = i
+        height[i] = 1 + max(height[left[i]], height[right[i]])
+        height[pivot] = 1 + max(height[i], height[right[pivot]])
+        return pivot
+
+    def _inorder(self):
+        """
+        In-order traversal with an explicit stack.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        result = []
+        stack = []
+        current = self.root
+        while stack or current:
+            while current:
+                stack.append(current)
+                current = left[current]
+            current = stack.pop()
+            result.append(keys[current])
+            current = right[current]
+        probe.allocate(len(result))
+        return result
@@ -0,0 +1,99 @@
+import os
+import sys
+import csv
+import json
+import argparse
+
+# Añadir el directorio raíz al path de Python para resolver las importaciones
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from src.reader_resourses.algorithmsExecution import AlgorithmsExecution
+from src.reader_resourses.benchmark import SortBenchmark
+from src.reader_resourses.scaling import (INPUT_SHAPES, ScalingBenchmark, geometric_sizes,
+                                          plot_scaling)
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+default_bibtex_path = os.path.join(base_dir, 'data', 'processed', 'unique_entries.bib')
+output_dir = os.path.join(base_dir, 'data', 'processed', 'scaling')
+
+
+def load_title_words(bibtex_path):
+    """Vocabulario de los títulos reales (None si el archivo no existe)."""
+    if not os.path.exists(bibtex_path):
+        return None
+    words = set()
+    with open(bibtex_path, 'r', encoding='utf-8') as bibfile:
+        for line in bibfile:
+            line = line.strip()
+            if line.startswith('title = {'):
+                words.update(line.replace('title = {', '').rstrip(',}').split())
+    return sorted(words) or None
+
+
+def save_table(rows, path):
+    """Guarda una lista de diccionarios en CSV."""
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_exponents(fits):
+    """Imprime la tabla de exponentes empíricos (algoritmo × forma de entrada)."""
+    shapes = list(dict.fromkeys(f["Forma de entrada"] for f in fits))
+    names = list(dict.fromkeys(f["Método de ordenamiento"] for f in fits))
+    table = {(f["Método de ordenamiento"], f["Forma de entrada"]): f["Exponente"] for f in fits}
+    print("\n=== Exponentes empíricos k (tiempo ≈ c·n^k) ===")
+    print("{:<20}".format("Método") + "".join("{:>15}".format(s) for s in shapes))
+    for name in names:
+        cells = []
+        for shape in shapes:
+            k = table.get((name, shape))
+            cells.append("{:>15}".format("-" if k is None else f"{k:.2f}"))
+        print("{:<20}".format(name) + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Curvas de escalamiento de los algoritmos de ordenamiento")
+    parser.add_argument('--sizes', nargs='+', type=int, default=geometric_sizes(100, 1_000_000))
+    parser.add_argument('--shapes', nargs='+', choices=INPUT_SHAPES, default=list(INPUT_SHAPES))
+    parser.add_argument('--algorithms', nargs='+', default=None,
+                        help="Subconjunto de algoritmos (por defecto todos)")
+    parser.add_argument('--max-run-s', type=float, default=10.0,
+                        help="Omitir tamaños cuya ejecución se estime más larga")
+    parser.add_argument('--time-budget-s', type=float, default=3.0,
+                        help="Presupuesto de repeticiones por punto")
+    parser.add_argument('--bibtex', default=default_bibtex_path,
+                        help="Archivo BibTeX del que tomar el vocabulario de los títulos")
+    parser.add_argument('--output', default=output_dir)
+    args = parser.parse_args()
+
+    algorithms = AlgorithmsExecution.get_algorithms()
+    if args.algorithms:
+        algorithms = [(name, fn) for name, fn in algorithms if name in args.algorithms]
+
+    print("=== Curvas de escalamiento de los algoritmos de ordenamiento ===")
+    print(f"Tamaños: {args.sizes}")
+    print(f"Formas de entrada: {args.shapes}")
+    suite = ScalingBenchmark(
+        algorithms, sizes=args.sizes, shapes=args.shapes, max_run_s=args.max_run_s,
+        benchmark=SortBenchmark(min_repeats=3, max_repeats=30, time_budget_s=args.time_budget_s),
+        words=load_title_words(args.bibtex))
+    rows, fits = suite.run()
+    print_exponents(fits)
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, 'scaling_results.json'), 'w', encoding='utf-8') as f:
+        json.dump({"mediciones": rows, "exponentes": fits}, f, indent=4, ensure_ascii=False)
+    save_table(rows, os.path.join(args.output, 'scaling_results.csv'))
+    save_table(fits, os.path.join(args.output, 'scaling_exponents.csv'))
+    for shape in args.shapes:
+        fig = plot_scaling(rows, shape)
+        fig.savefig(os.path.join(args.output, f'scaling_{shape}.png'), dpi=150, bbox_inches='tight')
+    print(f"\nResultados guardados en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()